@@ -22,6 +22,7 @@ sys.path.insert(0, os.path.join(repo_root, 'CosyVoice', 'third_party'))
 sys.path.insert(0, os.path.join(repo_root, 'CosyVoice', 'third_party', 'Matcha-TTS'))
 from batch_cosy import main as cosy_batch
 from pydub import AudioSegment  # pip install pydub
+from media_info import get_duration_ms
 from batch_translate import batch_translate, SUPPORTED_LANGUAGES
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 
@@ -35,8 +36,7 @@ def merge_custom_callback():
         segments = parse_srt_segments(srt_path)
         # load original full audio directly from the input path
         input_path = input_file_var.get()
-        orig_audio = AudioSegment.from_file(input_path)
-        orig_dur = len(orig_audio)
+        orig_dur = get_duration_ms(input_path)
         # parse user timings list
         timings = json.loads(merge_entry.get())
         # merge using only specified segments indices
@@ -75,8 +75,7 @@ def merge_all_segments_callback():
         srt_path = os.path.join(out_dir, f"{base}{input_ext}.srt")
         segments = parse_srt_segments(srt_path)
         input_path = input_file_var.get()
-        orig_audio = AudioSegment.from_file(input_path)
-        original_duration_ms = len(orig_audio)
+        original_duration_ms = get_duration_ms(input_path)
 
         # 사용자가 선택한 합성 타입에 따라 소스 폴더 결정
         synthesis_type = synthesis_type_var.get()
@@ -1209,8 +1208,7 @@ def run_whisper_directory(output_dir: str):
     input_ext = os.path.splitext(input_file_var.get())[1]
     srt_path = os.path.join(output_dir, f"{base}{input_ext}.srt")
     segments = parse_srt_segments(srt_path)
-    orig_audio = AudioSegment.from_file(input_file_var.get())
-    original_duration_ms = len(orig_audio)
+    original_duration_ms = get_duration_ms(input_file_var.get())
     enable_smart_compression = enable_smart_compression_var.get() if 'enable_smart_compression_var' in globals() else True
 
     # 각 언어별로 병합 수행
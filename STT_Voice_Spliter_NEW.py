@@ -19,7 +19,7 @@ from main_processor import start_processing_with_settings
 from whisper_processor import generate_srt_only
 from audio_processor import parse_srt_segments, merge_segments_preserve_timing
 from speaker_diarization import test_speaker_diarization
-from pydub import AudioSegment
+from media_info import get_duration_ms
 
 
 def process_log_queue():
@@ -156,8 +156,7 @@ def merge_custom_callback():
         segments = parse_srt_segments(srt_path)
         # load original full audio directly from the input path
         input_path = input_file_var.get()
-        orig_audio = AudioSegment.from_file(input_path)
-        orig_dur = len(orig_audio)
+        orig_dur = get_duration_ms(input_path)
         # parse user timings list
         import json
         timings = json.loads(merge_entry.get())
@@ -197,8 +196,7 @@ def merge_all_segments_callback():
         srt_path = os.path.join(out_dir, f"{base}{input_ext}.srt")
         segments = parse_srt_segments(srt_path)
         input_path = input_file_var.get()
-        orig_audio = AudioSegment.from_file(input_path)
-        original_duration_ms = len(orig_audio)
+        original_duration_ms = get_duration_ms(input_path)
 
         # 사용자가 선택한 합성 타입에 따라 소스 폴더 결정
         synthesis_type = synthesis_type_var.get()
@@ -6,7 +6,6 @@ import json
 import subprocess
 import shutil
 from pathlib import Path
-from pydub import AudioSegment
 
 
 # 환경 설정
@@ -23,6 +22,8 @@ from whisper_processor import generate_srt_only
 from audio_processor import parse_srt_segments, merge_segments_preserve_timing
 from speaker_diarization import test_speaker_diarization
 from utils import log_message
+from environment_probe import log_environment_report
+from media_info import get_duration_ms
 
 
 def apply_lip_sync(video_path, audio_path, output_path, progress_callback=None):
@@ -383,8 +384,7 @@ def merge_segments_func(input_file, merge_indices, synthesis_type, progress=gr.P
         segments = parse_srt_segments(srt_path)
 
         # 원본 오디오 로드
-        orig_audio = AudioSegment.from_file(input_path)
-        orig_dur = len(orig_audio)
+        orig_dur = get_duration_ms(input_path)
 
         # 사용자 입력 파싱
         try:
@@ -801,6 +801,9 @@ def create_interface():
 
 
 if __name__ == "__main__":
+    # 시작 시 실행 환경 점검 (모델/실행 파일 경로는 이후 작업에서 재사용)
+    log_environment_report()
+
     # Gradio 인터페이스 생성 및 실행
     demo = create_interface()
 
@@ -0,0 +1,190 @@
+import os
+import subprocess
+import tempfile
+from math import gcd
+import numpy as np
+from config import get_ffmpeg_path
+from utils import log_message
+
+# 분리(UVR5)용 스트림 형식
+SEPARATION_SR = 44100
+SEPARATION_CHANNELS = 2
+# 음악 감지/VAD/STT용 스트림 형식 (같은 디코딩에서 함께 생성)
+ASR_SR = 16000
+
+BLOCK_S = 1.0  # ffmpeg 파이프에서 한 번에 읽는 길이 (초)
+
+
+def iter_audio_blocks(path, sample_rate=SEPARATION_SR, channels=SEPARATION_CHANNELS, block_s=BLOCK_S):
+    """
+    ffmpeg stdout 파이프로 첫 오디오 스트림을 디코딩하여 int16 (프레임 × 채널) 블록 단위로 반환
+    중간 WAV 파일을 만들지 않음
+
+    Raises:
+        RuntimeError: ffmpeg 디코딩 실패 시
+    """
+    cmd = [get_ffmpeg_path(), '-v', 'error', '-i', path, '-map', '0:a:0', '-vn',
+           '-f', 's16le', '-acodec', 'pcm_s16le', '-ar', str(sample_rate), '-ac', str(channels), '-']
+    frame_bytes = 2 * channels
+    block_bytes = max(1, int(block_s * sample_rate)) * frame_bytes
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        remainder = b''
+        while True:
+            chunk = process.stdout.read(block_bytes)
+            if not chunk:
+                break
+            chunk = remainder + chunk
+            usable = len(chunk) - len(chunk) % frame_bytes
+            remainder = chunk[usable:]
+            if usable:
+                yield np.frombuffer(chunk[:usable], dtype=np.int16).reshape(-1, channels)
+
+        stderr = process.stderr.read().decode('utf-8', errors='replace')
+        process.wait()
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg 디코딩 실패 (return code: {process.returncode}): {stderr.strip()}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+class StreamingResampler:
+    """
+    블록 단위로 들어오는 모노 신호를 다른 샘플레이트로 변환 (polyphase FIR)
+    블록 경계 양쪽에 필터 길이만큼의 문맥을 붙여 변환하므로 한 번에 변환한 결과와 같음
+    """
+
+    def __init__(self, src_sr, dst_sr):
+        from scipy.signal import resample_poly
+
+        self._resample_poly = resample_poly
+        g = gcd(src_sr, dst_sr)
+        self.up = dst_sr // g
+        self.down = src_sr // g
+        # resample_poly 기본 필터의 반길이(입력 샘플 기준)를 down 배수로 올림 → 위상 정렬 유지
+        half = 10 * max(self.up, self.down) // self.up + 1
+        self.pad = self.down * -(-half // self.down)
+        self._left = np.zeros(0, dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.float32)
+
+    def _process(self, n, right):
+        segment = np.concatenate([self._left, self._pending[:n + right]])
+        resampled = self._resample_poly(segment, self.up, self.down)
+        offset = len(self._left) * self.up // self.down
+        if right:
+            out = resampled[offset:offset + n * self.up // self.down]
+        else:
+            out = resampled[offset:]
+        self._left = np.concatenate([self._left, self._pending[:n]])[-self.pad:]
+        self._pending = self._pending[n:]
+        return out.astype(np.float32)
+
+    def feed(self, samples):
+        """블록 입력 → 지금까지 확정된 출력 (오른쪽 문맥이 쌓일 때까지 일부는 보류)"""
+        self._pending = np.concatenate([self._pending, np.asarray(samples, dtype=np.float32)])
+        n = (len(self._pending) - self.pad) // self.down * self.down
+        if n <= 0:
+            return np.zeros(0, dtype=np.float32)
+        return self._process(n, self.pad)
+
+    def flush(self):
+        """보류 중인 나머지 출력"""
+        if len(self._pending) == 0:
+            return np.zeros(0, dtype=np.float32)
+        return self._process(len(self._pending), 0)
+
+
+class IngestedAudio:
+    """
+    파이프 디코딩 결과 (분리용 44.1kHz 스테레오 int16 + 선택적으로 16kHz 모노 WAV)
+    분리 스트림은 임시 원시 PCM 파일로 흘려 쓰고 np.memmap으로 열어 두므로 메모리 사용량은 프로그램 길이와 무관
+    사용 후 close()로 임시 PCM 파일 삭제 (asr_path WAV는 남김)
+    """
+
+    def __init__(self, source, sample_rate, channels, spill_path, asr_path=None):
+        self.source = source
+        self.sample_rate = sample_rate
+        self.spill_path = spill_path
+        self.asr_path = asr_path
+        frames = os.path.getsize(spill_path) // (2 * channels)
+        if frames:
+            self.pcm = np.memmap(spill_path, dtype=np.int16, mode='r', shape=(frames, channels))
+        else:
+            self.pcm = np.zeros((0, channels), dtype=np.int16)
+
+    @property
+    def frames(self):
+        return len(self.pcm)
+
+    @property
+    def channels(self):
+        return self.pcm.shape[1]
+
+    @property
+    def duration_s(self):
+        return self.frames / self.sample_rate
+
+    def read(self, start, stop):
+        """[start, stop) 프레임 구간을 float32 (프레임 × 채널)로 반환 (soundfile.read와 같은 형식)"""
+        return self.pcm[start:stop].astype(np.float32) / 32768.0
+
+    def close(self):
+        """memmap 해제 후 임시 PCM 파일 삭제 (Windows는 매핑이 열려 있으면 삭제 불가)"""
+        channels = self.channels
+        self.pcm = np.zeros((0, channels), dtype=np.int16)
+        try:
+            os.remove(self.spill_path)
+        except OSError as e:
+            log_message(f"⚠️ 임시 PCM 파일 삭제 실패: {self.spill_path} ({e})")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def ingest_audio(path, spill_dir=None, sample_rate=SEPARATION_SR, channels=SEPARATION_CHANNELS, asr_path=None):
+    """
+    영상/오디오 파일을 ffmpeg 파이프로 한 번 디코딩하여 분리용 스트림을 임시 PCM 파일로 기록
+    (블록 단위로 기록하므로 디코딩 중 메모리는 블록 크기로 제한)
+    spill_dir: 임시 PCM 파일 위치 (None이면 시스템 임시 디렉토리)
+    asr_path: 주어지면 같은 디코딩 블록을 모노로 섞고 16kHz로 변환하여 이 경로에 WAV로 기록 (음악 감지/VAD/STT용)
+
+    Returns:
+        IngestedAudio
+    """
+    import soundfile as sf
+
+    log_message(f"🎧 오디오 파이프 디코딩: {path} ({sample_rate}Hz {channels}ch)")
+    base_name = os.path.splitext(os.path.basename(path))[0]
+    fd, spill_path = tempfile.mkstemp(prefix=f"{base_name}.", suffix='.ingest.pcm', dir=spill_dir)
+
+    asr_out = None
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if asr_path:
+                os.makedirs(os.path.dirname(os.path.abspath(asr_path)), exist_ok=True)
+                asr_out = sf.SoundFile(asr_path, 'w', ASR_SR, 1, subtype='PCM_16')
+                resampler = StreamingResampler(sample_rate, ASR_SR)
+            for block in iter_audio_blocks(path, sample_rate, channels):
+                f.write(block.tobytes())
+                if asr_out is not None:
+                    asr_out.write(resampler.feed(block.mean(axis=1, dtype=np.float32) / 32768.0))
+            if asr_out is not None:
+                asr_out.write(resampler.flush())
+    except Exception:
+        if asr_out is not None:
+            asr_out.close()
+            os.remove(asr_path)
+        os.remove(spill_path)
+        raise
+    if asr_out is not None:
+        asr_out.close()
+
+    audio = IngestedAudio(path, sample_rate, channels, spill_path, asr_path)
+    log_message(f"✅ 디코딩 완료: {audio.duration_s:.1f}초" + (f" (16kHz 모노: {asr_path})" if asr_path else ""))
+    return audio
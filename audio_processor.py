@@ -1,8 +1,12 @@
 import os
 import re
+import json
+import bisect
 import unicodedata
+import numpy as np
 from pydub import AudioSegment
 from utils import log_message, audio_log_message
+from media_info import get_duration_ms
 
 # SRT 파싱용 정규식
 _time_re = re.compile(r'(\d{2}:\d{2}:\d{2}[.,]\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}[.,]\d{3})')
@@ -162,6 +166,100 @@ def parse_srt_segments(srt_path: str):
     return segments
 
 
+def parse_srt_entries(srt_path: str):
+    """SRT 파일에서 타임스탬프와 텍스트를 함께 파싱 ([{'start_ms', 'end_ms', 'text'}, ...])"""
+    entries = []
+    with open(srt_path, 'r', encoding='utf-8', errors='ignore') as f:
+        blocks = re.split(r'\n\s*\n', f.read().strip())
+
+    for block in blocks:
+        lines = [line.strip() for line in block.splitlines() if line.strip()]
+        for i, line in enumerate(lines):
+            m = _time_re.search(line)
+            if m:
+                entries.append({
+                    'start_ms': srt_time_to_milliseconds(m.group(1)),
+                    'end_ms': srt_time_to_milliseconds(m.group(2)),
+                    'text': ' '.join(lines[i + 1:]),
+                })
+                break
+    return entries
+
+
+def milliseconds_to_srt_time(ms: int) -> str:
+    """밀리초를 SRT 시간 형식으로 변환"""
+    ms = max(0, int(ms))
+    h, rest = divmod(ms, 3600000)
+    m, rest = divmod(rest, 60000)
+    s, ms = divmod(rest, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def write_srt_file(segments, srt_path: str):
+    """[{'start_ms', 'end_ms', 'text'}, ...] 세그먼트를 SRT 파일로 저장"""
+    with open(srt_path, 'w', encoding='utf-8') as f:
+        for idx, seg in enumerate(segments, 1):
+            f.write(f"{idx}\n")
+            f.write(f"{milliseconds_to_srt_time(seg['start_ms'])} --> {milliseconds_to_srt_time(seg['end_ms'])}\n")
+            f.write(f"{seg['text']}\n\n")
+    log_message(f"💾 SRT 저장: {srt_path} ({len(segments)}개 세그먼트)")
+
+
+def write_txt_file(segments, txt_path: str):
+    """세그먼트 텍스트를 한 줄에 하나씩 저장 (whisper-cli --output-txt와 동일 형식)"""
+    with open(txt_path, 'w', encoding='utf-8') as f:
+        for seg in segments:
+            f.write(f"{seg['text']}\n")
+
+
+def write_transcript_json(transcript, json_path: str, source: str = None, language: str = 'ko'):
+    """세그먼트/단어/타임스탬프/신뢰도를 담은 구조화 전사 결과 저장"""
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({'source': source, 'language': language, 'segments': transcript}, f, ensure_ascii=False, indent=2)
+    log_message(f"💾 전사 JSON 저장: {json_path}")
+
+
+def load_transcript_json(json_path: str):
+    """구조화 전사 결과 로드 (없으면 None)"""
+    if not os.path.exists(json_path):
+        return None
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('segments')
+    except Exception as e:
+        log_message(f"⚠️ 전사 JSON 로드 실패: {e}")
+        return None
+
+
+def derive_segment_texts(transcript, segments):
+    """
+    분할 세그먼트별 텍스트를 단어 타임스탬프로 결정 (단어가 없으면 전사 세그먼트 단위로 배정)
+    화자 기반 재분할처럼 전사 세그먼트와 분할 세그먼트가 달라도 ASR을 다시 돌리지 않음
+
+    Returns:
+        segments와 같은 길이의 텍스트 목록
+    """
+    texts = [[] for _ in segments]
+    if not segments:
+        return []
+    starts = [start_ms for start_ms, _ in segments]
+
+    for seg in transcript:
+        for unit in seg.get('words') or [seg]:
+            mid = (unit['start_ms'] + unit['end_ms']) / 2
+            # 중앙 시점을 포함하는 세그먼트, 없으면 앞뒤 중 가까운 세그먼트
+            i = bisect.bisect_right(starts, mid) - 1
+            if i < 0:
+                target = 0
+            elif mid < segments[i][1] or i + 1 >= len(segments):
+                target = i
+            else:
+                target = i if mid - segments[i][1] <= segments[i + 1][0] - mid else i + 1
+            texts[target].append(unit['text'])
+
+    return [' '.join(t).strip() for t in texts]
+
+
 def split_segments_by_speaker_changes(srt_segments, diarization_timeline):
     """
     화자 변경 지점에서 SRT 세그먼트를 분할
@@ -359,6 +457,11 @@ def split_audio_by_srt(audio_path: str, srt_path: str, output_dir: str):
     segments = parse_srt_segments(srt_path)
     log_message(f'📊 파싱된 세그먼트 수: {len(segments)}')
 
+    return split_audio_by_segments(audio_path, segments, output_dir)
+
+
+def split_audio_by_segments(audio_path: str, segments, output_dir: str):
+    """[(start_ms, end_ms), ...] 세그먼트에 따라 오디오를 분할 (SRT 재파싱 없이)"""
     audio = AudioSegment.from_file(audio_path)
     total_audio_length = len(audio)
     log_message(f'🎼 원본 오디오 길이: {total_audio_length}ms ({total_audio_length / 1000:.1f}초)')
@@ -548,15 +651,15 @@ def create_extended_segments_mapping(original_segments_dir, extended_segments_di
             extended_path = os.path.join(extended_segments_dir, wav_file)
 
             try:
-                original_audio = AudioSegment.from_file(original_path)
-                extended_audio = AudioSegment.from_file(extended_path)
+                original_ms = get_duration_ms(original_path)
+                extended_ms = get_duration_ms(extended_path)
 
                 segment_info = {
                     'filename': wav_file,
-                    'original_duration_ms': len(original_audio),
-                    'extended_duration_ms': len(extended_audio),
-                    'was_extended': len(extended_audio) > len(original_audio),
-                    'repetition_ratio': len(extended_audio) / len(original_audio) if len(original_audio) > 0 else 1
+                    'original_duration_ms': original_ms,
+                    'extended_duration_ms': extended_ms,
+                    'was_extended': extended_ms > original_ms,
+                    'repetition_ratio': extended_ms / original_ms if original_ms > 0 else 1
                 }
 
                 mapping_info['segments_info'].append(segment_info)
@@ -1156,3 +1259,149 @@ def merge_segments_preserve_timing(segments, original_duration_ms, segments_dir,
         log_message(f"✅ 길이 맞춤 모드: {extension_percent:+.1f}% 변화")
 
     return actual_length
+
+
+class StreamingTimelineMerger:
+    """
+    합성 청크를 세그먼트 위치에 바로 기록하는 스트리밍 타임라인 (보존 모드 전용)
+
+    merge_segments_preserve_timing과 같은 배치 규칙(패딩 보정, 2배 길이 제한, 저볼륨 증폭)을
+    따르지만 세그먼트 WAV를 다시 읽지 않습니다. 겹침 페이드/컷은 적용하지 않고 단순 오버레이합니다.
+    """
+
+    def __init__(self, segments, original_duration_ms, output_path, sample_rate=24000,
+                 correct_cosyvoice_padding=True, preview_every=10):
+        self.segments = list(segments)
+        self.original_duration_ms = original_duration_ms
+        self.output_path = output_path
+        self.sample_rate = sample_rate
+        self.padding_correction_ms = 200 if correct_cosyvoice_padding else 0
+        self.preview_every = preview_every
+        self.preview_path = os.path.splitext(output_path)[0] + ".partial.wav"
+
+        self._max_samples = self._ms_to_samples(3600000)  # 1시간 제한 (merge_segments_preserve_timing과 동일)
+        self._buffer = np.zeros(self._ms_to_samples(original_duration_ms), dtype=np.float32)
+        self._end = len(self._buffer)
+        self._open = None
+        self.placed = 0
+
+    def _ms_to_samples(self, ms):
+        return int(ms * self.sample_rate / 1000)
+
+    def _ensure_capacity(self, end):
+        if end > len(self._buffer):
+            grown = np.zeros(max(end, len(self._buffer) * 2), dtype=np.float32)
+            grown[:len(self._buffer)] = self._buffer
+            self._buffer = grown
+
+    def begin_segment(self, idx):
+        """세그먼트 기록 시작 (idx는 1부터, segments 순서와 대응)"""
+        self.rollback()
+        if idx < 1 or idx > len(self.segments):
+            log_message(f"⚠️ 스트리밍 병합: 세그먼트 {idx} 타임스탬프 없음 - 건너뜀")
+            return False
+
+        start_ms, end_ms = self.segments[idx - 1]
+        if start_ms < 0 or end_ms <= start_ms:
+            log_message(f"⚠️ 스트리밍 병합: 세그먼트 {idx} 유효하지 않은 구간 무시 ({start_ms}, {end_ms})")
+            return False
+
+        start = self._ms_to_samples(max(0, start_ms - self.padding_correction_ms))
+        self._open = {
+            'idx': idx,
+            'start': start,
+            # 보존 모드: 원본 2배 초과분은 기록하지 않음
+            'limit': min(self._ms_to_samples((end_ms - start_ms) * 2), self._max_samples - start),
+            'chunks': [],
+            'written': 0,
+        }
+        return True
+
+    def write(self, chunk):
+        """열린 세그먼트에 합성 청크를 이어서 기록 (torch.Tensor 또는 numpy 배열)"""
+        seg = self._open
+        if seg is None:
+            return
+
+        samples = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        samples = samples[:max(0, seg['limit'] - seg['written'])]
+        if samples.size == 0:
+            return
+
+        pos = seg['start'] + seg['written']
+        self._ensure_capacity(pos + samples.size)
+        self._buffer[pos:pos + samples.size] += samples
+        seg['chunks'].append(samples)
+        seg['written'] += samples.size
+
+    def rollback(self):
+        """열린 세그먼트에 기록된 청크를 타임라인에서 제거"""
+        seg = self._open
+        self._open = None
+        if seg is None or seg['written'] == 0:
+            return
+
+        start = seg['start']
+        self._buffer[start:start + seg['written']] -= np.concatenate(seg['chunks'])
+
+    def end_segment(self):
+        """세그먼트 확정: 길이 제한 페이드아웃과 저볼륨 증폭을 타임라인에 반영"""
+        seg = self._open
+        self._open = None
+        if seg is None or seg['written'] == 0:
+            return
+
+        start, n = seg['start'], seg['written']
+        raw = np.concatenate(seg['chunks'])
+        final = raw.copy()
+
+        if n >= seg['limit']:
+            fade = min(self._ms_to_samples(200), n)
+            final[n - fade:] *= np.linspace(1.0, 0.0, fade, dtype=np.float32)
+            log_message(f"⚠️ 세그먼트 {seg['idx']}: 과도한 확장 제한 ({n * 1000 // self.sample_rate}ms)")
+
+        rms = float(np.sqrt(np.mean(final ** 2)))
+        if rms > 0:
+            dbfs = 20 * np.log10(rms)
+            if dbfs < -30:
+                gain = -20 - dbfs  # -20dBFS 목표
+                final *= 10 ** (gain / 20)
+                log_message(f"  세그먼트 {seg['idx']} 볼륨 증폭: {gain:.1f}dB")
+
+        self._buffer[start:start + n] += final - raw
+        self._end = max(self._end, start + n)
+        self.placed += 1
+
+        start_ms = start * 1000 // self.sample_rate
+        log_message(f"🎯 세그먼트 {seg['idx']}: {start_ms}ms~{(start + n) * 1000 // self.sample_rate}ms 스트리밍 배치 완료")
+
+        if self.preview_every and self.placed % self.preview_every == 0:
+            self._export(self.preview_path, self._end)
+            log_message(f"👀 중간 결과 저장: {self.preview_path} ({self.placed}/{len(self.segments)} 세그먼트)")
+
+    def _export(self, path, length):
+        samples = np.clip(self._buffer[:length], -1.0, 1.0)
+        pcm = (samples * 32767).astype(np.int16)
+        audio = AudioSegment(pcm.tobytes(), frame_rate=self.sample_rate, sample_width=2, channels=1)
+        audio.export(path, format="wav")
+        return audio
+
+    def finalize(self):
+        """타임라인을 WAV로 저장하고 최종 길이(ms)를 반환"""
+        self.rollback()
+        length = min(self._end, self._max_samples)
+
+        final_timeline = self._export(self.output_path, length)
+        if final_timeline.dBFS < -50:
+            log_message(f"⚠️ 최종 결과 볼륨이 너무 낮음 ({final_timeline.dBFS:.1f}dBFS) - 증폭 적용")
+            final_timeline = final_timeline + (max(-20, -10 - final_timeline.dBFS))  # -10dBFS 목표
+            final_timeline.export(self.output_path, format="wav")
+
+        if os.path.exists(self.preview_path):
+            os.remove(self.preview_path)
+
+        actual_length = len(final_timeline)
+        log_message(f"🎵 스트리밍 타임라인 병합 완료! ({self.placed}/{len(self.segments)} 세그먼트)")
+        log_message(f"📊 최종 길이: {actual_length}ms (원본: {self.original_duration_ms}ms)")
+        log_message(f"💾 저장 완료: {self.output_path}")
+        return actual_length
@@ -8,12 +8,15 @@ import torchaudio
 import torch
 import random
 import numpy as np
-import sys
 import logging
+import queue
+import threading
 import librosa
 
 # 파일명 안전화 함수 임포트
 from audio_processor import sanitize_filename, safe_file_operations
+from mood_analysis import classify_mood, load_mood_feature_table, lookup_mood_command
+from tts_backends import DEFAULT_TTS_BACKEND, TTS_BACKENDS, load_cosyvoice, inference_context
 
 # 프로젝트 내 CosyVoice2 모델 로컬 경로 설정
 repo_root = os.path.dirname(__file__)
@@ -21,20 +24,17 @@ LOCAL_COSYVOICE_MODEL = os.path.join(
     repo_root, 'CosyVoice', 'pretrained_models', 'CosyVoice2-0.5B'
 )
 
-# CosyVoice2 패키지 경로 추가
-sys.path.insert(0, os.path.join(repo_root, 'CosyVoice'))
-from cosyvoice.cli.cosyvoice import CosyVoice2
-
 # 로깅 설정 (Gradio 앱과 동일)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
 
 # Device-aware memory cleanup utility
-def cleanup_memory(device):
+def cleanup_memory(device, synchronize=True):
     """Clean up memory for the current device"""
     if device.type == 'cuda':
         torch.cuda.empty_cache()
-        torch.cuda.synchronize()
+        if synchronize:
+            torch.cuda.synchronize()
         logging.debug("CUDA cache cleared")
     # CPU doesn't need explicit cleanup
 
@@ -110,15 +110,8 @@ def postprocess(speech: torch.Tensor,
 
 
 # 오디오 로드 및 리샘플 함수
-def load_wav_resample(path: str, target_sr: int = 16000, min_duration: float = 3.0) -> torch.Tensor:
-    """
-    오디오 로드 및 리샘플링 (CosyVoice 3초 제약 우회)
-    
-    Args:
-        path: 오디오 파일 경로
-        target_sr: 목표 샘플링 레이트
-        min_duration: 최소 길이 (초) - CosyVoice 제약 우회용
-    """
+def _decode_resample(path: str, target_sr: int = 16000) -> torch.Tensor:
+    """오디오를 한 번 디코딩하여 target_sr 모노 텐서 (1, N)로 변환"""
     waveform, sr = torchaudio.load(path)
     if sr != target_sr:
         waveform = torchaudio.functional.resample(
@@ -127,8 +120,11 @@ def load_wav_resample(path: str, target_sr: int = 16000, min_duration: float = 3
     # 스테레오→모노
     if waveform.size(0) > 1:
         waveform = waveform.mean(dim=0, keepdim=True)
+    return waveform
 
-    # 3초 제약 우회: 짧은 세그먼트에 무음 패딩 추가
+
+def _pad_to_min_duration(waveform: torch.Tensor, target_sr: int = 16000, min_duration: float = 3.0) -> torch.Tensor:
+    """3초 제약 우회: 짧은 세그먼트 끝에 무음 패딩 추가"""
     current_duration = waveform.size(1) / target_sr
     if current_duration < min_duration:
         needed_samples = int((min_duration - current_duration) * target_sr)
@@ -136,10 +132,51 @@ def load_wav_resample(path: str, target_sr: int = 16000, min_duration: float = 3
         padding = torch.zeros(1, needed_samples)
         waveform = torch.cat([waveform, padding], dim=1)
         logging.debug(f"Padding added: {current_duration:.2f}s → {min_duration:.2f}s")
-
     return waveform
 
 
+def load_wav_resample(path: str, target_sr: int = 16000, min_duration: float = 3.0) -> torch.Tensor:
+    """
+    오디오 로드 및 리샘플링 (CosyVoice 3초 제약 우회)
+    
+    Args:
+        path: 오디오 파일 경로
+        target_sr: 목표 샘플링 레이트
+        min_duration: 최소 길이 (초) - CosyVoice 제약 우회용
+    """
+    waveform = _decode_resample(path, target_sr)
+    return _pad_to_min_duration(waveform, target_sr, min_duration)
+
+
+def load_prompt_audio(path: str, target_sr: int = 16000, min_duration: float = 3.0,
+                      analyze_mood: bool = False) -> dict:
+    """
+    프롬프트 오디오를 한 번만 디코딩/리샘플링하여 합성에 필요한 값을 모두 계산
+    
+    Args:
+        path: 오디오 파일 경로
+        target_sr: 목표 샘플링 레이트
+        min_duration: 최소 길이 (초) - CosyVoice 제약 우회용
+        analyze_mood: True이면 같은 배열로 분위기(instruct 명령어)까지 분석
+    
+    Returns:
+        dict: {'prompt_wav': 패딩된 프롬프트, 'original_duration': 패딩 전 길이(초),
+               'mood_command': 분위기 명령어 또는 None}
+    """
+    waveform = _decode_resample(path, target_sr)
+    original_duration = waveform.size(1) / target_sr
+
+    mood_command = None
+    if analyze_mood:
+        mood_command = analyze_audio_mood_array(waveform.squeeze(0).numpy(), target_sr)
+
+    return {
+        'prompt_wav': _pad_to_min_duration(waveform, target_sr, min_duration),
+        'original_duration': original_duration,
+        'mood_command': mood_command,
+    }
+
+
 def optimize_prompt_audio(prompt_wav: torch.Tensor, target_sr: int = 16000) -> torch.Tensor:
     """
     프롬프트 오디오 최적화 - 늘어짐 방지
@@ -163,7 +200,7 @@ def optimize_prompt_audio(prompt_wav: torch.Tensor, target_sr: int = 16000) -> t
 
 
 def smart_synthesis_with_length_control(cosy, text, prompt_text, prompt_wav_processed, original_duration,
-                                        target_language, base_instruct_command, final_speed_ratio):
+                                        target_language, base_instruct_command, final_speed_ratio, on_chunk=None):
     """
     길이를 고려한 스마트 합성: Zero-shot이 너무 길면 Instruct2로 재합성
     
@@ -176,6 +213,7 @@ def smart_synthesis_with_length_control(cosy, text, prompt_text, prompt_wav_proc
         target_language: 타겟 언어
         base_instruct_command: 기본 instruct 명령어
         final_speed_ratio: 속도 비율
+        on_chunk: Zero-shot 청크가 생성될 때마다 호출되는 콜백 (스트리밍 병합용, 선택)
     
     Returns:
         tuple: (선택된 오디오, 사용된 방법, 실제 길이)
@@ -197,20 +235,16 @@ def smart_synthesis_with_length_control(cosy, text, prompt_text, prompt_wav_proc
         logging.error(f"  ❌ Zero-shot 합성 실패")
         return None, None, 0
 
-    # Zero-shot 결과 처리
-    result_list = list(results_zero)
-    if not result_list:
-        logging.error(f"  ❌ Zero-shot 합성 결과가 비어 있음")
-        return None, None, 0
-
-    # 모든 결과 연결
+    # Zero-shot 결과 처리 (생성되는 대로 청크를 받아 연결)
     combined_audio = []
-    for out in result_list:
+    for out in results_zero:
         if 'tts_speech' in out:
             speech = out['tts_speech']
             if speech.device.type != 'cpu':
                 speech = speech.cpu()
             combined_audio.append(speech)
+            if on_chunk is not None:
+                on_chunk(speech)
 
     if not combined_audio:
         logging.error(f"  ❌ 유효한 Zero-shot 결과 없음")
@@ -261,18 +295,9 @@ def smart_synthesis_with_length_control(cosy, text, prompt_text, prompt_wav_proc
         gc.collect()
         return zero_shot_audio, "zero_shot_fallback", zero_shot_duration
 
-    # Instruct2 결과 처리
-    instruct_result_list = list(results_instruct)
-    if not instruct_result_list:
-        logging.warning(f"  ⚠️ Instruct2 결과 비어있음 - Zero-shot 결과 사용")
-        # 메모리 절약
-        import gc
-        gc.collect()
-        return zero_shot_audio, "zero_shot_fallback", zero_shot_duration
-
     # Instruct2 결과 연결
     instruct_combined_audio = []
-    for out in instruct_result_list:
+    for out in results_instruct:
         if 'tts_speech' in out:
             speech = out['tts_speech']
             if speech.device.type != 'cpu':
@@ -317,7 +342,18 @@ def analyze_audio_mood(audio_path: str) -> str:
     try:
         # 오디오 로드 (librosa 사용)
         y, sr = librosa.load(audio_path, sr=16000)
+    except Exception as e:
+        logging.warning(f"오디오 분위기 분석 실패: {e}")
+        return "자연스럽게 말해"
+
+    return analyze_audio_mood_array(y, sr)
 
+
+def analyze_audio_mood_array(y: np.ndarray, sr: int = 16000) -> str:
+    """
+    이미 디코딩된 모노 오디오 배열을 분석해서 적절한 instruct 명령어를 반환합니다.
+    """
+    try:
         # 1. 음성 특성 분석
         # 음성 강도 (RMS)
         rms = librosa.feature.rms(y=y)[0]
@@ -335,19 +371,8 @@ def analyze_audio_mood(audio_path: str) -> str:
         mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
         mfcc_var = np.var(mfccs, axis=1).mean()  # MFCC 변화량
 
-        # 2. 분위기 판단 로직 (템포 분석 제거)
-        if avg_rms > 0.05 and avg_spectral_centroid > 2000:
-            return "활기차게 말해"
-        elif avg_rms < 0.02 and avg_spectral_centroid < 1500:
-            return "차분하게 말해"
-        elif avg_zcr > 0.1 or avg_rms > 0.08:
-            return "감정적으로 말해"
-        elif mfcc_var < 50:
-            return "천천히 말해"
-        elif mfcc_var > 150:
-            return "빠르게 말해"
-        else:
-            return "자연스럽게 말해"
+        # 2. 분위기 판단 로직 (mood_analysis와 공유)
+        return classify_mood(avg_rms, avg_spectral_centroid, avg_zcr, mfcc_var)
 
     except Exception as e:
         logging.warning(f"오디오 분위기 분석 실패: {e}")
@@ -427,6 +452,16 @@ LANGUAGE_CONFIGS = {
 }
 
 
+def language_config_key(code: str, default: str = 'korean') -> str:
+    """ISO 언어 코드('ko', 'en' 등)를 LANGUAGE_CONFIGS 키로 변환 (지원하지 않는 코드면 경고 후 default)"""
+    for key, config in LANGUAGE_CONFIGS.items():
+        if config['code'] == code:
+            return key
+    logging.warning(f"⚠️ 지원하지 않는 원본 언어 코드 '{code}' - 프롬프트 전처리는 '{default}' 규칙 사용 "
+                    f"(지원: {', '.join(config['code'] for config in LANGUAGE_CONFIGS.values())})")
+    return default
+
+
 def detect_text_language(text: str) -> str:
     """
     텍스트의 언어를 감지합니다.
@@ -562,7 +597,15 @@ def get_language_specific_instruct_command(base_command: str, target_language: s
 
 # 배치 합성 함수
 def main(audio_dir, prompt_text_dir, text_dir, out_dir, model_path=LOCAL_COSYVOICE_MODEL, enable_instruct=True,
-         manual_command=None, target_language=None):
+         manual_command=None, target_language=None, prefetch_depth=2, mood_table_path=None, timeline=None,
+         save_segments=True, backend=DEFAULT_TTS_BACKEND, source_language='korean', source_code=None):
+    """
+    backend: CosyVoice2 추론 백엔드 (tts_backends.TTS_BACKENDS 또는 'auto')
+    source_language: 프롬프트(원본 음성 전사) 언어 (LANGUAGE_CONFIGS 키)
+    source_code: 텍스트 파일명의 원본 언어 코드 (<세그먼트>.<코드>.txt), None이면 source_language의 코드
+    timeline: StreamingTimelineMerger를 주면 Zero-shot 청크를 생성 즉시 타임라인에 기록
+    save_segments: False이면 세그먼트별 Zero-shot WAV 저장 생략 (timeline 사용 시에만 의미 있음)
+    """
     # Device 설정 (MPS 지원 제외)
     if torch.cuda.is_available():
         device = torch.device("cuda")
@@ -603,13 +646,7 @@ def main(audio_dir, prompt_text_dir, text_dir, out_dir, model_path=LOCAL_COSYVOI
 
     # 모델 초기화
     global cosy
-    cosy = CosyVoice2(
-        model_path,
-        load_jit=False,
-        load_trt=False,
-        load_vllm=False,
-        fp16=False
-    )
+    cosy, backend = load_cosyvoice(model_path, backend)
 
     # 입력 파일 목록
     try:
@@ -628,6 +665,9 @@ def main(audio_dir, prompt_text_dir, text_dir, out_dir, model_path=LOCAL_COSYVOI
         f"[디버그] 대상 텍스트 파일 ({len(text_files)}): {text_files[:5]}{'...' if len(text_files) > 5 else ''}")
 
     # 파일 매칭 개선: 실제 파일명 패턴에 맞게 매칭
+    # 원본/번역 텍스트 모두 원본 세그먼트 텍스트 파일명을 따름 (예: ..._001.ko.txt, 영어 원본이면 ..._001.en.txt)
+    if source_code is None:
+        source_code = LANGUAGE_CONFIGS.get(source_language, LANGUAGE_CONFIGS['korean'])['code']
     matched_files = []
 
     for audio_file in audio_files:
@@ -635,11 +675,11 @@ def main(audio_dir, prompt_text_dir, text_dir, out_dir, model_path=LOCAL_COSYVOI
         audio_base = os.path.splitext(audio_file)[0]
 
         # 프롬프트 텍스트 파일 찾기 (예: vocal_video22_extracted.wav_10_001.ko.txt)
-        prompt_file = f"{audio_base}.ko.txt"
+        prompt_file = f"{audio_base}.{source_code}.txt"
         prompt_file_path = os.path.join(prompt_text_dir, prompt_file)
 
         # 대상 텍스트 파일 찾기 (예: vocal_video22_extracted.wav_10_001.ko.txt)
-        target_file = f"{audio_base}.ko.txt"
+        target_file = f"{audio_base}.{source_code}.txt"
         target_file_path = os.path.join(text_dir, target_file)
 
         # 파일 존재 여부 확인
@@ -681,146 +721,266 @@ def main(audio_dir, prompt_text_dir, text_dir, out_dir, model_path=LOCAL_COSYVOI
         torch.cuda.manual_seed_all(current_seed)
     logging.info(f"랜덤 시드 사용 중: {current_seed} / 디바이스: {device}")
 
+    # 일괄 계산된 분위기 특징 테이블이 있으면 세그먼트별 STFT 대신 조회만 수행
+    mood_table = None
+    if enable_instruct and not manual_command:
+        mood_table = load_mood_feature_table(mood_table_path)
+        if mood_table is not None:
+            logging.info(f"🎭 분위기 특징 테이블 사용: {mood_table_path} ({mood_table.shape[0]}개 세그먼트)")
+
+    # 프롬프트 오디오 선행 로드 (디코딩/리샘플/분위기 분석은 세그먼트당 한 번만)
+    analyze_mood = enable_instruct and not manual_command and mood_table is None
+
+    # 3단계 파이프라인: CPU 준비 스레드 → GPU 합성(현재 스레드) → 저장 스레드
+    job_queue = queue.Queue(maxsize=max(1, prefetch_depth))
+    save_queue = queue.Queue(maxsize=SAVE_QUEUE_SIZE)
+    stop_event = threading.Event()
+
+    producer = threading.Thread(
+        target=_synthesis_job_producer,
+        args=(matched_files, audio_dir, prompt_text_dir, text_dir, target_language, source_language, analyze_mood,
+              job_queue, stop_event),
+        name="cosy-prefetch",
+        daemon=True
+    )
+    writer = threading.Thread(
+        target=_synthesis_result_writer,
+        args=(save_queue, target_language),
+        name="cosy-writer",
+        daemon=True
+    )
+    producer.start()
+    writer.start()
+
     # 파일별 합성
-    for i, (awav, ptxt, txt) in enumerate(matched_files, 1):
-        # 파일 경로 안전화
-        safe_awav = sanitize_filename(awav)
-        safe_ptxt = sanitize_filename(ptxt)
-        safe_txt = sanitize_filename(txt)
-
-        wav_path = safe_file_operations(os.path.join(audio_dir, awav), "read")
-        ptxt_path = safe_file_operations(os.path.join(prompt_text_dir, ptxt), "read")
-        txt_path = safe_file_operations(os.path.join(text_dir, txt), "read")
-
-        # 파일 경로 오류 체크
-        if wav_path.startswith("❌") or ptxt_path.startswith("❌") or txt_path.startswith("❌"):
-            logging.error(f"  ❌ 파일 경로 오류:")
-            if wav_path.startswith("❌"):
-                logging.error(f"    - {wav_path}")
-            if ptxt_path.startswith("❌"):
-                logging.error(f"    - {ptxt_path}")
-            if txt_path.startswith("❌"):
-                logging.error(f"    - {txt_path}")
-            continue
+    try:
+        with inference_context(backend):
+            _synthesis_consumer(job_queue, save_queue, zero_shot_dir, instruct_dir, target_language,
+                                enable_instruct, manual_command, device, mood_table, timeline,
+                                save_segments or timeline is None)
+    finally:
+        stop_event.set()
+        producer.join()
+        save_queue.put(None)
+        writer.join()
+
+    # 마지막에 한 번만 디바이스 동기화 및 캐시 정리
+    cleanup_memory(device)
 
-        # 로깅 (안전화된 파일명 표시)
-        if safe_awav != awav or safe_ptxt != ptxt or safe_txt != txt:
-            logging.info(f"[{i}/{len(matched_files)}] 처리 중 (파일명 안전화됨)")
-            logging.info(f"  → 오디오: {awav} → {safe_awav}")
-            logging.info(f"  → 프롬프트: {ptxt} → {safe_ptxt}")
-            logging.info(f"  → 텍스트: {txt} → {safe_txt}")
-        else:
-            logging.info(f"[{i}/{len(matched_files)}] 처리 중 → {awav} / {ptxt} / {txt}")
-
-        # 파일 존재 여부 확인 및 로깅
-        missing_files = []
-        if not os.path.exists(wav_path):
-            missing_files.append(f"오디오: {wav_path}")
-        if not os.path.exists(ptxt_path):
-            missing_files.append(f"프롬프트 텍스트: {ptxt_path}")
-        if not os.path.exists(txt_path):
-            missing_files.append(f"대상 텍스트: {txt_path}")
-
-        if missing_files:
-            logging.error(f"  ❌ 누락된 파일: {', '.join(missing_files)}")
-            continue
+    # CosyVoice 모델 메모리 해제
+    cleanup_cosyvoice_model()
 
-        # 오디오 & 텍스트 로드
-        try:
-            prompt_wav = load_wav_resample(wav_path)
-        except Exception as e:
-            logging.error(f"  ❌ 오디오 로드 실패 ({wav_path}): {e}")
-            continue
+    logging.info(f"✅ [{target_language}] 배치 처리 완료 - {len(matched_files)} 개 파일 처리됨")
 
-        # 원본 오디오 길이 추적 (패딩 없이 정확한 길이)
-        try:
-            original_wav = load_wav_resample(wav_path, min_duration=0.0)  # 패딩 없이 로드
-            original_duration = original_wav.size(1) / 16000  # 초 단위
-        except Exception as e:
-            logging.error(f"  ❌ 원본 오디오 길이 측정 실패: {e}")
-            continue
 
+# 파이프라인 설정
+SAVE_QUEUE_SIZE = 8  # 저장 대기 중인 합성 결과 최대 개수
+CLEANUP_INTERVAL = 20  # N개 파일마다 CUDA 캐시 정리 (동기화 없음)
+
+
+def _put_until_stopped(q, item, stop_event) -> bool:
+    """소비자가 중단되면 블록되지 않도록 stop_event를 확인하며 큐에 넣기"""
+    while not stop_event.is_set():
         try:
-            with open(ptxt_path, 'r', encoding='utf-8') as f:
-                prompt_text = f.read().strip()
-            with open(txt_path, 'r', encoding='utf-8') as f:
-                text = f.read().strip()
-        except Exception as e:
-            logging.error(f"  ❌ 텍스트 파일 읽기 실패: {e}")
+            q.put(item, timeout=0.5)
+            return True
+        except queue.Full:
             continue
+    return False
 
-        # 텍스트 유효성 검사
-        if not prompt_text or len(prompt_text.strip()) == 0:
-            logging.error(f"  ❌ 프롬프트 텍스트가 비어 있습니다: {ptxt_path}")
-            continue
-        if not text or len(text.strip()) == 0:
-            logging.error(f"  ❌ 대상 텍스트가 비어 있습니다: {txt_path}")
-            continue
 
-        # 텍스트 전처리 추가 (늘어짐 방지)
-        original_text = text
-        original_prompt_text = prompt_text
-        text = preprocess_text_for_synthesis(text)
-        prompt_text = preprocess_text_for_synthesis(prompt_text)
-
-        # 전처리 결과 로깅
-        if text != original_text:
-            logging.info(f"  → 텍스트 전처리: '{original_text[:30]}...' → '{text[:30]}...'")
-        if prompt_text != original_prompt_text:
-            logging.info(f"  → 프롬프트 텍스트 전처리: '{original_prompt_text[:20]}...' → '{prompt_text[:20]}...'")
-
-        # 텍스트 언어 감지 및 전처리
-        detected_lang = detect_text_language(text)
-        if detected_lang != target_language:
-            logging.warning(f"  ⚠️ 언어 불일치 감지: 예상={target_language}, 감지={detected_lang}")
-
-        # 타겟 언어에 맞는 전처리 적용
-        text = preprocess_text_by_language(text, target_language)
-        prompt_text = preprocess_text_by_language(prompt_text, 'korean')  # 프롬프트는 항상 한국어
-
-        # 전처리 결과 로깅
-        if text != original_text:
-            logging.info(f"  → [{target_language}] 텍스트 전처리: '{original_text[:30]}...' → '{text[:30]}...'")
-        if prompt_text != original_prompt_text:
-            logging.info(
-                f"  → [{target_language}] 프롬프트 텍스트 전처리: '{original_prompt_text[:20]}...' → '{prompt_text[:20]}...'")
-
-        # 파일명에서 기본 이름과 세그먼트 번호 추출
-        base_name = os.path.splitext(awav)[0]  # 예: "조용석_1m_001"
-        if '_' in base_name:
-            # "조용석_1m_001"에서 "조용석_1m"와 "001" 분리
-            parts = base_name.rsplit('_', 1)
-            if len(parts) == 2 and parts[1].isdigit():
-                audio_base = parts[0]  # "조용석_1m"
-                segment_num = parts[1]  # "001"
-            else:
-                audio_base = base_name
-                segment_num = f"{i:03d}"
+def _synthesis_job_producer(matched_files, audio_dir, prompt_text_dir, text_dir, target_language, source_language,
+                            analyze_mood, job_queue, stop_event):
+    """CPU 준비 단계: 파일 읽기, 텍스트 전처리, 프롬프트 오디오 로드를 미리 수행"""
+    try:
+        for i, (awav, ptxt, txt) in enumerate(matched_files, 1):
+            if stop_event.is_set():
+                break
+            try:
+                job = _prepare_synthesis_job(i, len(matched_files), awav, ptxt, txt, audio_dir, prompt_text_dir,
+                                             text_dir, target_language, source_language, analyze_mood)
+            except Exception as e:
+                logging.error(f"[{target_language}] 파일 준비 오류 ({awav}/{txt}): {e}")
+                import traceback
+                logging.error(f"상세 오류: {traceback.format_exc()}")
+                job = None
+
+            if job is not None and not _put_until_stopped(job_queue, job, stop_event):
+                break
+    finally:
+        _put_until_stopped(job_queue, None, stop_event)
+
+
+def _prepare_synthesis_job(i, total, awav, ptxt, txt, audio_dir, prompt_text_dir, text_dir, target_language,
+                           source_language, analyze_mood):
+    """
+    한 세그먼트의 합성 입력을 준비 (GPU를 사용하지 않는 모든 작업)
+
+    Returns:
+        합성 작업 dict 또는 None (건너뛸 파일)
+    """
+    # 파일 경로 안전화
+    safe_awav = sanitize_filename(awav)
+    safe_ptxt = sanitize_filename(ptxt)
+    safe_txt = sanitize_filename(txt)
+
+    wav_path = safe_file_operations(os.path.join(audio_dir, awav), "read")
+    ptxt_path = safe_file_operations(os.path.join(prompt_text_dir, ptxt), "read")
+    txt_path = safe_file_operations(os.path.join(text_dir, txt), "read")
+
+    # 파일 경로 오류 체크
+    if wav_path.startswith("❌") or ptxt_path.startswith("❌") or txt_path.startswith("❌"):
+        logging.error(f"  ❌ 파일 경로 오류:")
+        if wav_path.startswith("❌"):
+            logging.error(f"    - {wav_path}")
+        if ptxt_path.startswith("❌"):
+            logging.error(f"    - {ptxt_path}")
+        if txt_path.startswith("❌"):
+            logging.error(f"    - {txt_path}")
+        return None
+
+    # 로깅 (안전화된 파일명 표시)
+    if safe_awav != awav or safe_ptxt != ptxt or safe_txt != txt:
+        logging.info(f"[{i}/{total}] 준비 중 (파일명 안전화됨)")
+        logging.info(f"  → 오디오: {awav} → {safe_awav}")
+        logging.info(f"  → 프롬프트: {ptxt} → {safe_ptxt}")
+        logging.info(f"  → 텍스트: {txt} → {safe_txt}")
+    else:
+        logging.info(f"[{i}/{total}] 준비 중 → {awav} / {ptxt} / {txt}")
+
+    # 파일 존재 여부 확인 및 로깅
+    missing_files = []
+    if not os.path.exists(wav_path):
+        missing_files.append(f"오디오: {wav_path}")
+    if not os.path.exists(ptxt_path):
+        missing_files.append(f"프롬프트 텍스트: {ptxt_path}")
+    if not os.path.exists(txt_path):
+        missing_files.append(f"대상 텍스트: {txt_path}")
+
+    if missing_files:
+        logging.error(f"  ❌ 누락된 파일: {', '.join(missing_files)}")
+        return None
+
+    # 오디오 & 텍스트 로드 (한 번의 디코딩으로 패딩된 프롬프트와 원본 길이를 함께 얻음)
+    try:
+        prompt_data = load_prompt_audio(wav_path, analyze_mood=analyze_mood)
+        prompt_wav = prompt_data['prompt_wav']
+        original_duration = prompt_data['original_duration']  # 패딩 없는 정확한 길이 (초)
+    except Exception as e:
+        logging.error(f"  ❌ 오디오 로드 실패 ({wav_path}): {e}")
+        return None
+
+    try:
+        with open(ptxt_path, 'r', encoding='utf-8') as f:
+            prompt_text = f.read().strip()
+        with open(txt_path, 'r', encoding='utf-8') as f:
+            text = f.read().strip()
+    except Exception as e:
+        logging.error(f"  ❌ 텍스트 파일 읽기 실패: {e}")
+        return None
+
+    # 텍스트 유효성 검사
+    if not prompt_text or len(prompt_text.strip()) == 0:
+        logging.error(f"  ❌ 프롬프트 텍스트가 비어 있습니다: {ptxt_path}")
+        return None
+    if not text or len(text.strip()) == 0:
+        logging.error(f"  ❌ 대상 텍스트가 비어 있습니다: {txt_path}")
+        return None
+
+    # 텍스트 전처리 추가 (늘어짐 방지)
+    original_text = text
+    original_prompt_text = prompt_text
+    text = preprocess_text_for_synthesis(text)
+    prompt_text = preprocess_text_for_synthesis(prompt_text)
+
+    # 전처리 결과 로깅
+    if text != original_text:
+        logging.info(f"  → 텍스트 전처리: '{original_text[:30]}...' → '{text[:30]}...'")
+    if prompt_text != original_prompt_text:
+        logging.info(f"  → 프롬프트 텍스트 전처리: '{original_prompt_text[:20]}...' → '{prompt_text[:20]}...'")
+
+    # 텍스트 언어 감지 및 전처리
+    detected_lang = detect_text_language(text)
+    if detected_lang != target_language:
+        logging.warning(f"  ⚠️ 언어 불일치 감지: 예상={target_language}, 감지={detected_lang}")
+
+    # 타겟 언어에 맞는 전처리 적용
+    text = preprocess_text_by_language(text, target_language)
+    prompt_text = preprocess_text_by_language(prompt_text, source_language)  # 프롬프트는 원본 언어
+
+    # 전처리 결과 로깅
+    if text != original_text:
+        logging.info(f"  → [{target_language}] 텍스트 전처리: '{original_text[:30]}...' → '{text[:30]}...'")
+    if prompt_text != original_prompt_text:
+        logging.info(
+            f"  → [{target_language}] 프롬프트 텍스트 전처리: '{original_prompt_text[:20]}...' → '{prompt_text[:20]}...'")
+
+    # 파일명에서 기본 이름과 세그먼트 번호 추출
+    base_name = os.path.splitext(awav)[0]  # 예: "조용석_1m_001"
+    if '_' in base_name:
+        # "조용석_1m_001"에서 "조용석_1m"와 "001" 분리
+        parts = base_name.rsplit('_', 1)
+        if len(parts) == 2 and parts[1].isdigit():
+            audio_base = parts[0]  # "조용석_1m"
+            segment_num = parts[1]  # "001"
         else:
             audio_base = base_name
             segment_num = f"{i:03d}"
+    else:
+        audio_base = base_name
+        segment_num = f"{i:03d}"
+
+    # Prompt 오디오 전처리 (WebUI와 동일)
+    try:
+        prompt_wav_processed = postprocess(prompt_wav)
+    except Exception as e:
+        logging.error(f"  ❌ 프롬프트 오디오 전처리 실패: {e}")
+        return None
+
+    # 합성 전 필수 조건 재확인
+    if prompt_wav_processed is None or prompt_wav_processed.size(1) == 0:
+        logging.error(f"  ❌ 처리된 프롬프트 오디오가 비어 있습니다")
+        return None
+    if not text.strip() or not prompt_text.strip():
+        logging.error(f"  ❌ 처리된 텍스트가 비어 있습니다")
+        return None
+
+    return {
+        'index': i,
+        'total': total,
+        'awav': awav,
+        'txt': txt,
+        'wav_path': wav_path,
+        'text': text,
+        'prompt_text': prompt_text,
+        'prompt_wav_processed': prompt_wav_processed,
+        'original_duration': original_duration,
+        'mood_command': prompt_data['mood_command'],
+        'audio_base': audio_base,
+        'segment_num': segment_num,
+    }
+
 
-        logging.info(f"  → 원본 길이: {original_duration:.2f}s")
+def _synthesis_consumer(job_queue, save_queue, zero_shot_dir, instruct_dir, target_language, enable_instruct,
+                        manual_command, device, mood_table=None, timeline=None, save_segments=True):
+    """GPU 합성 단계: 준비된 작업을 받아 합성하고 결과를 저장 스레드로 넘김"""
+    processed = 0
+    while True:
+        job = job_queue.get()
+        if job is None:
+            break
+
+        awav = job['awav']
+        txt = job['txt']
+        logging.info(f"[{job['index']}/{job['total']}] 합성 중 → {awav}")
+        logging.info(f"  → 원본 길이: {job['original_duration']:.2f}s")
 
         try:
-            # Prompt 오디오 전처리 (WebUI와 동일)
-            try:
-                prompt_wav_processed = postprocess(prompt_wav)
-            except Exception as e:
-                logging.error(f"  ❌ 프롬프트 오디오 전처리 실패: {e}")
-                continue
+            prompt_wav_processed = job['prompt_wav_processed']
 
             # 프롬프트 오디오 최적화 비활성화 (음성 클로닝 품질 보존)
             logging.info(f"  → [{target_language}] 프롬프트 오디오 길이: {prompt_wav_processed.size(1) / 16000:.2f}s (원본 길이 보존)")
 
-            # 합성 전 필수 조건 재확인
-            if prompt_wav_processed is None or prompt_wav_processed.size(1) == 0:
-                logging.error(f"  ❌ 처리된 프롬프트 오디오가 비어 있습니다")
-                continue
-            if not text.strip() or not prompt_text.strip():
-                logging.error(f"  ❌ 처리된 텍스트가 비어 있습니다")
-                continue
-
             # 언어별 속도 조정 적용
             lang_config = LANGUAGE_CONFIGS.get(target_language, LANGUAGE_CONFIGS['korean'])
             base_speed_ratio = lang_config['speech_rate']
@@ -837,12 +997,14 @@ def main(audio_dir, prompt_text_dir, text_dir, out_dir, model_path=LOCAL_COSYVOI
                 if manual_command:
                     base_instruct_command = manual_command
 
+                elif mood_table is not None:
+                    base_instruct_command = lookup_mood_command(mood_table, int(job['segment_num']))
+                    if base_instruct_command is None:
+                        # 테이블에 없는 세그먼트만 개별 분석
+                        base_instruct_command = analyze_audio_mood(job['wav_path'])
+
                 else:
-                    try:
-                        base_instruct_command = analyze_audio_mood(wav_path)
-                    except Exception as e:
-                        logging.warning(f"  ⚠️ 오디오 분위기 분석 실패: {e}, 기본값 사용")
-                        base_instruct_command = "자연스럽게 말해"
+                    base_instruct_command = job['mood_command'] or "자연스럽게 말해"
 
                 # 타겟 언어에 맞는 명령어로 변환
                 instruct_command = get_language_specific_instruct_command(base_instruct_command, target_language)
@@ -850,83 +1012,60 @@ def main(audio_dir, prompt_text_dir, text_dir, out_dir, model_path=LOCAL_COSYVOI
             else:
                 instruct_command = None
 
+            # 스트리밍 병합: 세그먼트 위치를 열고 청크를 바로 타임라인에 기록
+            on_chunk = None
+            if timeline is not None and timeline.begin_segment(int(job['segment_num'])):
+                on_chunk = timeline.write
+
             # 스마트 합성 수행
             synthesized_audio, method_used, final_duration = smart_synthesis_with_length_control(
                 cosy,
-                text,
-                prompt_text,
+                job['text'],
+                job['prompt_text'],
                 prompt_wav_processed,
-                original_duration,
+                job['original_duration'],
                 target_language,
                 instruct_command,
-                final_speed_ratio
+                final_speed_ratio,
+                on_chunk=on_chunk
             )
 
+            if timeline is not None:
+                if synthesized_audio is None:
+                    timeline.rollback()
+                elif method_used == "instruct2_fast":
+                    # Instruct2가 선택되면 이미 기록된 Zero-shot 청크를 되돌리고 교체
+                    if on_chunk is not None:
+                        timeline.rollback()
+                        timeline.begin_segment(int(job['segment_num']))
+                        timeline.write(synthesized_audio)
+                    timeline.end_segment()
+                else:
+                    timeline.end_segment()
+
             if synthesized_audio is not None:
                 # Zero-shot 결과 저장
                 if method_used == "zero_shot" or method_used == "zero_shot_final" or method_used == "zero_shot_fallback":
-                    try:
-                        logging.info(f"  → [{target_language}] Zero-shot 결과 저장 시작...")
-
-                        # 안전한 파일명 생성
-                        safe_name = sanitize_filename(f"{audio_base}_{segment_num}.wav")
-                        save_path = os.path.join(zero_shot_dir, safe_name)
-
-                        # 디렉토리 확인 및 생성
-                        if not os.path.exists(zero_shot_dir):
-                            os.makedirs(zero_shot_dir, exist_ok=True)
-
-                        try:
-                            torchaudio.save(save_path, synthesized_audio, 24000)
-                            final_duration = synthesized_audio.size(1) / 24000
-
-                            # 파일 저장 확인
-                            if os.path.exists(save_path):
-                                file_size = os.path.getsize(save_path)
-                                logging.info(
-                                    f"    ✅ Zero-shot 저장 완료 ➜ {safe_name} ({final_duration:.2f}초, {file_size} 바이트)")
-                            else:
-                                logging.error(f"    ❌ 파일이 저장되지 않았습니다: {save_path}")
-
-                        except Exception as save_error:
-                            logging.error(f"    ❌ torchaudio.save 실패: {save_error}")
-                    except Exception as save_error:
-                        logging.error(f"  ❌ [{target_language}] Zero-shot 저장 실패: {save_error}")
+                    if save_segments:
+                        safe_name = sanitize_filename(f"{job['audio_base']}_{job['segment_num']}.wav")
+                        save_queue.put({
+                            'kind': 'Zero-shot',
+                            'out_dir': zero_shot_dir,
+                            'name': safe_name,
+                            'audio': synthesized_audio,
+                        })
                 else:
                     logging.info(f"  → [{target_language}] Zero-shot 결과가 Instruct2로 대체됨")
 
                 # Instruct2 결과 저장
                 if method_used == "instruct2_fast":
-                    try:
-                        logging.info(f"  → [{target_language}] Instruct2 결과 저장 시작...")
-
-                        # Instruct2 디렉토리 확실히 생성
-                        if not os.path.exists(instruct_dir):
-                            os.makedirs(instruct_dir, exist_ok=True)
-                            logging.info(f"  → Instruct2 출력 디렉토리 생성: {instruct_dir}")
-
-                        # 안전한 파일명 생성
-                        safe_name = sanitize_filename(f"{audio_base}_{segment_num}_instruct.wav")
-                        save_path = os.path.join(instruct_dir, safe_name)
-
-                        try:
-                            torchaudio.save(save_path, synthesized_audio, 24000)
-                            final_duration = synthesized_audio.size(1) / 24000
-
-                            # 파일 저장 확인
-                            if os.path.exists(save_path):
-                                file_size = os.path.getsize(save_path)
-                                logging.info(
-                                    f"    ✅ Instruct2 저장 완료 ➜ {safe_name} ({final_duration:.2f}초, {file_size} 바이트)")
-                            else:
-                                logging.error(f"    ❌ 파일이 저장되지 않았습니다: {save_path}")
-
-                        except Exception as save_error:
-                            logging.error(f"    ❌ Instruct2 파일 저장 실패: {save_error}")
-                    except Exception as e:
-                        logging.error(f"    ❌ [{target_language}] Instruct2 처리 실패: {e}")
-                        import traceback
-                        logging.error(f"    상세 오류: {traceback.format_exc()}")
+                    safe_name = sanitize_filename(f"{job['audio_base']}_{job['segment_num']}_instruct.wav")
+                    save_queue.put({
+                        'kind': 'Instruct2',
+                        'out_dir': instruct_dir,
+                        'name': safe_name,
+                        'audio': synthesized_audio,
+                    })
             else:
                 logging.error(f"  ❌ [{target_language}] 합성 결과가 없어 저장 건너뜀")
 
@@ -935,14 +1074,53 @@ def main(audio_dir, prompt_text_dir, text_dir, out_dir, model_path=LOCAL_COSYVOI
             import traceback
             logging.error(f"상세 오류: {traceback.format_exc()}")
             logging.info("다음 파일로 이동 중...")
+            if timeline is not None:
+                timeline.rollback()
 
-        # 메모리 정리 (각 파일 처리 후)
-        cleanup_memory(device)
+        # 메모리 정리 (주기적으로, 디바이스 동기화 없이)
+        processed += 1
+        if processed % CLEANUP_INTERVAL == 0:
+            cleanup_memory(device, synchronize=False)
 
-    # CosyVoice 모델 메모리 해제
-    cleanup_cosyvoice_model()
 
-    logging.info(f"✅ [{target_language}] 배치 처리 완료 - {len(matched_files)} 개 파일 처리됨")
+def _synthesis_result_writer(save_queue, target_language):
+    """저장 단계: 합성 결과를 WAV로 기록하고 저장 여부를 확인 (GPU 합성과 병행)"""
+    while True:
+        item = save_queue.get()
+        if item is None:
+            break
+
+        kind = item['kind']
+        out_dir = item['out_dir']
+        safe_name = item['name']
+        save_path = os.path.join(out_dir, safe_name)
+
+        try:
+            logging.info(f"  → [{target_language}] {kind} 결과 저장 시작...")
+
+            # 디렉토리 확인 및 생성
+            if not os.path.exists(out_dir):
+                os.makedirs(out_dir, exist_ok=True)
+                logging.info(f"  → {kind} 출력 디렉토리 생성: {out_dir}")
+
+            try:
+                torchaudio.save(save_path, item['audio'], 24000)
+                final_duration = item['audio'].size(1) / 24000
+
+                # 파일 저장 확인
+                if os.path.exists(save_path):
+                    file_size = os.path.getsize(save_path)
+                    logging.info(
+                        f"    ✅ {kind} 저장 완료 ➜ {safe_name} ({final_duration:.2f}초, {file_size} 바이트)")
+                else:
+                    logging.error(f"    ❌ 파일이 저장되지 않았습니다: {save_path}")
+
+            except Exception as save_error:
+                logging.error(f"    ❌ {kind} 파일 저장 실패: {save_error}")
+        except Exception as e:
+            logging.error(f"  ❌ [{target_language}] {kind} 저장 실패: {e}")
+            import traceback
+            logging.error(f"    상세 오류: {traceback.format_exc()}")
 
 
 # 스크립트 엔트리포인트
@@ -958,6 +1136,14 @@ if __name__ == '__main__':
     parser.add_argument('--enable_instruct', action='store_true', default=False, help="Instruct2 기능 활성화")
     parser.add_argument('--manual_command', type=str, default=None, help="수동 지정 instruct 명령어")
     parser.add_argument('--target_language', type=str, default=None, help="타겟 언어 (english/chinese/japanese/korean)")
+    parser.add_argument('--source_language', type=str, default='korean', choices=list(LANGUAGE_CONFIGS),
+                        help="프롬프트(원본) 언어")
+    parser.add_argument('--source_code', type=str, default=None,
+                        help="텍스트 파일명의 원본 언어 코드 (기본: source_language의 코드)")
+    parser.add_argument('--prefetch_depth', type=int, default=2, help="CPU 준비 단계에서 미리 준비해 둘 세그먼트 수 (최소 1)")
+    parser.add_argument('--mood_table', type=str, default=None, help="일괄 계산된 분위기 특징 테이블 (.npy) 경로")
+    parser.add_argument('--backend', choices=TTS_BACKENDS + ('auto',), default=DEFAULT_TTS_BACKEND,
+                        help="CosyVoice2 추론 백엔드 (auto=벤치마크 기준 가장 빠른 백엔드)")
     args = parser.parse_args()
 
     main(
@@ -968,5 +1154,10 @@ if __name__ == '__main__':
         model_path=args.model_path,
         enable_instruct=args.enable_instruct,
         manual_command=args.manual_command,
-        target_language=args.target_language
+        target_language=args.target_language,
+        prefetch_depth=args.prefetch_depth,
+        mood_table_path=args.mood_table,
+        backend=args.backend,
+        source_language=args.source_language,
+        source_code=args.source_code
     )
@@ -4,20 +4,23 @@ import os
 from gtranslate import literal_translate, free_translate, SUPPORTED_LANGUAGES
 
 
-def batch_translate(input_dir: str, output_dir: str, length_ratio: float = 0.8, target_languages: list = None):
+def batch_translate(input_dir: str, output_dir: str, length_ratio: float = 0.8, target_languages: list = None,
+                    source_lang: str = "ko"):
     """
-    input_dir: .txt 파일들이 들어있는 폴더 경로 (한국어 대본)
+    input_dir: .txt 파일들이 들어있는 폴더 경로 (원본 언어 대본)
     output_dir: 번역 결과를 저장할 폴더 경로  
     length_ratio: 원본 대비 번역 길이 비율 (0.8 = 원본의 80% 길이로 축약)
     target_languages: 번역할 언어 리스트 (기본값: ["english"])
+    source_lang: 원본 언어 코드 (기본값: "ko", 원본과 같은 언어는 번역 대상에서 제외)
     """
     if target_languages is None:
         target_languages = ["english"]
 
     # 지원되지 않는 언어 필터링
-    target_languages = [lang for lang in target_languages if lang in SUPPORTED_LANGUAGES]
+    target_languages = [lang for lang in target_languages
+                        if lang in SUPPORTED_LANGUAGES and SUPPORTED_LANGUAGES[lang]['code'] != source_lang]
     if not target_languages:
-        target_languages = ["english"]
+        target_languages = ["english"] if source_lang != "en" else ["korean"]
 
     os.makedirs(output_dir, exist_ok=True)
 
@@ -38,6 +41,8 @@ def batch_translate(input_dir: str, output_dir: str, length_ratio: float = 0.8,
             'free': free_dir
         }
 
+    untranslated = []  # 번역에 실패하여 원본 텍스트가 그대로 남은 (파일, 언어)
+
     for fname in os.listdir(input_dir):
         if not fname.lower().endswith('.txt'):
             continue
@@ -57,17 +62,22 @@ def batch_translate(input_dir: str, output_dir: str, length_ratio: float = 0.8,
             print(f"  → Translating to {lang_name}...")
 
             # 1) 직역 (길이 제한 적용)
-            lit_out = literal_translate(content, max_length_ratio=length_ratio, target_lang=target_lang)
+            lit_out = literal_translate(content, max_length_ratio=length_ratio, target_lang=target_lang,
+                                        source_lang=source_lang)
             out_lit = os.path.join(lang_dirs[target_lang]['literal'], fname)
             with open(out_lit, 'w', encoding='utf-8') as f:
                 f.write(lit_out)
 
             # 2) 의역 (길이 제한 적용)  
-            free_out = free_translate(content, max_length_ratio=length_ratio, target_lang=target_lang)
+            free_out = free_translate(content, max_length_ratio=length_ratio, target_lang=target_lang,
+                                      source_lang=source_lang)
             out_free = os.path.join(lang_dirs[target_lang]['free'], fname)
             with open(out_free, 'w', encoding='utf-8') as f:
                 f.write(free_out)
 
+            if content in (lit_out, free_out):
+                untranslated.append((fname, lang_name))
+
             # 3) 로그
             print(f"    [OK] {lang_name} → literal: {out_lit}, free: {out_free}")
             print(f"    [ORIGINAL] {content} ({len(content)} chars)")
@@ -81,6 +91,11 @@ def batch_translate(input_dir: str, output_dir: str, length_ratio: float = 0.8,
 
         print("-" * 40)
 
+    if untranslated:
+        print(f"⚠️ [번역 실패] {len(untranslated)}건은 원본 텍스트가 그대로 저장됨:")
+        for fname, lang_name in untranslated:
+            print(f"    {fname} ({lang_name})")
+
     # ——— 번역 완료 후 즉시 LLM 메모리 정리 ———
     print("[메모리 정리] Gemma3 모델을 메모리에서 해제합니다...")
     cleanup_llm_memory()
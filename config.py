@@ -1,6 +1,7 @@
 import os
 import json
 import platform
+from functools import lru_cache
 
 # OS/환경 정보
 IS_WINDOWS = platform.system() == "Windows"
@@ -19,6 +20,18 @@ DEFAULT_VAD_CONFIG = {
 }
 
 
+# 콘텐츠 캐시 설정 파일
+CACHE_CONFIG_FILE = 'cache_config.json'
+
+# 콘텐츠 캐시 기본 설정
+DEFAULT_CACHE_CONFIG = {
+    'cache_dir': 'cache',  # 캐시 루트 (작업 디렉토리 기준)
+    'max_size_gb': 10.0,  # 초과 시 오래 사용하지 않은 항목부터 삭제
+    'enable_stt_cache': True,  # 전사 결과 캐시
+    'enable_separation_cache': True,  # 보컬/배경음 분리 결과 캐시
+}
+
+
 def resource_path(relative_path):
     """리소스 파일 경로 반환"""
     try:
@@ -56,8 +69,23 @@ def save_vad_config(config):
         return False
 
 
+def load_cache_config():
+    """콘텐츠 캐시 설정 로드"""
+    path = resource_path(CACHE_CONFIG_FILE)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)
+    else:
+        loaded = {}
+
+    config = DEFAULT_CACHE_CONFIG.copy()
+    config.update(loaded)
+    return config
+
+
+@lru_cache(maxsize=None)
 def get_whisper_cli_path():
-    """Whisper CLI 경로 반환"""
+    """Whisper CLI 경로 반환 (첫 호출 결과를 프로세스 동안 재사용)"""
     if IS_WINDOWS:
         whisper_cli = resource_path('whisper.cpp/build/bin/Release/whisper-cli')
         if not os.path.exists(whisper_cli):
@@ -67,8 +95,9 @@ def get_whisper_cli_path():
     return whisper_cli
 
 
+@lru_cache(maxsize=None)
 def get_model_path():
-    """OS에 따른 적절한 모델 경로 반환"""
+    """OS에 따른 적절한 모델 경로 반환 (첫 호출 결과를 프로세스 동안 재사용)"""
     if IS_MACOS:
         # macOS: 먼저 CoreML 모델 확인, 없으면 GGML 모델 사용
         coreml_path = resource_path('whisper.cpp/models/ggml-large-v3-turbo-encoder.mlmodelc')
@@ -89,8 +118,9 @@ def get_model_path():
             return resource_path('whisper.cpp/models/ggml-large-v3-turbo.bin'), False
 
 
+@lru_cache(maxsize=None)
 def get_ffmpeg_path():
-    """FFmpeg 경로 탐색"""
+    """FFmpeg 경로 탐색 (찾은 경로는 프로세스 동안 재사용, 실패는 캐시하지 않음)"""
     import shutil
     ffmpeg_path = shutil.which("ffmpeg")
     if not ffmpeg_path and IS_WINDOWS:
@@ -100,3 +130,28 @@ def get_ffmpeg_path():
     if not ffmpeg_path:
         raise RuntimeError("ffmpeg 실행파일을 찾을 수 없습니다.")
     return ffmpeg_path
+
+
+@lru_cache(maxsize=None)
+def get_ffprobe_path():
+    """FFprobe 경로 탐색 (ffmpeg와 같은 폴더 우선, 찾은 경로는 프로세스 동안 재사용)"""
+    import shutil
+    ffprobe_name = 'ffprobe.exe' if IS_WINDOWS else 'ffprobe'
+    try:
+        candidate = os.path.join(os.path.dirname(get_ffmpeg_path()), ffprobe_name)
+        if os.path.exists(candidate):
+            return candidate
+    except RuntimeError:
+        pass
+    ffprobe_path = shutil.which("ffprobe")
+    if not ffprobe_path:
+        raise RuntimeError("ffprobe 실행파일을 찾을 수 없습니다.")
+    return ffprobe_path
+
+
+def clear_path_cache():
+    """모델/실행 파일 경로 캐시 초기화 (모델 다운로드 등으로 파일 구성이 바뀐 뒤 호출)"""
+    get_whisper_cli_path.cache_clear()
+    get_model_path.cache_clear()
+    get_ffmpeg_path.cache_clear()
+    get_ffprobe_path.cache_clear()
@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import subprocess
+import threading
+from config import load_cache_config, get_ffmpeg_path
+from utils import log_message
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_hash_lock = threading.Lock()
+
+
+def _cache_root(cache_config=None) -> str:
+    cache_config = cache_config or load_cache_config()
+    return os.path.abspath(cache_config['cache_dir'])
+
+
+def _stat_key(path: str, kind: str) -> str:
+    st = os.stat(path)
+    return f"{kind}:{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def _load_hash_index(index_path: str) -> dict:
+    """해시 인덱스 로드 (없거나 손상되었으면 빈 인덱스)"""
+    if not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _memoized_hash(path: str, kind: str, compute) -> str:
+    """
+    (경로, 크기, 수정 시각)이 같으면 이전에 계산한 해시 재사용
+    대용량 모델/원본 파일을 실행마다 다시 읽지 않기 위함
+    """
+    index_path = os.path.join(_cache_root(), 'hash_index.json')
+    key = _stat_key(path, kind)
+
+    with _hash_lock:
+        index = _load_hash_index(index_path)
+        if key in index:
+            return index[key]
+
+    digest = compute(path)
+
+    with _hash_lock:
+        # 해시 계산 중 다른 스레드가 인덱스를 갱신했을 수 있으므로 다시 읽은 뒤 추가
+        index = _load_hash_index(index_path)
+        index[key] = digest
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=1)
+    return digest
+
+
+def _sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _sha256_pcm(path: str) -> str:
+    """ffmpeg로 16kHz 모노 PCM으로 디코딩한 스트림의 해시 (컨테이너/메타데이터 차이 무시)"""
+    cmd = [get_ffmpeg_path(), '-v', 'error', '-i', path, '-f', 's16le', '-ac', '1', '-ar', '16000', '-']
+    h = hashlib.sha256()
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as process:
+        for block in iter(lambda: process.stdout.read(HASH_CHUNK_SIZE), b''):
+            h.update(block)
+    if process.returncode != 0:
+        raise RuntimeError(f"PCM 디코딩 실패 (return code: {process.returncode}): {path}")
+    return h.hexdigest()
+
+
+def _sha256_audio_stream(path: str) -> str:
+    """첫 오디오 스트림의 패킷 해시 (디코딩 없이 스트림 복사, 영상/메타데이터 변경 무시)"""
+    cmd = [get_ffmpeg_path(), '-v', 'error', '-i', path, '-map', '0:a:0', '-c', 'copy', '-f', 'hash', '-hash', 'sha256',
+           '-']
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0 or '=' not in result.stdout:
+        raise RuntimeError(f"오디오 스트림 해시 실패 (return code: {result.returncode}): {path}")
+    return result.stdout.strip().split('=', 1)[1]
+
+
+def hash_file(path: str) -> str:
+    """파일 내용 SHA-256 (메모이즈)"""
+    return _memoized_hash(path, 'file', _sha256_file)
+
+
+def hash_pcm(path: str) -> str:
+    """디코딩된 PCM SHA-256 (메모이즈)"""
+    return _memoized_hash(path, 'pcm', _sha256_pcm)
+
+
+def hash_audio_stream(path: str) -> str:
+    """영상/오디오 파일의 오디오 스트림 해시 (메모이즈)"""
+    return _memoized_hash(path, 'astream', _sha256_audio_stream)
+
+
+def make_cache_key(*parts) -> str:
+    """키 구성 요소(해시, 모델, 언어, 파라미터 등)로 캐시 키 생성"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class ContentCache:
+    """
+    내용 주소 기반 파일 캐시 (<cache_dir>/<namespace>/<key>/)
+    항목을 읽을 때마다 사용 시각을 갱신하고, 전체 크기가 제한을 넘으면 오래 사용하지 않은 항목부터 삭제
+    """
+
+    def __init__(self, namespace: str, cache_config=None):
+        self.cache_config = cache_config or load_cache_config()
+        self.root = _cache_root(self.cache_config)
+        self.namespace_dir = os.path.join(self.root, namespace)
+        self.max_bytes = int(self.cache_config['max_size_gb'] * 1024 ** 3)
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.namespace_dir, key)
+
+    def get(self, key: str):
+        """
+        캐시 항목 조회
+
+        Returns:
+            {파일명: 캐시 파일 경로} 또는 None
+        """
+        entry_dir = self._entry_dir(key)
+        manifest_path = os.path.join(entry_dir, 'manifest.json')
+        if not os.path.exists(manifest_path):
+            return None
+
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                names = json.load(f)['files']
+        except Exception:
+            return None
+
+        files = {name: os.path.join(entry_dir, name) for name in names}
+        if not all(os.path.exists(p) for p in files.values()):
+            return None
+
+        os.utime(manifest_path)  # LRU 사용 시각 갱신
+        return files
+
+    def put(self, key: str, files: dict, meta=None):
+        """
+        파일들을 캐시에 저장
+
+        Args:
+            files: {저장할 파일명: 원본 경로}
+            meta: 매니페스트에 함께 기록할 정보 (선택)
+        """
+        entry_dir = self._entry_dir(key)
+        tmp_dir = entry_dir + f".tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        for name, src_path in files.items():
+            shutil.copy2(src_path, os.path.join(tmp_dir, name))
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump({'files': list(files), 'created': time.time(), 'meta': meta or {}}, f, ensure_ascii=False,
+                      indent=2)
+
+        # 완성된 항목만 보이도록 디렉토리 단위로 교체
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+        self.enforce_limit()
+
+    def enforce_limit(self):
+        """캐시 루트 전체 크기를 제한 이하로 유지 (LRU)"""
+        entries = []
+        total = 0
+        if not os.path.isdir(self.root):
+            return
+
+        for namespace in os.listdir(self.root):
+            ns_dir = os.path.join(self.root, namespace)
+            if not os.path.isdir(ns_dir):
+                continue
+            for key in os.listdir(ns_dir):
+                entry_dir = os.path.join(ns_dir, key)
+                manifest_path = os.path.join(entry_dir, 'manifest.json')
+                if not os.path.exists(manifest_path):
+                    continue
+                size = sum(os.path.getsize(os.path.join(entry_dir, f)) for f in os.listdir(entry_dir))
+                entries.append((os.path.getmtime(manifest_path), size, entry_dir))
+                total += size
+
+        for _, size, entry_dir in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            log_message(f"🧹 캐시 용량 초과 - 오래된 항목 삭제: {entry_dir}")
@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import argparse
+import subprocess
+from config import get_ffmpeg_path
+from utils import log_message
+
+# 인코딩 프로필: 영상/음성 코덱 인자 (ffmpeg 출력 옵션)
+# 'copy_*'는 영상 스트림을 재인코딩하지 않음 (가장 빠름), 'x264_*'는 영상을 다시 인코딩
+ENCODE_PROFILES = {
+    'copy_aac192': {
+        'video': ['-c:v', 'copy'],
+        'audio': ['-c:a', 'aac', '-b:a', '192k'],
+        'description': '영상 복사 + AAC 192k (기존 기본값)',
+    },
+    'copy_aac128': {
+        'video': ['-c:v', 'copy'],
+        'audio': ['-c:a', 'aac', '-b:a', '128k'],
+        'description': '영상 복사 + AAC 128k',
+    },
+    'copy_opus96': {
+        'video': ['-c:v', 'copy'],
+        'audio': ['-c:a', 'libopus', '-b:a', '96k'],
+        'description': '영상 복사 + Opus 96k (AAC 192k와 비슷한 음질, 절반 크기)',
+    },
+    'copy_opus64': {
+        'video': ['-c:v', 'copy'],
+        'audio': ['-c:a', 'libopus', '-b:a', '64k'],
+        'description': '영상 복사 + Opus 64k (음성 위주 콘텐츠)',
+    },
+    'x264_ultrafast': {
+        'video': ['-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '23'],
+        'audio': ['-c:a', 'aac', '-b:a', '192k'],
+        'description': 'x264 ultrafast (인코딩 최속, 파일 큼)',
+    },
+    'x264_veryfast': {
+        'video': ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '23'],
+        'audio': ['-c:a', 'aac', '-b:a', '192k'],
+        'description': 'x264 veryfast (속도/크기 균형)',
+    },
+    'x264_default': {
+        'video': ['-c:v', 'libx264'],
+        'audio': ['-c:a', 'aac', '-b:a', '192k'],
+        'description': 'x264 기본 설정 (preset medium, 기존 립싱크 변환)',
+    },
+}
+
+DEFAULT_MUX_PROFILE = 'copy_aac192'
+DEFAULT_REENCODE_PROFILE = 'x264_default'  # 프레임레이트 변환 등 영상 재인코딩이 필수인 경우
+
+BENCHMARK_REPORT_PATH = 'encode_benchmark.json'
+BENCHMARK_DURATION_S = 30.0
+
+
+def get_encode_profile(name, default=DEFAULT_MUX_PROFILE):
+    """프로필 조회 (알 수 없는 이름이면 경고 후 기본 프로필)"""
+    if name in ENCODE_PROFILES:
+        return ENCODE_PROFILES[name]
+    if name is not None:
+        log_message(f"⚠️ 알 수 없는 인코딩 프로필 '{name}' - '{default}' 사용 "
+                    f"(사용 가능: {', '.join(ENCODE_PROFILES)})")
+    return ENCODE_PROFILES[default]
+
+
+def audio_args(name):
+    """프로필의 오디오 코덱 인자"""
+    return list(get_encode_profile(name)['audio'])
+
+
+def video_args(name, reencode=False):
+    """
+    프로필의 영상 코덱 인자
+    reencode=True이면 스트림 복사가 불가능한 경우(프레임레이트 변환 등)이므로 복사 프로필 대신 재인코딩 기본값 사용
+    """
+    args = list(get_encode_profile(name, DEFAULT_REENCODE_PROFILE if reencode else DEFAULT_MUX_PROFILE)['video'])
+    if reencode and args[-1] == 'copy':
+        return list(ENCODE_PROFILES[DEFAULT_REENCODE_PROFILE]['video'])
+    return args
+
+
+def benchmark_profiles(sample_path, profiles=None, duration_s=BENCHMARK_DURATION_S, output_dir='encode_benchmark',
+                       report_path=BENCHMARK_REPORT_PATH):
+    """
+    샘플 영상의 앞부분으로 프로필별 인코딩 시간과 출력 크기를 측정
+
+    Returns:
+        [{'profile', 'elapsed_sec', 'size_bytes', 'kbps', 'speed'(실시간 배수) 또는 'error'}, ...]
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    ffmpeg_path = get_ffmpeg_path()
+    results = []
+
+    for name in profiles or list(ENCODE_PROFILES):
+        profile = get_encode_profile(name)
+        output_path = os.path.join(output_dir, f"{name}.mkv")
+        cmd = [ffmpeg_path, '-v', 'error', '-y', '-t', str(duration_s), '-i', sample_path,
+               '-map', '0:v:0', '-map', '0:a:0'] + profile['video'] + profile['audio'] + [output_path]
+
+        log_message(f"⏱️ 인코딩 벤치마크: {name} - {profile['description']}")
+        start = time.perf_counter()
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+
+        if result.returncode != 0:
+            log_message(f"❌ {name} 실패: {result.stderr.strip()}")
+            results.append({'profile': name, 'error': result.stderr.strip()})
+            continue
+
+        size = os.path.getsize(output_path)
+        results.append({
+            'profile': name,
+            'elapsed_sec': round(elapsed, 3),
+            'size_bytes': size,
+            'kbps': round(size * 8 / duration_s / 1000, 1),
+            'speed': round(duration_s / elapsed, 1) if elapsed > 0 else None,
+        })
+
+    log_message(f"📊 인코딩 벤치마크 결과 ({duration_s:.0f}초 샘플: {sample_path})")
+    log_message(f"   {'프로필':<16} {'시간(초)':>9} {'크기(MB)':>9} {'kbps':>9} {'실시간배수':>10}")
+    for r in results:
+        if 'error' in r:
+            log_message(f"   {r['profile']:<16} 실패")
+        else:
+            log_message(f"   {r['profile']:<16} {r['elapsed_sec']:>9.2f} {r['size_bytes'] / 1024 ** 2:>9.2f} "
+                        f"{r['kbps']:>9.1f} {r['speed']:>9.1f}x")
+
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump({'sample': sample_path, 'duration_s': duration_s, 'results': results}, f, ensure_ascii=False,
+                      indent=2)
+        log_message(f"💾 벤치마크 보고서 저장: {report_path}")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='인코딩 프로필별 시간/크기 벤치마크')
+    parser.add_argument('sample', help='샘플 영상 경로')
+    parser.add_argument('--duration', type=float, default=BENCHMARK_DURATION_S, help='측정할 앞부분 길이 (초)')
+    parser.add_argument('--profiles', default=None, help='쉼표로 구분한 프로필 목록 (기본: 전체)')
+    parser.add_argument('--output_dir', default='encode_benchmark', help='인코딩 결과 저장 폴더')
+    parser.add_argument('--report', default=BENCHMARK_REPORT_PATH, help='보고서 JSON 경로')
+    args = parser.parse_args()
+
+    benchmark_profiles(args.sample, args.profiles.split(',') if args.profiles else None, args.duration,
+                       args.output_dir, args.report)
@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import subprocess
+from config import get_whisper_cli_path, get_model_path, get_ffmpeg_path, resource_path, clear_path_cache, IS_MACOS
+from utils import log_message
+
+repo_root = os.path.dirname(os.path.abspath(__file__))
+ENVIRONMENT_REPORT_PATH = 'environment_report.json'
+
+# 단계별 필수 항목 (require_environment에서 확인)
+# stt는 whisper-cli 실행 경로, stt_inprocess는 pywhispercpp 상주 모델 경로 (whisper-cli 불필요)
+STAGE_REQUIREMENTS = {
+    'stt': ('ffmpeg', 'whisper_cli', 'whisper_model', 'whisper_vad_model'),
+    'stt_inprocess': ('ffmpeg', 'pywhispercpp', 'whisper_model', 'whisper_vad_model'),
+    'separation': ('ffmpeg', 'uvr5_model', 'torch'),
+    'tts': ('cosyvoice_model', 'torch'),
+    'lipsync': ('ffmpeg', 'musetalk_model'),
+}
+
+# 모델 파일 최소 크기 (다운로드 중단으로 잘린 파일 감지용)
+MIN_MODEL_BYTES = 1024 * 1024
+
+COSYVOICE_MODEL_DIR = os.path.join(repo_root, 'CosyVoice', 'pretrained_models', 'CosyVoice2-0.5B')
+COSYVOICE_REQUIRED_FILES = ('cosyvoice2.yaml', 'llm.pt', 'flow.pt', 'hift.pt')
+UVR5_MODEL_PATH = os.path.join(repo_root, 'GPT-SoVITS', 'tools', 'uvr5', 'uvr5_weights', 'HP2_all_vocals.pth')
+MUSETALK_MODEL_PATH = os.path.join(repo_root, 'MuseTalk', 'models', 'musetalkV15', 'unet.pth')
+
+_report = None
+
+
+def _command_version(cmd):
+    """실행 파일 버전 문자열 (첫 줄, 실패 시 None)"""
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        lines = (result.stdout or result.stderr).strip().splitlines()
+        return lines[0] if lines else None
+    except Exception:
+        return None
+
+
+def _check_file(path, min_bytes=0):
+    """파일 존재/크기 확인"""
+    if not path or not os.path.exists(path):
+        return {'path': path, 'ok': False, 'detail': '없음'}
+    size = os.path.getsize(path) if os.path.isfile(path) else None
+    if size is not None and size < min_bytes:
+        return {'path': path, 'ok': False, 'size': size, 'detail': f'파일이 너무 작음 ({size} bytes)'}
+    return {'path': path, 'ok': True, 'size': size}
+
+
+def _check_ffmpeg():
+    try:
+        path = get_ffmpeg_path()
+    except RuntimeError as e:
+        return {'path': None, 'ok': False, 'detail': str(e)}
+    return {'path': path, 'ok': True, 'version': _command_version([path, '-version'])}
+
+
+def _check_whisper_cli():
+    path = get_whisper_cli_path()
+    entry = _check_file(path)
+    if entry['ok'] and not os.access(path, os.X_OK):
+        entry.update(ok=False, detail='실행 권한 없음')
+    return entry
+
+
+def _check_whisper_model():
+    model_path, is_coreml = get_model_path()
+    entry = _check_file(model_path, MIN_MODEL_BYTES)
+    entry['coreml'] = is_coreml
+    return entry
+
+
+def _check_cosyvoice_model():
+    missing = [f for f in COSYVOICE_REQUIRED_FILES if not os.path.exists(os.path.join(COSYVOICE_MODEL_DIR, f))]
+    if missing:
+        return {'path': COSYVOICE_MODEL_DIR, 'ok': False, 'detail': f"누락: {', '.join(missing)}"}
+    size = sum(os.path.getsize(os.path.join(COSYVOICE_MODEL_DIR, f)) for f in COSYVOICE_REQUIRED_FILES)
+    return {'path': COSYVOICE_MODEL_DIR, 'ok': True, 'size': size}
+
+
+def _check_module(name, version_attr='__version__'):
+    try:
+        module = __import__(name)
+    except Exception as e:
+        return {'ok': False, 'detail': f'import 실패: {e}'}
+    return {'ok': True, 'version': str(getattr(module, version_attr, None))}
+
+
+def _check_torch():
+    entry = _check_module('torch')
+    if entry['ok']:
+        import torch
+        entry['cuda'] = torch.cuda.is_available()
+        entry['mps'] = bool(getattr(torch.backends, 'mps', None) and torch.backends.mps.is_available())
+        if entry['cuda']:
+            entry['cuda_device'] = torch.cuda.get_device_name(0)
+    return entry
+
+
+def probe_environment(force=False, report_path=ENVIRONMENT_REPORT_PATH):
+    """
+    모델 파일/실행 파일/라이브러리를 한 번에 확인하여 기능 보고서 생성 (프로세스 동안 재사용)
+
+    Args:
+        force: True이면 경로 캐시를 비우고 다시 확인 (모델 설치 후 등)
+
+    Returns:
+        {'checked_at': ..., 'items': {이름: {'ok', 'path', 'size', 'version', 'detail', ...}}, 'stages': {단계: bool}}
+    """
+    global _report
+    if _report is not None and not force:
+        return _report
+    if force:
+        clear_path_cache()
+
+    items = {
+        'ffmpeg': _check_ffmpeg(),
+        'whisper_cli': _check_whisper_cli(),
+        'whisper_model': _check_whisper_model(),
+        'whisper_vad_model': _check_file(resource_path('whisper.cpp/models/ggml-silero-v5.1.2.bin')),
+        'cosyvoice_model': _check_cosyvoice_model(),
+        'uvr5_model': _check_file(UVR5_MODEL_PATH, MIN_MODEL_BYTES),
+        'musetalk_model': _check_file(MUSETALK_MODEL_PATH, MIN_MODEL_BYTES),
+        'torch': _check_torch(),
+        'pywhispercpp': _check_module('pywhispercpp'),
+        'silero_vad': _check_module('silero_vad'),
+        'onnxruntime': _check_module('onnxruntime'),
+    }
+    if IS_MACOS:
+        items['whisper_coreml'] = _check_file(
+            resource_path('whisper.cpp/models/ggml-large-v3-turbo-encoder.mlmodelc'))
+
+    _report = {
+        'checked_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'items': items,
+        'stages': {stage: all(items[name]['ok'] for name in names) for stage, names in STAGE_REQUIREMENTS.items()},
+    }
+
+    try:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(_report, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        log_message(f"⚠️ 환경 보고서 저장 실패: {e}")
+
+    return _report
+
+
+def log_environment_report(report=None):
+    """기능 보고서 요약 로그"""
+    report = report or probe_environment()
+    log_message("🩺 실행 환경 점검 결과:")
+    for name, entry in report['items'].items():
+        mark = '✅' if entry['ok'] else '❌'
+        info = entry.get('version') or entry.get('path') or ''
+        detail = f" - {entry['detail']}" if entry.get('detail') else ''
+        log_message(f"   {mark} {name}: {info}{detail}")
+    for stage, ok in report['stages'].items():
+        log_message(f"   {'🟢' if ok else '🔴'} 단계 '{stage}' {'사용 가능' if ok else '사용 불가'}")
+
+
+def require_environment(stages):
+    """
+    작업 시작 전에 필요한 단계의 필수 항목 확인 (단계 도중 실패하지 않도록 미리 중단)
+
+    Raises:
+        RuntimeError: 필수 항목이 없을 때 (누락 항목 목록 포함)
+    """
+    report = probe_environment()
+    missing = []
+    for stage in stages:
+        for name in STAGE_REQUIREMENTS[stage]:
+            entry = report['items'][name]
+            if not entry['ok']:
+                missing.append(f"{stage}/{name}: {entry.get('detail', '')} ({entry.get('path') or '-'})")
+    if missing:
+        raise RuntimeError("실행 환경 점검 실패:\n  " + "\n  ".join(missing))
+
+
+if __name__ == '__main__':
+    log_environment_report(probe_environment(force=True))
@@ -305,6 +305,17 @@ def cleanup_llm():
     print("LLM 메모리 해제 완료")
 
 
+# 원본(음성 인식) 언어 코드 → 프롬프트용 언어 이름
+SOURCE_LANGUAGE_NAMES = {
+    'ko': 'Korean',
+    'en': 'English',
+    'ja': 'Japanese',
+    'zh': 'Chinese',
+    'es': 'Spanish',
+    'fr': 'French',
+    'de': 'German',
+}
+
 # 지원 언어 설정 - Stop words에 한글 문자 추가
 SUPPORTED_LANGUAGES = {
     'english': {
@@ -328,41 +339,67 @@ SUPPORTED_LANGUAGES = {
         'prompt_name': 'Japanese',
         'stop_words': ["\n\n", "Korean:", "Japanese:", "가", "나", "다", "라", "마", "바", "사", "아", "자", "차", "카", "타", "파",
                        "하"]
+    },
+    # 한국어가 아닌 원본을 한국어로 더빙할 때 사용 (한글 stop word 없음)
+    'korean': {
+        'name': 'Korean',
+        'code': 'ko',
+        'prompt_name': 'Korean',
+        'stop_words': ["\n\n", "Korean:"]
     }
 }
 
 
-def _create_enhanced_prompt(text: str, target_language: str, length_guide: str, is_free: bool = False) -> str:
-    """향상된 프롬프트 생성 - 한글 출력 방지 강화"""
+def _source_name(source_lang: str) -> str:
+    """원본 언어 코드의 프롬프트용 이름"""
+    return SOURCE_LANGUAGE_NAMES.get(source_lang, source_lang)
+
+
+def _stop_words(lang_config: dict, source_lang: str) -> list:
+    """타겟 언어 stop words에 원본 언어 레이블 추가"""
+    label = f"{_source_name(source_lang)}:"
+    stop_words = lang_config['stop_words']
+    return stop_words if label in stop_words else stop_words + [label]
+
+
+def _leaks_source(text: str, source_lang: str) -> bool:
+    """번역 결과에 원본 언어가 섞였는지 확인 (문자 체계로 구분 가능한 한국어 원본만 검사)"""
+    return source_lang == 'ko' and _contains_korean(text)
+
 
-    # 감탄사나 의성어 감지
+def _create_enhanced_prompt(text: str, target_language: str, length_guide: str, is_free: bool = False,
+                            source_lang: str = 'ko') -> str:
+    """향상된 프롬프트 생성 - 원본 언어(기본 한국어) 출력 방지 강화"""
+    source_name = _source_name(source_lang)
+
+    # 감탄사나 의성어 감지 (한국어 원본)
     simple_expressions = ["네", "예", "아", "오", "어", "음", "응", "아니", "그래", "맞아", "좋아", "안녕"]
-    is_simple = any(expr in text for expr in simple_expressions) and len(text.strip()) <= 10
+    is_simple = source_lang == 'ko' and any(expr in text for expr in simple_expressions) and len(text.strip()) <= 10
 
-    # 감정 표현 감지
+    # 감정 표현 감지 (한국어 원본)
     emotion_words = ["놀랐", "깜짝", "기뻐", "슬퍼", "화나", "무서워", "좋아", "싫어"]
-    has_emotion = any(word in text for word in emotion_words)
+    has_emotion = source_lang == 'ko' and any(word in text for word in emotion_words)
 
     if is_simple or has_emotion:
         # 간단한 표현이나 감정 표현은 더 구체적인 가이드 제공
         base_prompt = (
-            f"You are a professional translator. Translate the given Korean expression to {target_language}. "
-            f"IMPORTANT: Never output Korean characters. Only provide the {target_language} translation. "
-            f"If the Korean text expresses surprise, use appropriate surprise expressions in {target_language}. "
+            f"You are a professional translator. Translate the given {source_name} expression to {target_language}. "
+            f"IMPORTANT: Never output {source_name} characters. Only provide the {target_language} translation. "
+            f"If the {source_name} text expresses surprise, use appropriate surprise expressions in {target_language}. "
             f"If it's a simple response like '네/예', translate to appropriate response words. "
             f"{length_guide}\n\n"
-            f"Korean expression: {text}\n"
+            f"{source_name} expression: {text}\n"
             f"Translation in {target_language}:"
         )
     else:
         # 일반 문장
         translation_style = "with natural expressions" if is_free else "accurately"
         base_prompt = (
-            f"You are a professional translator. Translate the Korean text to {target_language} {translation_style}. "
-            f"CRITICAL RULE: Absolutely no Korean characters in your response. "
+            f"You are a professional translator. Translate the {source_name} text to {target_language} {translation_style}. "
+            f"CRITICAL RULE: Absolutely no {source_name} characters in your response. "
             f"Only output the {target_language} translation. "
             f"{length_guide}\n\n"
-            f"Korean: {text}\n"
+            f"{source_name}: {text}\n"
             f"{target_language} translation:"
         )
 
@@ -370,16 +407,18 @@ def _create_enhanced_prompt(text: str, target_language: str, length_guide: str,
 
 
 def literal_translate(text: str, max_length_ratio: float = 1.0, quality_mode: str = "balanced",
-                      target_lang: str = "english") -> str:
+                      target_lang: str = "english", source_lang: str = "ko") -> str:
     """
     직역: 한글 출력 방지를 강화한 번역
+    source_lang: 원본 언어 코드 (음성 인식 단계에서 감지)
     """
     if target_lang not in SUPPORTED_LANGUAGES:
         target_lang = "english"
 
     lang_config = SUPPORTED_LANGUAGES[target_lang]
     target_language = lang_config['name']
-    stop_words = lang_config['stop_words']
+    stop_words = _stop_words(lang_config, source_lang)
+    source_name = _source_name(source_lang)
 
     # 길이 가이드 단순화
     if max_length_ratio < 0.8:
@@ -388,7 +427,7 @@ def literal_translate(text: str, max_length_ratio: float = 1.0, quality_mode: st
         length_guide = "Make the translation natural and fluent."
 
     # 향상된 프롬프트 사용
-    prompt = _create_enhanced_prompt(text, target_language, length_guide, False)
+    prompt = _create_enhanced_prompt(text, target_language, length_guide, False, source_lang)
 
     llm = _get_llm()
 
@@ -410,7 +449,7 @@ def literal_translate(text: str, max_length_ratio: float = 1.0, quality_mode: st
     cleaned = _cleanup(result)
 
     # 번역 결과 검증
-    if cleaned.strip() and len(cleaned.strip()) > 0 and not _contains_korean(cleaned):
+    if cleaned.strip() and len(cleaned.strip()) > 0 and not _leaks_source(cleaned, source_lang):
         print(f"[성공] 직역 완료: {text} → {cleaned}")
         return cleaned
 
@@ -420,8 +459,8 @@ def literal_translate(text: str, max_length_ratio: float = 1.0, quality_mode: st
 
     # 더 강력한 프롬프트
     strong_prompt = (
-        f"TASK: Korean to {target_language} translation\n"
-        f"RULE: Absolutely NO Korean characters in output\n"
+        f"TASK: {source_name} to {target_language} translation\n"
+        f"RULE: Absolutely NO {source_name} characters in output\n"
         f"INPUT: {text}\n"
         f"OUTPUT ({target_language} only):"
     )
@@ -437,31 +476,35 @@ def literal_translate(text: str, max_length_ratio: float = 1.0, quality_mode: st
     result = resp["choices"][0]["text"].strip().strip('"\'')
     cleaned = _cleanup(result)
 
-    if cleaned.strip() and not _contains_korean(cleaned):
+    if cleaned.strip() and not _leaks_source(cleaned, source_lang):
         print(f"[재시도 성공] 직역 완료: {cleaned}")
         return cleaned
 
-    # 마지막으로 사전 기반 번역 시도
+    # 마지막으로 사전 기반 번역 시도 (사전은 한국어 원본 전용)
+    if source_lang != 'ko':
+        logging.warning(f"⚠️ [번역 실패] {source_name} → {target_language} 번역 실패, 원본 텍스트 유지: {text}")
+        return text
     print(f"[사전 번역] Gemma-3 실패, 사전 기반 번역 사용: {text}")
     return _enhanced_fallback_translate(text, target_lang)
 
 
 def free_translate(text: str, max_length_ratio: float = 1.0, quality_mode: str = "balanced",
-                   target_lang: str = "english") -> str:
+                   target_lang: str = "english", source_lang: str = "ko") -> str:
     """
     의역: Gemma-3 모델의 성능을 신뢰하고 단순화
+    source_lang: 원본 언어 코드 (음성 인식 단계에서 감지)
     """
     if target_lang not in SUPPORTED_LANGUAGES:
         target_lang = "english"
 
     lang_config = SUPPORTED_LANGUAGES[target_lang]
     target_language = lang_config['name']
-    stop_words = lang_config['stop_words']
+    stop_words = _stop_words(lang_config, source_lang)
 
-    # 의성어/감탄사만 있으면 직역 사용
+    # 의성어/감탄사만 있으면 직역 사용 (한국어 원본)
     orig_lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    if orig_lines and all(re.fullmatch(r"[가-힣]+[\.!?…]*", ln) for ln in orig_lines):
-        return literal_translate(text, max_length_ratio, quality_mode, target_lang)
+    if source_lang == 'ko' and orig_lines and all(re.fullmatch(r"[가-힣]+[\.!?…]*", ln) for ln in orig_lines):
+        return literal_translate(text, max_length_ratio, quality_mode, target_lang, source_lang)
 
     # 길이 가이드 단순화
     if max_length_ratio < 0.8:
@@ -470,7 +513,7 @@ def free_translate(text: str, max_length_ratio: float = 1.0, quality_mode: str =
         length_guide = "Make the translation natural and fluent."
 
     # 향상된 프롬프트 사용
-    prompt = _create_enhanced_prompt(text, target_language, length_guide, True)
+    prompt = _create_enhanced_prompt(text, target_language, length_guide, True, source_lang)
 
     llm = _get_llm()
 
@@ -486,7 +529,7 @@ def free_translate(text: str, max_length_ratio: float = 1.0, quality_mode: str =
     cleaned = _cleanup(result)
 
     # 결과 검증: 한글이 포함되어 있으면 무조건 실패
-    if cleaned.strip() and not _contains_korean(cleaned):
+    if cleaned.strip() and not _leaks_source(cleaned, source_lang):
         # 한 줄 대본이면 첫 문장만
         if len(orig_lines) == 1:
             return cleaned.split("\n", 1)[0]
@@ -506,14 +549,14 @@ def free_translate(text: str, max_length_ratio: float = 1.0, quality_mode: str =
     result = resp["choices"][0]["text"].strip().strip('"\'')
     cleaned = _cleanup(result)
 
-    if cleaned.strip() and not _contains_korean(cleaned):
+    if cleaned.strip() and not _leaks_source(cleaned, source_lang):
         if len(orig_lines) == 1:
             return cleaned.split("\n", 1)[0]
         return cleaned
 
     # 의역 실패 시 직역으로 대체 (fallback 대신)
     print(f"[직역 대체] 의역 실패 (한글 포함), 직역 사용: {text}")
-    return literal_translate(text, max_length_ratio, quality_mode, target_lang)
+    return literal_translate(text, max_length_ratio, quality_mode, target_lang, source_lang)
 
 
 # 편의 함수들 추가
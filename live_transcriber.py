@@ -0,0 +1,373 @@
+import os
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+import numpy as np
+from pydub import AudioSegment
+from config import get_ffmpeg_path, load_vad_config
+from utils import log_message
+from audio_processor import milliseconds_to_srt_time
+from vad_processor import VAD_SAMPLE_RATE, VAD_WINDOW_SAMPLES, VAD_FRAME_MS
+from whisper_backend import DEFAULT_STT_BACKEND, select_stt_backend, preload_resident_model, \
+    transcribe_segments
+from whisper_processor import save_transcript, transcribe_segment_files_cli
+
+# 실시간 전사 설정
+READ_BLOCK_SAMPLES = VAD_WINDOW_SAMPLES * 16  # ffmpeg 파이프에서 한 번에 읽을 샘플 수 (약 0.5초)
+FOLLOW_IDLE_TIMEOUT_S = 10.0  # 기록 중인 파일이 이 시간 동안 커지지 않으면 입력 종료로 판단
+
+
+def open_live_source(source: str):
+    """
+    실시간 입력을 16kHz 모노 s16le PCM 스트림으로 여는 ffmpeg 프로세스 생성
+
+    Args:
+        source: 기록 중인 파일 경로, '-'(표준 입력), 명명된 파이프 경로, 또는 'tcp://host:port' (수신 대기)
+    """
+    cmd = [get_ffmpeg_path(), '-v', 'error']
+    stdin = subprocess.DEVNULL
+
+    if source == '-':
+        stdin = None  # 부모의 표준 입력을 그대로 전달
+        cmd += ['-i', 'pipe:0']
+    elif source.startswith('tcp://'):
+        listen_url = source if '?' in source else source + '?listen=1'
+        cmd += ['-i', listen_url]
+    elif os.path.isfile(source):
+        # 기록 중인 파일: EOF에서 멈추지 않고 새 데이터를 계속 읽음
+        # (ffmpeg는 스스로 끝나지 않으므로 LiveTranscriber가 파일 크기가 멈추면 종료시킴)
+        cmd += ['-follow', '1', '-i', source]
+    else:
+        cmd += ['-i', source]
+
+    cmd += ['-f', 's16le', '-ac', '1', '-ar', str(VAD_SAMPLE_RATE), 'pipe:1']
+    log_message(f"📡 실시간 입력 열기: {source}")
+    return subprocess.Popen(cmd, stdin=stdin, stdout=subprocess.PIPE)
+
+
+class OnlineVadSegmenter:
+    """
+    Silero VAD를 32ms 프레임 단위로 누적 실행하며 확정된 음성 구간을 즉시 반환
+    (probabilities_to_segments와 같은 히스테리시스/최소 길이/패딩 규칙을 온라인으로 적용)
+    """
+
+    def __init__(self, vad_config):
+        from silero_vad import load_silero_vad
+
+        self.model = load_silero_vad()
+        self.model.reset_states()
+        self.threshold = vad_config['threshold']
+        self.neg_threshold = max(self.threshold - 0.15, 0.01)
+        self.min_speech_ms = vad_config['min_speech_duration_ms']
+        self.min_silence_ms = vad_config['min_silence_duration_ms']
+        self.max_speech_ms = vad_config['max_speech_duration_s'] * 1000
+        self.pad_ms = vad_config['speech_pad_ms']
+
+        self.frame_index = 0
+        self.in_speech = False
+        self.start = 0
+        self.silence_start = None
+        self.last_end = 0
+        self.pending = np.zeros(0, dtype=np.float32)
+
+    def _finalize(self, start, end, now):
+        """구간 확정 (최소 길이 필터, 이전 구간과 겹치지 않게 패딩)"""
+        if end - start < self.min_speech_ms:
+            return None
+        padded = (max(self.last_end, start - self.pad_ms), min(end + self.pad_ms, now))
+        self.last_end = padded[1]
+        return padded
+
+    def feed(self, samples: np.ndarray):
+        """
+        새 샘플을 넣고 이번에 확정된 구간 반환
+
+        Returns:
+            [(start_ms, end_ms), ...]
+        """
+        import torch
+
+        finalized = []
+        self.pending = np.concatenate([self.pending, samples])
+        n_frames = len(self.pending) // VAD_WINDOW_SAMPLES
+
+        with torch.no_grad():
+            for i in range(n_frames):
+                window = torch.from_numpy(self.pending[i * VAD_WINDOW_SAMPLES:(i + 1) * VAD_WINDOW_SAMPLES])
+                p = self.model(window, VAD_SAMPLE_RATE).item()
+                t = self.frame_index * VAD_FRAME_MS
+                self.frame_index += 1
+
+                if p >= self.threshold:
+                    self.silence_start = None
+                    if not self.in_speech:
+                        self.in_speech = True
+                        self.start = t
+                    elif t - self.start >= self.max_speech_ms:
+                        # 최대 길이 초과 시 강제 분할
+                        segment = self._finalize(self.start, t, t)
+                        if segment:
+                            finalized.append(segment)
+                        self.start = t
+                elif self.in_speech and p < self.neg_threshold:
+                    if self.silence_start is None:
+                        self.silence_start = t
+                    if t - self.silence_start >= self.min_silence_ms:
+                        segment = self._finalize(self.start, self.silence_start, t)
+                        if segment:
+                            finalized.append(segment)
+                        self.in_speech = False
+                        self.silence_start = None
+
+        self.pending = self.pending[n_frames * VAD_WINDOW_SAMPLES:]
+        return finalized
+
+    def earliest_needed_ms(self):
+        """아직 확정되지 않은 구간이 시작될 수 있는 가장 이른 시각 (패딩 포함, 이전 샘플은 버려도 됨)"""
+        start = self.start if self.in_speech else self.frame_index * VAD_FRAME_MS
+        return max(0, start - self.pad_ms)
+
+    def flush(self):
+        """입력 종료 시 진행 중인 구간 확정"""
+        now = self.frame_index * VAD_FRAME_MS
+        if not self.in_speech:
+            return []
+        self.in_speech = False
+        end = self.silence_start if self.silence_start is not None else now
+        segment = self._finalize(self.start, end, now)
+        return [segment] if segment else []
+
+
+class LiveTranscriber:
+    """
+    롤링 오디오 버퍼 기반 실시간 전사
+    음성 구간이 확정될 때마다 세그먼트 WAV 저장 → whisper 전사 → SRT 큐 추가 → on_segment 콜백 호출
+    녹음이 끝나기 전에 번역/TTS 작업자가 앞 세그먼트부터 처리를 시작할 수 있음
+
+    입력 종료: 파이프/표준 입력/소켓은 송신 측이 닫으면(EOF) 종료
+    기록 중인 파일은 EOF가 없으므로 idle_timeout_s 동안 파일이 커지지 않으면 종료 (None이면 stop() 호출까지 계속)
+    """
+
+    def __init__(self, source: str, name: str = None, vad_config=None, backend: str = DEFAULT_STT_BACKEND,
+                 on_segment=None, language: str = 'ko', idle_timeout_s=FOLLOW_IDLE_TIMEOUT_S):
+        self.source = source
+        self.name = name or os.path.splitext(os.path.basename(source.rstrip('/')))[0] or 'live'
+        self.vad_config = vad_config or load_vad_config()
+        self.on_segment = on_segment
+        self.language = language
+        self.idle_timeout_s = idle_timeout_s
+        self.backend = self._select_live_backend(backend)
+
+        self.out = os.path.join(os.getcwd(), 'split_audio', self.name)
+        self.wav_folder = os.path.join(self.out, 'wav')
+        os.makedirs(self.wav_folder, exist_ok=True)
+        self.live_srt_path = os.path.join(self.out, f"{self.name}.live.srt")
+
+        # 롤링 버퍼: (시작 샘플 위치, 블록) 목록, 확정 대기 중인 구간에 필요한 블록만 보관
+        self.blocks = deque()
+        self.total_samples = 0
+        self.total_ms = 0
+
+        self.transcript = []
+        self.segment_queue = queue.Queue()
+        self.stop_event = threading.Event()
+        self.process = None
+
+    def _select_live_backend(self, backend):
+        """
+        실시간 전사는 발화마다 전사하므로 상주 모델(in-process)을 사용
+        입력 전에 모델을 미리 로드해 두고, 쓸 수 없으면 whisper-cli로 대체하되 지연을 경고
+        """
+        if select_stt_backend(backend) == 'inprocess' and preload_resident_model(self.vad_config, self.language):
+            return 'inprocess'
+        log_message("⚠️ 상주 whisper 모델을 사용할 수 없음 - 실시간 전사에 whisper-cli 사용 "
+                    "(전사 호출마다 모델을 다시 로드하므로 지연이 큼, 대기 중인 구간은 한 번에 묶어 전사)")
+        return 'cli'
+
+    def _samples_between(self, start_ms, end_ms):
+        lo = start_ms * VAD_SAMPLE_RATE // 1000
+        hi = max(lo, end_ms * VAD_SAMPLE_RATE // 1000)
+        parts = [block[max(0, lo - pos):hi - pos] for pos, block in self.blocks
+                 if pos < hi and pos + len(block) > lo]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+    def _append_block(self, samples):
+        self.blocks.append((self.total_samples, samples))
+        self.total_samples += len(samples)
+        self.total_ms = self.total_samples * 1000 // VAD_SAMPLE_RATE
+
+    def _trim_buffer(self, keep_from_ms):
+        """keep_from_ms 이전 샘플만 담은 블록 폐기 (블록 단위이므로 복사 없음)"""
+        keep_from = keep_from_ms * VAD_SAMPLE_RATE // 1000
+        while self.blocks and self.blocks[0][0] + len(self.blocks[0][1]) <= keep_from:
+            self.blocks.popleft()
+
+    def _watch_followed_file(self):
+        """기록 중인 파일이 idle_timeout_s 동안 커지지 않으면 ffmpeg 종료 (남은 출력은 EOF까지 읽음)"""
+        last_size, last_change = -1, time.monotonic()
+        while not self.stop_event.wait(1.0):
+            try:
+                size = os.path.getsize(self.source)
+            except OSError:
+                continue
+            if size != last_size:
+                last_size, last_change = size, time.monotonic()
+            elif time.monotonic() - last_change >= self.idle_timeout_s:
+                log_message(f"⏹️ 입력 파일이 {self.idle_timeout_s:.0f}초 동안 변하지 않음 - 기록 종료로 판단")
+                if self.process and self.process.poll() is None:
+                    self.process.terminate()
+                return
+
+    def _save_segment_wav(self, idx, samples):
+        wav_path = os.path.join(self.wav_folder, f"{self.name}_{idx:03d}.wav")
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        AudioSegment(pcm.tobytes(), frame_rate=VAD_SAMPLE_RATE, sample_width=2, channels=1).export(
+            wav_path, format="wav")
+        return wav_path
+
+    def _transcribe_jobs(self, jobs):
+        """
+        구간 WAV 전사 → {wav_path: 텍스트}
+        inprocess는 상주 모델로 하나씩, cli는 대기 중인 구간을 whisper-cli 한 번 실행으로 묶어 전사
+        """
+        texts = {}
+        if self.backend == 'inprocess':
+            for _, _, _, wav_path in jobs:
+                result = transcribe_segments(wav_path, self.vad_config, language=self.language)
+                if result is not None:
+                    texts[wav_path] = ' '.join(seg['text'] for seg in result if seg['text'])
+        missing = [wav_path for _, _, _, wav_path in jobs if wav_path not in texts]
+        if missing:
+            texts.update(transcribe_segment_files_cli(missing, self.language))
+        return texts
+
+    def _next_jobs(self):
+        """
+        다음 전사 작업 묶음과 종료 여부 반환 (첫 작업까지는 대기)
+        cli 백엔드는 프로세스 실행 비용을 나누기 위해 이미 쌓인 작업을 함께 가져옴
+        """
+        job = self.segment_queue.get()
+        if job is None:
+            return [], True
+        jobs = [job]
+        while self.backend == 'cli':
+            try:
+                job = self.segment_queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                return jobs, True
+            jobs.append(job)
+        return jobs, False
+
+    def _transcription_worker(self):
+        """확정된 구간을 순서대로 전사하고 SRT 큐를 즉시 기록"""
+        with open(self.live_srt_path, 'w', encoding='utf-8') as srt_file:
+            done = False
+            while not done:
+                jobs, done = self._next_jobs()
+                if not jobs:
+                    continue
+
+                try:
+                    texts = self._transcribe_jobs(jobs)
+                except Exception as e:
+                    log_message(f"❌ 세그먼트 {jobs[0][0]}~{jobs[-1][0]} 전사 실패: {e}")
+                    texts = {}
+
+                for idx, start_ms, end_ms, wav_path in jobs:
+                    text = texts.get(wav_path, '')
+                    self.transcript.append({'start_ms': start_ms, 'end_ms': end_ms, 'text': text})
+                    srt_file.write(f"{idx}\n{milliseconds_to_srt_time(start_ms)} --> "
+                                   f"{milliseconds_to_srt_time(end_ms)}\n{text}\n\n")
+                    srt_file.flush()
+                    log_message(f"📝 [{milliseconds_to_srt_time(start_ms)}] {text}")
+
+                    if self.on_segment:
+                        try:
+                            self.on_segment(idx, start_ms, end_ms, text, wav_path)
+                        except Exception as e:
+                            log_message(f"⚠️ 세그먼트 콜백 오류: {e}")
+
+    def _queue_segment(self, idx, start_ms, end_ms):
+        wav_path = self._save_segment_wav(idx, self._samples_between(start_ms, end_ms))
+        self.segment_queue.put((idx, start_ms, end_ms, wav_path))
+
+    def stop(self):
+        """입력 중단 요청 (진행 중인 구간까지 전사 후 종료)"""
+        self.stop_event.set()
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+
+    def run(self):
+        """
+        입력이 끝나거나 stop()이 호출될 때까지 실시간 전사
+
+        Returns:
+            run_full_whisper_processing과 동일 (out, segments, total_ms)
+        """
+        segmenter = OnlineVadSegmenter(self.vad_config)
+        worker = threading.Thread(target=self._transcription_worker, daemon=True)
+        worker.start()
+
+        self.process = open_live_source(self.source)
+        if self.idle_timeout_s is not None and os.path.isfile(self.source):
+            threading.Thread(target=self._watch_followed_file, daemon=True).start()
+        block_bytes = READ_BLOCK_SAMPLES * 2
+        next_idx = 1
+        leftover = b''
+        try:
+            while not self.stop_event.is_set():
+                data = self.process.stdout.read(block_bytes)
+                if not data:
+                    break
+                # 파이프에서 홀수 바이트가 읽히면 다음 블록과 이어 붙임
+                data = leftover + data
+                leftover = data[len(data) // 2 * 2:]
+                samples = np.frombuffer(data[:len(data) // 2 * 2], dtype=np.int16).astype(np.float32) / 32768.0
+                self._append_block(samples)
+
+                for start_ms, end_ms in segmenter.feed(samples):
+                    self._queue_segment(next_idx, start_ms, end_ms)
+                    next_idx += 1
+                # 무음 구간에서는 패딩만큼만, 발화 중에는 발화 시작(최대 max_speech) 이후만 보관
+                self._trim_buffer(segmenter.earliest_needed_ms())
+        except KeyboardInterrupt:
+            log_message("⏹️ 실시간 전사 중단 요청 - 남은 구간 정리 중")
+        finally:
+            self.stop()
+            self.process.wait()
+
+        for start_ms, end_ms in segmenter.flush():
+            self._queue_segment(next_idx, start_ms, end_ms)
+            next_idx += 1
+
+        self.segment_queue.put(None)
+        worker.join()
+
+        log_message(f"✅ 실시간 전사 종료: {len(self.transcript)}개 세그먼트 ({self.total_ms / 1000:.0f}초)")
+        if not self.transcript:
+            return None, None, None
+
+        # 전체 결과를 일반 파이프라인과 같은 이름으로 저장 (<name>.wav.srt / .txt / transcript.json)
+        save_transcript(self.transcript, f"{self.name}.wav", self.out, language=self.language)
+        segments = [(seg['start_ms'], seg['end_ms']) for seg in self.transcript]
+        return self.out, segments, self.total_ms
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="실시간 전사 (기록 중인 파일, 파이프, 로컬 소켓)")
+    parser.add_argument('source', help="파일 경로, '-'(표준 입력), 명명된 파이프, 또는 tcp://127.0.0.1:PORT")
+    parser.add_argument('--name', default=None, help="출력 이름 (split_audio/<name>)")
+    parser.add_argument('--backend', default=DEFAULT_STT_BACKEND, help="STT 백엔드")
+    parser.add_argument('--language', default='ko', help="음성 언어 코드 (실시간 입력은 언어 자동 감지 없음)")
+    parser.add_argument('--idle_timeout', type=float, default=FOLLOW_IDLE_TIMEOUT_S,
+                        help="파일 입력: 이 시간(초) 동안 파일이 커지지 않으면 종료 (0이면 Ctrl+C까지 계속)")
+    args = parser.parse_args()
+
+    LiveTranscriber(args.source, name=args.name, backend=args.backend, language=args.language,
+                    idle_timeout_s=args.idle_timeout or None).run()
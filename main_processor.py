@@ -1,20 +1,32 @@
 import os
 import threading
 import time
-from pydub import AudioSegment
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from utils import log_message, is_video_file, is_audio_file
-from video_processor import process_video_file, combine_processed_audio_with_background, combine_audio_with_video
-from whisper_processor import run_full_whisper_processing, run_whisper_directory
+from video_processor import process_video_file, combine_processed_audio_with_background, combine_audio_with_video, \
+    mux_language_tracks
+from whisper_processor import run_full_whisper_processing, run_long_form_whisper_processing, \
+    run_cached_vad_whisper_processing, run_whisper_directory, run_stt_with_cache, \
+    refine_low_confidence_segments, detect_source_language, source_text_dir
 from audio_processor import parse_srt_segments, merge_segments_preserve_timing, apply_speaker_based_splitting, \
-    split_audio_by_srt, extend_short_segments_for_zeroshot, create_extended_segments_mapping
-from batch_cosy import main as cosy_batch
-from config import load_vad_config
+    split_audio_by_srt, extend_short_segments_for_zeroshot, create_extended_segments_mapping, StreamingTimelineMerger
+from batch_cosy import main as cosy_batch, language_config_key
+from mood_analysis import build_mood_feature_table
+from vad_processor import get_audio_duration_ms
+from media_info import get_duration_ms, probe_media
+from config import load_vad_config, load_cache_config
+from environment_probe import probe_environment, require_environment
+from whisper_backend import select_stt_backend
 from batch_translate import SUPPORTED_LANGUAGES
+from encode_profiles import DEFAULT_MUX_PROFILE, DEFAULT_REENCODE_PROFILE, video_args
 
 
-def apply_lip_sync_to_video(video_path, audio_path, output_path, frame_folder=None):
+def apply_lip_sync_to_video(video_path, audio_path, output_path, frame_folder=None,
+                            encode_profile=DEFAULT_REENCODE_PROFILE):
     """
     MuseTalk을 사용하여 립싱크 적용 (main_processor용)
+    encode_profile: 25fps 변환 시 영상 인코딩 프로필 (encode_profiles.ENCODE_PROFILES, 복사 프로필은 x264 기본값으로 대체)
     """
     try:
         import subprocess
@@ -39,45 +51,21 @@ def apply_lip_sync_to_video(video_path, audio_path, output_path, frame_folder=No
         temp_video_25fps = os.path.join(os.path.dirname(video_path), f"{base_name}_temp_25fps.mp4")
 
         log_message("🔄 비디오를 25fps로 변환 중...")
-        # 먼저 오디오 길이 확인
+        # 먼저 오디오 길이 확인 (media_info 캐시 - 아래 검증에서도 재사용)
+        ffmpeg_cmd = ["ffmpeg", "-y", "-i", video_path, "-r", "25"]
         try:
-            audio_info_cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", audio_path]
-            audio_info_result = subprocess.run(audio_info_cmd, capture_output=True, text=True)
-            if audio_info_result.returncode == 0:
-                import json
-                audio_info = json.loads(audio_info_result.stdout)
-                audio_duration = float(audio_info['format']['duration'])
-                log_message(f"   🎵 오디오 길이: {audio_duration:.2f}초")
-
-                # FFmpeg로 25fps 변환 (오디오 길이에 맞춤)
-                ffmpeg_cmd = [
-                    "ffmpeg", "-y", "-i", video_path,
-                    "-r", "25",
-                    "-t", str(audio_duration),  # 오디오 길이에 맞춰 자르기
-                    "-c:v", "libx264",
-                    "-c:a", "copy",
-                    temp_video_25fps
-                ]
-            else:
-                log_message("⚠️ 오디오 길이 확인 실패, 기본 변환 사용")
-                # 기본 변환 (길이 조정 없음)
-                ffmpeg_cmd = [
-                    "ffmpeg", "-y", "-i", video_path,
-                    "-r", "25",
-                    "-c:v", "libx264",
-                    "-c:a", "copy",
-                    temp_video_25fps
-                ]
+            audio_duration = get_duration_ms(audio_path) / 1000
+            log_message(f"   🎵 오디오 길이: {audio_duration:.2f}초")
+            ffmpeg_cmd += ["-t", str(audio_duration)]  # 오디오 길이에 맞춰 자르기
         except Exception as e:
-            log_message(f"⚠️ 오디오 분석 오류: {e}, 기본 변환 사용")
-            # 오류 시 기본 변환
-            ffmpeg_cmd = [
-                "ffmpeg", "-y", "-i", video_path,
-                "-r", "25",
-                "-c:v", "libx264",
-                "-c:a", "copy",
-                temp_video_25fps
-            ]
+            audio_duration = None
+            log_message(f"⚠️ 오디오 길이 확인 실패 ({e}), 기본 변환 사용")
+        # FFmpeg로 25fps 변환
+        ffmpeg_cmd += [
+            *video_args(encode_profile, reencode=True),
+            "-c:a", "copy",
+            temp_video_25fps
+        ]
         result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
 
         if result.returncode != 0:
@@ -113,50 +101,29 @@ def apply_lip_sync_to_video(video_path, audio_path, output_path, frame_folder=No
         # 입력 파일 검증
         log_message("🔍 입력 파일 검증 중...")
 
-        # 비디오 정보 확인
-        try:
-            import subprocess
-            video_info_cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", "-show_streams",
-                              temp_video_25fps]
-            video_info_result = subprocess.run(video_info_cmd, capture_output=True, text=True)
-            if video_info_result.returncode == 0:
-                import json
-                video_info = json.loads(video_info_result.stdout)
-                video_duration = float(video_info['format']['duration'])
-                log_message(f"   📹 비디오 길이: {video_duration:.2f}초")
-                for stream in video_info['streams']:
-                    if stream['codec_type'] == 'video':
-                        log_message(f"   📏 해상도: {stream['width']}x{stream['height']}")
-                        log_message(f"   🎬 프레임레이트: {stream['r_frame_rate']}")
-        except:
-            log_message("   ⚠️ 비디오 정보 확인 실패")
-
-        # 오디오 정보 확인
+        # 비디오/오디오 정보 확인 (파일마다 한 번만 프로브)
         try:
-            audio_info_cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", audio_path]
-            audio_info_result = subprocess.run(audio_info_cmd, capture_output=True, text=True)
-            if audio_info_result.returncode == 0:
-                audio_info = json.loads(audio_info_result.stdout)
-                audio_duration = float(audio_info['format']['duration'])
-                log_message(f"   🎵 오디오 길이: {audio_duration:.2f}초")
+            video_info = probe_media(temp_video_25fps)
+            video_duration = video_info['duration_ms'] / 1000
+            log_message(f"   📹 비디오 길이: {video_duration:.2f}초")
+            if video_info['video']:
+                log_message(f"   📏 해상도: {video_info['video']['width']}x{video_info['video']['height']}")
+                log_message(f"   🎬 프레임레이트: {video_info['video']['r_frame_rate']}")
+            if audio_duration is not None:
                 if abs(video_duration - audio_duration) > 1.0:
                     log_message(f"   ⚠️ 길이 차이: {abs(video_duration - audio_duration):.2f}초 (1초 이상 차이)")
-        except:
-            log_message("   ⚠️ 오디오 정보 확인 실패")
+        except Exception:
+            log_message("   ⚠️ 비디오 정보 확인 실패")
 
         log_message("🎬 MuseTalk 실행 중... (시간이 오래 걸릴 수 있습니다)")
         log_message("   - 얼굴 감지 및 랜드마크 추출")
         log_message("   - 오디오 특성 분석")
         log_message("   - 립싱크 프레임 생성")
 
-        # FFmpeg 경로 확인 및 환경 설정
-        try:
-            ffmpeg_check = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True)
-            if ffmpeg_check.returncode == 0:
-                log_message("✅ FFmpeg 사용 가능")
-            else:
-                log_message("⚠️ FFmpeg 경로 문제 가능성")
-        except:
+        # FFmpeg 경로 확인 (프로세스당 한 번 점검한 환경 보고서 재사용)
+        if probe_environment()['items']['ffmpeg']['ok']:
+            log_message("✅ FFmpeg 사용 가능")
+        else:
             log_message("⚠️ FFmpeg 실행 불가")
 
         # MuseTalk 실행 (더 많은 파라미터 포함)
@@ -299,6 +266,255 @@ def apply_lip_sync_to_video(video_path, audio_path, output_path, frame_folder=No
         return False
 
 
+# MuseTalk은 GPU 메모리를 크게 쓰므로 언어별 후처리를 병렬로 돌려도 립싱크는 한 번에 하나씩
+_lip_sync_lock = threading.Lock()
+
+
+def _lip_sync_language(lang_code, processed_vocal_path, regular_video_path, output_base_dir, base_name,
+                       encode_profile=DEFAULT_REENCODE_PROFILE):
+    """한 언어의 기본 최종 영상에 립싱크 적용 (립싱크 잠금 안에서 실행). 성공 시 출력 경로, 실패 시 None"""
+    lang_name = SUPPORTED_LANGUAGES[lang_code]['name'].lower()
+    lang_display_name = SUPPORTED_LANGUAGES[lang_code]['name']
+    lip_sync_output_path = os.path.join(output_base_dir, f"{base_name}_{lang_name}_final_lipsynced.mp4")
+
+    # 기본 영상이 존재하는지 확인
+    if not os.path.exists(regular_video_path):
+        log_message(f"❌ {lang_display_name} 기본 영상 파일을 찾을 수 없습니다:")
+        log_message(f"   경로: {regular_video_path}")
+        return None
+
+    with _lip_sync_lock:
+        log_message(f"🎬 {lang_display_name} 립싱크 처리 시작...")
+        log_message(f"   📹 기본 영상: {os.path.basename(regular_video_path)}")
+        log_message(f"   🎵 음성 파일: {os.path.basename(processed_vocal_path)}")
+        start_time = time.time()
+        success = apply_lip_sync_to_video(regular_video_path, processed_vocal_path, lip_sync_output_path,
+                                          encode_profile=encode_profile)
+        processing_time = int(time.time() - start_time)
+
+    if success:
+        log_message(f"✅ {lang_display_name} 립싱크 완료! (소요시간: {processing_time}초)")
+        log_message(f"   💾 출력: {os.path.basename(lip_sync_output_path)}")
+        return lip_sync_output_path
+    log_message(f"❌ {lang_display_name} 립싱크 처리 실패 (소요시간: {processing_time}초)")
+    return None
+
+
+class PostProcessProgress:
+    """언어별 후처리 진행 상황 집계 (여러 스레드에서 갱신, 단계가 끝날 때마다 전체 진행률 로그)"""
+
+    def __init__(self, languages, steps):
+        self.lock = threading.Lock()
+        self.steps = steps
+        self.total = len(languages) * len(steps)
+        self.done = {lang: 0 for lang in languages}
+        self.state = {lang: '대기' for lang in languages}
+        self.start_time = time.time()
+
+    def step(self, lang_code, step_name, result):
+        """단계 완료 기록 후 결과를 그대로 반환 (실패는 None/False)"""
+        with self.lock:
+            self.done[lang_code] += 1
+            self.state[lang_code] = f"{step_name} {'✅' if result else '❌'}"
+            self._log()
+        return result
+
+    def finish(self, lang_code):
+        """앞 단계 실패로 건너뛴 단계까지 완료 처리"""
+        with self.lock:
+            if self.done[lang_code] < len(self.steps):
+                self.done[lang_code] = len(self.steps)
+                self.state[lang_code] += ' (이후 단계 건너뜀)'
+                self._log()
+
+    def _log(self):
+        done = sum(self.done.values())
+        percent = done / self.total * 100 if self.total else 100.0
+        states = ', '.join(f"{SUPPORTED_LANGUAGES[lang]['name']}: {state}" for lang, state in self.state.items())
+        log_message(f"📊 후처리 진행률: {percent:.1f}% ({done}/{self.total}, {int(time.time() - self.start_time)}초) "
+                    f"| {states}")
+
+
+def run_language_postprocessing(items, chain, steps, workers=4):
+    """
+    언어별 후처리 체인을 스레드 풀에서 동시에 실행 (언어 사이에는 의존성이 없음)
+
+    Args:
+        items: {언어: 입력} - chain(언어, 입력, progress)로 호출
+        steps: 체인의 단계 이름 목록 (진행률 계산용)
+        workers: 동시에 처리할 언어 수 상한
+    """
+    if not items:
+        return
+    progress = PostProcessProgress(list(items), steps)
+    workers = max(1, min(workers, len(items)))
+    log_message(f"⚙️ 언어별 후처리 시작: {len(items)}개 언어, 동시 {workers}개 ({' → '.join(steps)})")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(chain, lang, value, progress): lang for lang, value in items.items()}
+        for future in as_completed(futures):
+            lang = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                log_message(f"❌ {SUPPORTED_LANGUAGES[lang]['name']} 후처리 오류: {e}")
+                progress.finish(lang)
+
+
+def resolve_source_language(audio_path, settings):
+    """
+    원본 음성 언어 결정
+    settings['source_language']: ISO 코드('ko', 'en', ...) 또는 'auto' (짧은 샘플로 파일당 한 번 감지, 결과 캐시)
+    """
+    source_language = settings.get('source_language', 'auto')
+    if source_language == 'auto':
+        return detect_source_language(audio_path, backend=settings.get('stt_backend', 'auto'))
+    return source_language
+
+
+def resolve_target_languages(source_language, settings):
+    """
+    원본 언어별 번역 대상 언어 결정
+    settings['language_matrix']: {원본 코드: [대상 언어, ...]} (없는 원본은 selected_languages 사용)
+    원본과 같은 언어는 대상에서 제외
+    """
+    matrix = settings.get('language_matrix') or {}
+    targets = matrix.get(source_language, settings.get('selected_languages', ['english']))
+    targets = [lang for lang in targets
+               if lang in SUPPORTED_LANGUAGES and SUPPORTED_LANGUAGES[lang]['code'] != source_language]
+    if not targets:
+        targets = ['english'] if source_language != 'en' else ['korean']
+        log_message(f"⚠️ 원본({source_language})과 다른 대상 언어가 없어 {targets[0]}로 진행")
+    return targets
+
+
+def _with_refinement(audio_path, run, refine_args):
+    """전사 후 저신뢰 세그먼트 재전사를 이어서 수행하는 전사 함수 반환"""
+
+    def run_and_refine():
+        output_dir, segments, orig_duration = run()
+        if output_dir and segments:
+            refine_low_confidence_segments(audio_path, output_dir, *refine_args)
+        return output_dir, segments, orig_duration
+
+    return run_and_refine
+
+
+def _use_long_form_stt(audio_path, settings):
+    """settings['long_form_stt'] 확정 ('auto'이면 long_form_min_minutes 이상일 때 청크 병렬 전사)"""
+    long_form = settings.get('long_form_stt', 'auto')
+    if long_form == 'auto':
+        min_ms = settings.get('long_form_min_minutes', 20) * 60 * 1000
+        return get_audio_duration_ms(audio_path) >= min_ms
+    return bool(long_form)
+
+
+def _stt_needs_cli(audio_path, settings):
+    """_run_stt가 whisper-cli를 실행하는지 (캐시 VAD/장시간 청크/저신뢰 재전사는 CLI 전용, 단일 전사는 백엔드 선택에 따름)"""
+    if settings.get('cached_vad', False) or settings.get('refine_low_confidence', False):
+        return True
+    if _use_long_form_stt(audio_path, settings):
+        return True
+    return select_stt_backend(settings.get('stt_backend', 'auto')) != 'inprocess'
+
+
+def required_stages(input_file, settings):
+    """
+    설정에서 실제로 실행될 단계의 환경 요구사항 결정
+
+    Returns:
+        (required, deferred)
+        required: 시작 시점에 require_environment로 확인할 단계
+        deferred: 입력에 따라 생략될 수 있는 단계 - 실제 실행 직전에 확인
+                  (분리: 음악 없는 입력이나 캐시 적중이면 UVR5를 쓰지 않음)
+    """
+    required = ['stt' if _stt_needs_cli(input_file, settings) else 'stt_inprocess', 'tts']
+    deferred = []
+    if is_video_file(input_file):
+        use_cache = settings.get('separation_cache')
+        if use_cache is None:
+            use_cache = load_cache_config()['enable_separation_cache']
+        if settings.get('detect_music', True) or use_cache:
+            deferred.append('separation')
+        else:
+            required.append('separation')
+    return required, deferred
+
+
+def _run_stt(audio_path, vad_config, settings, language='ko'):
+    """
+    STT 방식 선택: 장시간 입력은 VAD 청크 병렬 전사, 그 외에는 단일 전사
+    settings['long_form_stt']: True / False / 'auto' (long_form_min_minutes 이상이면 병렬)
+    settings['cached_vad']: True이면 VAD 확률 캐시 + 변경 구간만 재전사 (VAD 설정 조정 후 재실행용)
+    settings['stt_cache']: 전사 결과 캐시 사용 여부 (기본값은 cache_config.json의 enable_stt_cache)
+    settings['refine_low_confidence']: True이면 전사 후 저신뢰 세그먼트만 큰 빔/온도 샘플링으로 재전사
+    """
+    if settings.get('cached_vad', False):
+        mode = 'cached_vad'
+        run = partial(run_cached_vad_whisper_processing, audio_path, vad_config, language=language)
+    else:
+        if _use_long_form_stt(audio_path, settings):
+            mode = 'long_form'
+            run = partial(
+                run_long_form_whisper_processing, audio_path, vad_config,
+                threads_per_process=settings.get('stt_threads_per_process', 4),
+                workers=settings.get('stt_workers'),
+                language=language
+            )
+        else:
+            mode = 'full'
+            run = partial(run_full_whisper_processing, audio_path, vad_config,
+                          backend=settings.get('stt_backend', 'auto'), language=language)
+
+    if settings.get('refine_low_confidence', False):
+        refine_args = (
+            settings.get('refine_logprob_threshold', -1.0),
+            settings.get('refine_no_speech_threshold', 0.6),
+            settings.get('refine_beam_size', 8),
+            settings.get('refine_temperature', 0.4),
+            language,
+        )
+        mode = f"{mode}+refine{refine_args}"
+        run = _with_refinement(audio_path, run, refine_args)
+
+    if settings.get('stt_cache', load_cache_config()['enable_stt_cache']):
+        return run_stt_with_cache(audio_path, vad_config, mode, run, language=language)
+    return run()
+
+
+def build_mood_table_if_needed(audio_path, segments, output_dir, settings):
+    """
+    Instruct2 자동 분위기 모드일 때 전체 세그먼트의 분위기 특징을 한 번에 계산
+    (언어별 합성 루프에서는 테이블 조회만 수행)
+    """
+    if not settings.get('enable_instruct', False) or settings.get('manual_command'):
+        return None
+
+    log_message("🎭 Instruct2 분위기 특징 일괄 분석 중...")
+    table_path = build_mood_feature_table(audio_path, segments, os.path.join(output_dir, 'mood_features.npy'))
+    if table_path:
+        log_message(f"✅ 분위기 특징 테이블 준비 완료: {table_path}")
+    else:
+        log_message("⚠️ 분위기 특징 테이블 생성 실패 - 세그먼트별 분석으로 진행")
+    return table_path
+
+
+def create_streaming_timeline(segments, original_duration_ms, merged_path, settings):
+    """
+    스트리밍 병합이 켜져 있으면 합성 청크를 바로 받을 타임라인 생성
+    (보존 모드에서만 사용, 맞춤 모드는 기존 파일 기반 병합)
+    """
+    if not settings.get('enable_streaming_merge', False):
+        return None
+    if settings.get('length_handling', 'preserve') != 'preserve':
+        log_message("⚠️ 스트리밍 병합은 보존 모드에서만 지원 - 파일 기반 병합 사용")
+        return None
+
+    log_message(f"🌊 스트리밍 타임라인 병합 사용 (중간 결과: {os.path.splitext(merged_path)[0]}.partial.wav)")
+    return StreamingTimelineMerger(segments, original_duration_ms, merged_path,
+                                   preview_every=settings.get('streaming_preview_every', 10))
+
+
 def process_complete_pipeline(input_file, settings):
     """
     완전한 영상 처리 파이프라인
@@ -325,7 +541,15 @@ def process_complete_pipeline(input_file, settings):
         # Step 1: 영상 처리 (음성 추출 + 보컬/배경음 분리)
         log_message("📹 Step 1: 영상에서 음성 추출 및 보컬/배경음 분리")
         extracted_audio, vocals_path, background_path, original_video = process_video_file(
-            input_file, output_base_dir
+            input_file, output_base_dir, keep_separation_model=settings.get('keep_separation_model', False),
+            separation_options={
+                'chunked': settings.get('chunked_separation', 'auto'),
+                'chunk_s': settings.get('separation_chunk_s', 60.0),
+                'workers': settings.get('separation_workers', 1),
+            },
+            use_cache=settings.get('separation_cache'),
+            detect_music_first=settings.get('detect_music', True),
+            ingest=settings.get('audio_ingest', 'pipe')
         )
 
         if not vocals_path or not background_path:
@@ -335,7 +559,8 @@ def process_complete_pipeline(input_file, settings):
         # Step 2: 보컬 파일로 STT 처리
         log_message("🎤 Step 2: 보컬 음성으로 STT 처리")
         vad_config = load_vad_config()
-        output_dir, segments, orig_duration = run_full_whisper_processing(vocals_path, vad_config)
+        source_language = resolve_source_language(vocals_path, settings)
+        output_dir, segments, orig_duration = _run_stt(vocals_path, vad_config, settings, source_language)
 
         if not output_dir or not segments:
             log_message("❌ STT 처리 실패, 파이프라인 중단")
@@ -364,16 +589,20 @@ def process_complete_pipeline(input_file, settings):
         translation_settings = {
             'translation_length': settings.get('translation_length', 0.8),
             'quality_mode': settings.get('quality_mode', 'balanced'),
-            'selected_languages': settings.get('selected_languages', ['english'])
+            'selected_languages': resolve_target_languages(source_language, settings),
+            'source_language': source_language
         }
 
         # Whisper 디렉토리 처리 (번역 포함)
-        selected_languages = run_whisper_directory(output_dir, translation_settings)
+        selected_languages = run_whisper_directory(output_dir, translation_settings, segments)
 
         if not selected_languages:
             log_message("❌ 번역 처리 실패, 파이프라인 중단")
             return
 
+        # Instruct2 분위기 특징 (모든 언어가 공유)
+        mood_table_path = build_mood_table_if_needed(vocals_path, segments, output_dir, settings)
+
         # 각 언어별로 음성 합성
         processed_vocals = {}
 
@@ -428,34 +657,45 @@ def process_complete_pipeline(input_file, settings):
                 if manual_command:
                     log_message(f"  수동 명령어: {manual_command}")
 
+                merged_path = os.path.join(output_base_dir, f"{base_name}_{lang_name}_merged.wav")
+                timeline = create_streaming_timeline(segments, orig_duration, merged_path, settings)
+
                 # CosyVoice2 배치 합성 (언어 정보 포함)
                 cosy_batch(
                     audio_dir=synthesis_audio_dir,
-                    prompt_text_dir=os.path.join(output_dir, 'txt', 'ko'),
+                    prompt_text_dir=source_text_dir(output_dir, source_language),
                     text_dir=text_dir,
                     out_dir=cosy_out,
                     enable_instruct=enable_instruct,
                     manual_command=manual_command,
-                    target_language=lang
+                    target_language=lang,
+                    mood_table_path=mood_table_path,
+                    timeline=timeline,
+                    save_segments=settings.get('save_segment_wavs', timeline is None),
+                    backend=settings.get('tts_backend', 'eager'),
+                    source_language=language_config_key(source_language),
+                    source_code=source_language
                 )
 
                 log_message(f"✅ {SUPPORTED_LANGUAGES[lang]['name']} ({trans_type}) 합성 완료")
 
-                # 실제 합성 파일들은 zero_shot 서브디렉토리에 저장됨
-                actual_synthesis_dir = os.path.join(cosy_out, 'zero_shot')
-
                 # 병합
-                merged_path = os.path.join(output_base_dir, f"{base_name}_{lang_name}_merged.wav")
-                merge_segments_preserve_timing(
-                    segments,
-                    orig_duration,  # 이미 밀리초 단위이므로 * 1000 제거
-                    actual_synthesis_dir,  # zero_shot 서브디렉토리 참조
-                    merged_path,
-                    length_handling=settings.get('length_handling', 'preserve'),
-                    overlap_handling=settings.get('overlap_handling', 'fade'),
-                    max_extension=settings.get('max_extension', 50),
-                    enable_smart_compression=settings.get('enable_smart_compression', True)
-                )
+                if timeline is not None:
+                    timeline.finalize()
+                else:
+                    # 실제 합성 파일들은 zero_shot 서브디렉토리에 저장됨
+                    actual_synthesis_dir = os.path.join(cosy_out, 'zero_shot')
+
+                    merge_segments_preserve_timing(
+                        segments,
+                        orig_duration,  # 이미 밀리초 단위이므로 * 1000 제거
+                        actual_synthesis_dir,  # zero_shot 서브디렉토리 참조
+                        merged_path,
+                        length_handling=settings.get('length_handling', 'preserve'),
+                        overlap_handling=settings.get('overlap_handling', 'fade'),
+                        max_extension=settings.get('max_extension', 50),
+                        enable_smart_compression=settings.get('enable_smart_compression', True)
+                    )
 
                 processed_vocals[lang] = merged_path
                 log_message(f"✅ {lang_name} 보컬 병합 완료: {merged_path}")
@@ -467,18 +707,23 @@ def process_complete_pipeline(input_file, settings):
             # 합성 완료 후 메모리 정리
             gc.collect()
 
-        # Step 4: 각 언어별로 보컬+배경음 합성 및 최종 영상 생성
+        # Step 4: 각 언어별 후처리 (보컬+배경음 합성 → 영상 합성 → 립싱크)를 언어 단위로 병렬 처리
         log_message("🎵 Step 4: 보컬과 배경음 합성 및 최종 영상 생성")
 
-        final_videos = []
+        # multi_audio_output: 'mkv' / 'mp4'이면 모든 언어를 태그된 오디오 트랙으로 한 파일에 묶음 (ffmpeg 1회)
+        multi_audio_container = settings.get('multi_audio_output')
+        enable_lip_sync = settings.get('enable_lip_sync', False)
+        workers = settings.get('postprocess_workers', settings.get('remix_workers', 4))
+        encode_profile = settings.get('encode_profile', DEFAULT_MUX_PROFILE)
 
-        for lang_code, processed_vocal_path in processed_vocals.items():
-            lang_name = SUPPORTED_LANGUAGES[lang_code]['name'].lower()
-            lang_display_name = SUPPORTED_LANGUAGES[lang_code]['name']
+        def lang_name_of(lang_code):
+            return SUPPORTED_LANGUAGES[lang_code]['name'].lower()
 
-            # 보컬 + 배경음 합성
-            combined_audio_path = os.path.join(output_base_dir, f"{base_name}_{lang_name}_combined.wav")
+        def final_video_path_of(lang_code):
+            return os.path.join(output_base_dir, f"{base_name}_{lang_name_of(lang_code)}_final.mp4")
 
+        def remix(lang_code, processed_vocal_path):
+            combined_audio_path = os.path.join(output_base_dir, f"{base_name}_{lang_name_of(lang_code)}_combined.wav")
             success = combine_processed_audio_with_background(
                 processed_vocal_path,
                 background_path,
@@ -486,73 +731,86 @@ def process_complete_pipeline(input_file, settings):
                 vocals_volume=settings.get('vocals_volume', 1.0),
                 background_volume=settings.get('background_volume', 0.8)
             )
-
-            if success:
-                # 최종 영상 생성
-                final_video_path = os.path.join(output_base_dir, f"{base_name}_{lang_name}_final.mp4")
-
-                video_success = combine_audio_with_video(
-                    original_video,
-                    combined_audio_path,
-                    final_video_path
-                )
-
-                if video_success:
-                    final_videos.append((lang_name, final_video_path))
-                    log_message(f"✅ {lang_name} 최종 영상 완료: {final_video_path}")
-                else:
-                    log_message(f"❌ {lang_name} 영상 합성 실패")
+            if not success:
+                log_message(f"❌ {lang_name_of(lang_code)} 음성 합성 실패")
+                return None
+            return combined_audio_path
+
+        def mux(lang_code, combined_audio_path):
+            final_video_path = final_video_path_of(lang_code)
+            if not combine_audio_with_video(original_video, combined_audio_path, final_video_path,
+                                            encode_profile=encode_profile):
+                log_message(f"❌ {lang_name_of(lang_code)} 영상 합성 실패")
+                return None
+            log_message(f"✅ {lang_name_of(lang_code)} 최종 영상 완료: {final_video_path}")
+            return final_video_path
+
+        def lip_sync(lang_code, processed_vocal_path):
+            return _lip_sync_language(lang_code, processed_vocal_path, final_video_path_of(lang_code),
+                                      output_base_dir, base_name,
+                                      encode_profile=settings.get('lipsync_encode_profile', DEFAULT_REENCODE_PROFILE))
+
+        results = {lang: {'combined': None, 'video': None, 'lip_sync': None} for lang in processed_vocals}
+
+        if not multi_audio_container:
+            steps = ['합성', '영상'] + (['립싱크'] if enable_lip_sync else [])
+
+            def chain(lang_code, processed_vocal_path, progress):
+                result = results[lang_code]
+                result['combined'] = progress.step(lang_code, '합성', remix(lang_code, processed_vocal_path))
+                if result['combined']:
+                    result['video'] = progress.step(lang_code, '영상', mux(lang_code, result['combined']))
+                if enable_lip_sync and result['video']:
+                    result['lip_sync'] = progress.step(lang_code, '립싱크', lip_sync(lang_code, processed_vocal_path))
+                progress.finish(lang_code)
+
+            run_language_postprocessing(processed_vocals, chain, steps, workers)
+        else:
+            def remix_only(lang_code, processed_vocal_path, progress):
+                results[lang_code]['combined'] = progress.step(lang_code, '합성',
+                                                               remix(lang_code, processed_vocal_path))
+                progress.finish(lang_code)
+
+            run_language_postprocessing(processed_vocals, remix_only, ['합성'], workers)
+
+            lang_codes = [lang for lang in processed_vocals if results[lang]['combined']]
+            tracks = [(SUPPORTED_LANGUAGES[lang]['code'], results[lang]['combined'], SUPPORTED_LANGUAGES[lang]['name'])
+                      for lang in lang_codes]
+            # 립싱크는 언어별 기본 영상이 필요하므로 그때는 언어별 파일도 함께 출력
+            per_language = settings.get('per_language_videos', True) or enable_lip_sync
+            per_language_paths = {SUPPORTED_LANGUAGES[lang]['code']: final_video_path_of(lang)
+                                  for lang in lang_codes} if per_language else None
+            multi_audio_path = os.path.join(output_base_dir, f"{base_name}_multi_audio.{multi_audio_container}")
+
+            if tracks and mux_language_tracks(original_video, tracks, multi_audio_path, per_language_paths,
+                                              encode_profile=encode_profile):
+                log_message(f"✅ 다국어 영상 완료: {multi_audio_path}")
+                if per_language_paths:
+                    for lang in lang_codes:
+                        results[lang]['video'] = final_video_path_of(lang)
             else:
-                log_message(f"❌ {lang_name} 음성 합성 실패")
-
-        # Step 5: 립싱크 처리 (모든 언어에 대해)
-        if settings.get('enable_lip_sync', False):
-            log_message("🗣️ 립싱크 처리 활성화됨. 모든 언어 버전에 립싱크 적용 중...")
-            log_message(f"   🎯 처리 대상 언어: {len(processed_vocals)}개")
-            lip_sync_videos = []
-
-            for idx, (lang_code, processed_vocal_path) in enumerate(processed_vocals.items(), 1):
-                lang_name = SUPPORTED_LANGUAGES[lang_code]['name'].lower()
-                lang_display_name = SUPPORTED_LANGUAGES[lang_code]['name']
-
-                # 해당 언어의 기본 최종 영상 경로
-                regular_video_path = os.path.join(output_base_dir, f"{base_name}_{lang_name}_final.mp4")
-
-                # 립싱크용 출력 경로 생성
-                lip_sync_output_path = os.path.join(output_base_dir, f"{base_name}_{lang_name}_final_lipsynced.mp4")
-
-                log_message(f"🎬 [{idx}/{len(processed_vocals)}] {lang_display_name} 립싱크 처리 시작...")
-                log_message(f"   📹 기본 영상: {os.path.basename(regular_video_path)}")
-                log_message(f"   🎵 음성 파일: {os.path.basename(processed_vocal_path)}")
-
-                # 기본 영상이 존재하는지 확인
-                if not os.path.exists(regular_video_path):
-                    log_message(f"❌ {lang_display_name} 기본 영상 파일을 찾을 수 없습니다:")
-                    log_message(f"   경로: {regular_video_path}")
-                    continue
-
-                # 립싱크 처리 (기본 영상 + 해당 언어 음성)
-                log_message(f"⚙️ {lang_display_name} MuseTalk 처리 중...")
-                start_time = time.time()
-
-                if apply_lip_sync_to_video(regular_video_path, processed_vocal_path, lip_sync_output_path):
-                    end_time = time.time()
-                    processing_time = int(end_time - start_time)
-
-                    lip_sync_videos.append((lang_name, lip_sync_output_path))
-                    log_message(f"✅ {lang_display_name} 립싱크 완료! (소요시간: {processing_time}초)")
-                    log_message(f"   💾 출력: {os.path.basename(lip_sync_output_path)}")
-                else:
-                    end_time = time.time()
-                    processing_time = int(end_time - start_time)
-                    log_message(f"❌ {lang_display_name} 립싱크 처리 실패 (소요시간: {processing_time}초)")
-
-                # 진행률 표시
-                if len(processed_vocals) > 1:
-                    progress_percent = (idx / len(processed_vocals)) * 100
-                    log_message(f"📊 립싱크 진행률: {progress_percent:.1f}% ({idx}/{len(processed_vocals)})")
-
-            # 립싱크 결과 요약
+                log_message("❌ 다국어 영상 합성 실패")
+                multi_audio_path = None
+
+            # Step 5: 립싱크 (다국어 파일 생성 후 언어별 기본 영상에 적용)
+            lip_sync_langs = {lang: processed_vocals[lang] for lang in processed_vocals if results[lang]['video']}
+            if enable_lip_sync and lip_sync_langs:
+                def lip_sync_only(lang_code, processed_vocal_path, progress):
+                    results[lang_code]['lip_sync'] = progress.step(lang_code, '립싱크',
+                                                                   lip_sync(lang_code, processed_vocal_path))
+                    progress.finish(lang_code)
+
+                run_language_postprocessing(lip_sync_langs, lip_sync_only, ['립싱크'], workers)
+
+        final_videos = [(lang_name_of(lang), results[lang]['video']) for lang in processed_vocals
+                        if results[lang]['video']]
+        if multi_audio_container and multi_audio_path:
+            final_videos.append(('multi_audio', multi_audio_path))
+        lip_sync_videos = [(lang_name_of(lang), results[lang]['lip_sync']) for lang in processed_vocals
+                           if results[lang]['lip_sync']]
+
+        # 립싱크 결과 요약
+        if enable_lip_sync:
             if lip_sync_videos:
                 log_message("🎉 모든 언어 립싱크 영상 생성 완료:")
                 log_message(f"   ✅ 성공: {len(lip_sync_videos)}개")
@@ -571,7 +829,7 @@ def process_complete_pipeline(input_file, settings):
                 log_message(f"   🎬 {lang_name} (기본): {video_path}")
 
             # 립싱크 영상이 있다면 함께 표시
-            if settings.get('enable_lip_sync', False) and 'lip_sync_videos' in locals():
+            if lip_sync_videos:
                 log_message("📁 생성된 립싱크 영상들:")
                 for lang_name, video_path in lip_sync_videos:
                     log_message(f"   🗣️ {lang_name} (립싱크): {os.path.basename(video_path)}")
@@ -590,7 +848,8 @@ def process_audio_only_pipeline(input_file, settings):
         log_message("🎵 음성 파일 처리 파이프라인 시작")
 
         vad_config = load_vad_config()
-        output_dir, segments, orig_duration = run_full_whisper_processing(input_file, vad_config)
+        source_language = resolve_source_language(input_file, settings)
+        output_dir, segments, orig_duration = _run_stt(input_file, vad_config, settings, source_language)
 
         if not output_dir or not segments:
             log_message("❌ STT 처리 실패")
@@ -611,8 +870,7 @@ def process_audio_only_pipeline(input_file, settings):
             base_name = os.path.splitext(os.path.basename(input_file))[0]
             srt_path = os.path.join(output_dir, f"{base_name}{os.path.splitext(input_file)[1]}.srt")
             segments = parse_srt_segments(srt_path)
-            orig_audio = AudioSegment.from_file(input_file)
-            original_duration_ms = len(orig_audio)
+            original_duration_ms = get_audio_duration_ms(input_file)
 
         if not output_dir or not segments:
             log_message("❌ 화자 분할 처리 실패")
@@ -622,11 +880,12 @@ def process_audio_only_pipeline(input_file, settings):
         translation_settings = {
             'translation_length': settings.get('translation_length', 0.8),
             'quality_mode': settings.get('quality_mode', 'balanced'),
-            'selected_languages': settings.get('selected_languages', ['english'])
+            'selected_languages': resolve_target_languages(source_language, settings),
+            'source_language': source_language
         }
 
         # Whisper 디렉토리 처리 (번역 포함)
-        selected_languages = run_whisper_directory(output_dir, translation_settings)
+        selected_languages = run_whisper_directory(output_dir, translation_settings, segments)
 
         if not selected_languages:
             log_message("❌ 번역 처리 실패")
@@ -637,8 +896,10 @@ def process_audio_only_pipeline(input_file, settings):
         input_ext = os.path.splitext(input_file)[1]
         srt_path = os.path.join(output_dir, f"{base_name}{input_ext}.srt")
         segments = parse_srt_segments(srt_path)
-        orig_audio = AudioSegment.from_file(input_file)
-        original_duration_ms = len(orig_audio)
+        original_duration_ms = get_audio_duration_ms(input_file)
+
+        # Instruct2 분위기 특징 (모든 언어가 공유)
+        mood_table_path = build_mood_table_if_needed(input_file, segments, output_dir, settings)
 
         for lang in selected_languages:
             lang_name = SUPPORTED_LANGUAGES[lang]['name'].lower()
@@ -674,33 +935,44 @@ def process_audio_only_pipeline(input_file, settings):
 
             # CosyVoice2 합성
             try:
+                merged_path = os.path.join(output_dir, f"{base_name}_{lang_name}_merged.wav")
+                timeline = create_streaming_timeline(segments, original_duration_ms, merged_path, settings)
+
                 cosy_batch(
                     audio_dir=synthesis_audio_dir,
-                    prompt_text_dir=os.path.join(output_dir, 'txt', 'ko'),
+                    prompt_text_dir=source_text_dir(output_dir, source_language),
                     text_dir=text_dir,
                     out_dir=cosy_out,
                     enable_instruct=settings.get('enable_instruct', False),
                     manual_command=settings.get('manual_command', None),
-                    target_language=lang
+                    target_language=lang,
+                    mood_table_path=mood_table_path,
+                    timeline=timeline,
+                    save_segments=settings.get('save_segment_wavs', timeline is None),
+                    backend=settings.get('tts_backend', 'eager'),
+                    source_language=language_config_key(source_language),
+                    source_code=source_language
                 )
 
                 log_message(f"✅ {lang_name} ({trans_type}) 합성 완료")
 
-                # 실제 합성 파일들은 zero_shot 서브디렉토리에 저장됨
-                actual_synthesis_dir = os.path.join(cosy_out, 'zero_shot')
-
                 # 병합
-                merged_path = os.path.join(output_dir, f"{base_name}_{lang_name}_merged.wav")
-                merge_segments_preserve_timing(
-                    segments,
-                    original_duration_ms,
-                    actual_synthesis_dir,  # zero_shot 서브디렉토리 참조
-                    merged_path,
-                    length_handling=settings.get('length_handling', 'preserve'),
-                    overlap_handling=settings.get('overlap_handling', 'fade'),
-                    max_extension=settings.get('max_extension', 50),
-                    enable_smart_compression=settings.get('enable_smart_compression', True)
-                )
+                if timeline is not None:
+                    timeline.finalize()
+                else:
+                    # 실제 합성 파일들은 zero_shot 서브디렉토리에 저장됨
+                    actual_synthesis_dir = os.path.join(cosy_out, 'zero_shot')
+
+                    merge_segments_preserve_timing(
+                        segments,
+                        original_duration_ms,
+                        actual_synthesis_dir,  # zero_shot 서브디렉토리 참조
+                        merged_path,
+                        length_handling=settings.get('length_handling', 'preserve'),
+                        overlap_handling=settings.get('overlap_handling', 'fade'),
+                        max_extension=settings.get('max_extension', 50),
+                        enable_smart_compression=settings.get('enable_smart_compression', True)
+                    )
 
                 log_message(f"✅ {lang_name} 처리 완료: {merged_path}")
 
@@ -718,6 +990,15 @@ def start_processing_with_settings(input_file, settings):
 
     def worker():
         try:
+            # 모델/실행 파일 누락은 단계 도중이 아니라 시작 시점에 보고
+            required, deferred = required_stages(input_file, settings)
+            require_environment(required)
+            for stage in deferred:
+                if not probe_environment()['stages'][stage]:
+                    log_message(f"⚠️ 단계 '{stage}' 실행 환경 미비 - 생략되지 않으면 해당 단계에서 중단됩니다")
+            if settings.get('enable_lip_sync', False) and not probe_environment()['stages']['lipsync']:
+                log_message("⚠️ MuseTalk 모델을 찾을 수 없습니다 - 립싱크 단계에서 건너뛸 수 있습니다")
+
             if is_video_file(input_file):
                 log_message("🎬 영상 파일 감지 - 영상 처리 파이프라인 시작")
                 process_complete_pipeline(input_file, settings)
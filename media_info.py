@@ -0,0 +1,135 @@
+import os
+import json
+import subprocess
+import threading
+from collections import OrderedDict
+from fractions import Fraction
+from config import get_ffprobe_path
+from utils import log_message
+
+# (절대 경로, 크기, 수정 시각) → 프로브 결과 (파일이 다시 쓰이면 키가 바뀌어 자동으로 다시 프로브)
+# 최근 사용 순서로 유지하고 상한을 넘으면 가장 오래 쓰지 않은 항목부터 제거 (LRU)
+MEDIA_CACHE_MAX_ENTRIES = 256
+_media_cache = OrderedDict()
+_media_lock = threading.Lock()
+
+
+def _cache_key(path):
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+
+def _frame_rate(value):
+    """'30000/1001' 형식 → float (알 수 없으면 None)"""
+    try:
+        rate = Fraction(value)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+    return float(rate) if rate > 0 else None
+
+
+def _probe_ffprobe(path):
+    cmd = [get_ffprobe_path(), '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', path]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe 실패 (return code: {result.returncode}): {path}")
+    data = json.loads(result.stdout)
+    fmt = data.get('format', {})
+
+    streams = []
+    for stream in data.get('streams', []):
+        streams.append({
+            'index': stream.get('index'),
+            'codec_type': stream.get('codec_type'),
+            'codec_name': stream.get('codec_name'),
+            'sample_rate': int(stream['sample_rate']) if stream.get('sample_rate') else None,
+            'channels': stream.get('channels'),
+            'width': stream.get('width'),
+            'height': stream.get('height'),
+            'r_frame_rate': stream.get('r_frame_rate'),
+            'frame_rate': _frame_rate(stream.get('r_frame_rate')),
+            'language': stream.get('tags', {}).get('language'),
+        })
+
+    durations = [fmt.get('duration')] + [s.get('duration') for s in data.get('streams', [])]
+    duration_s = next((float(d) for d in durations if d not in (None, 'N/A')), 0.0)
+    return {
+        'duration_ms': int(duration_s * 1000),
+        'format_name': fmt.get('format_name'),
+        'bit_rate': int(fmt['bit_rate']) if fmt.get('bit_rate') else None,
+        'streams': streams,
+    }
+
+
+def _probe_soundfile(path):
+    """ffprobe를 쓸 수 없을 때 WAV 등은 헤더만 읽어 확인"""
+    import soundfile as sf
+
+    info = sf.info(path)
+    return {
+        'duration_ms': int(info.frames * 1000 / info.samplerate),
+        'format_name': info.format.lower(),
+        'bit_rate': None,
+        'streams': [{'index': 0, 'codec_type': 'audio', 'codec_name': info.subtype.lower(),
+                     'sample_rate': info.samplerate, 'channels': info.channels, 'width': None, 'height': None,
+                     'r_frame_rate': None, 'frame_rate': None, 'language': None}],
+    }
+
+
+def _probe(path):
+    try:
+        return _probe_ffprobe(path)
+    except Exception as e:
+        try:
+            return _probe_soundfile(path)
+        except Exception:
+            pass
+        # 마지막 수단: 디코딩해서 길이만 확인
+        log_message(f"⚠️ 미디어 정보 확인 실패 ({e}) - 디코딩으로 길이 확인: {path}")
+        from pydub import AudioSegment
+
+        audio = AudioSegment.from_file(path)
+        return {
+            'duration_ms': len(audio),
+            'format_name': None,
+            'bit_rate': None,
+            'streams': [{'index': 0, 'codec_type': 'audio', 'codec_name': None, 'sample_rate': audio.frame_rate,
+                         'channels': audio.channels, 'width': None, 'height': None, 'r_frame_rate': None,
+                         'frame_rate': None, 'language': None}],
+        }
+
+
+def probe_media(path):
+    """
+    미디어 파일 정보를 한 번만 프로브하여 캐시 (경로+크기+수정 시각 기준, 최대 MEDIA_CACHE_MAX_ENTRIES개)
+
+    Returns:
+        {'duration_ms', 'format_name', 'bit_rate', 'streams': [...],
+         'audio': 첫 오디오 스트림 또는 None, 'video': 첫 영상 스트림 또는 None}
+    """
+    key = _cache_key(path)
+    with _media_lock:
+        if key in _media_cache:
+            _media_cache.move_to_end(key)
+            return _media_cache[key]
+
+    info = _probe(path)
+    info['audio'] = next((s for s in info['streams'] if s['codec_type'] == 'audio'), None)
+    info['video'] = next((s for s in info['streams'] if s['codec_type'] == 'video'), None)
+
+    with _media_lock:
+        _media_cache[key] = info
+        _media_cache.move_to_end(key)
+        while len(_media_cache) > MEDIA_CACHE_MAX_ENTRIES:
+            _media_cache.popitem(last=False)
+    return info
+
+
+def get_duration_ms(path):
+    """미디어 길이 (ms) - 디코딩 없이 캐시된 프로브 결과 사용"""
+    return probe_media(path)['duration_ms']
+
+
+def clear_media_cache():
+    with _media_lock:
+        _media_cache.clear()
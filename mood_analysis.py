@@ -0,0 +1,165 @@
+import os
+import logging
+import numpy as np
+import librosa
+
+# 분위기 특징 테이블 설정 (analyze_audio_mood와 동일한 librosa 기본값)
+MOOD_SAMPLE_RATE = 16000
+MOOD_N_FFT = 2048
+MOOD_HOP_LENGTH = 512
+MOOD_N_MFCC = 13
+
+# 특징 테이블 컬럼: [start_ms, end_ms, avg_rms, avg_spectral_centroid, avg_zcr, mfcc_var]
+MOOD_TABLE_COLUMNS = ('start_ms', 'end_ms', 'avg_rms', 'avg_spectral_centroid', 'avg_zcr', 'mfcc_var')
+
+DEFAULT_MOOD_COMMAND = "자연스럽게 말해"
+
+
+def classify_mood(avg_rms, avg_spectral_centroid, avg_zcr, mfcc_var) -> str:
+    """음성 특징값으로 instruct 명령어 결정 (템포 분석 제거)"""
+    if avg_rms > 0.05 and avg_spectral_centroid > 2000:
+        return "활기차게 말해"
+    elif avg_rms < 0.02 and avg_spectral_centroid < 1500:
+        return "차분하게 말해"
+    elif avg_zcr > 0.1 or avg_rms > 0.08:
+        return "감정적으로 말해"
+    elif mfcc_var < 50:
+        return "천천히 말해"
+    elif mfcc_var > 150:
+        return "빠르게 말해"
+    else:
+        return DEFAULT_MOOD_COMMAND
+
+
+def _frame_features(y: np.ndarray, sr: int, block_frames: int = 4096):
+    """
+    전체 트랙의 프레임별 특징을 블록 단위로 한 번에 계산
+    (center=True 프레임 정렬을 유지하면서 STFT 메모리를 블록 크기로 제한)
+
+    Returns:
+        rms, centroid, zcr: (n_frames,) / mfcc: (n_mfcc, n_frames)
+    """
+    half = MOOD_N_FFT // 2
+    padded = np.pad(y, (half, half))
+    n_frames = 1 + len(y) // MOOD_HOP_LENGTH
+
+    rms = np.zeros(n_frames, dtype=np.float32)
+    centroid = np.zeros(n_frames, dtype=np.float32)
+    zcr = np.zeros(n_frames, dtype=np.float32)
+    mfcc = np.zeros((MOOD_N_MFCC, n_frames), dtype=np.float32)
+    mel_basis = librosa.filters.mel(sr=sr, n_fft=MOOD_N_FFT)
+
+    for t0 in range(0, n_frames, block_frames):
+        t1 = min(t0 + block_frames, n_frames)
+        chunk = padded[t0 * MOOD_HOP_LENGTH:(t1 - 1) * MOOD_HOP_LENGTH + MOOD_N_FFT]
+        if len(chunk) < MOOD_N_FFT:
+            chunk = np.pad(chunk, (0, MOOD_N_FFT - len(chunk)))
+
+        S = np.abs(librosa.stft(chunk, n_fft=MOOD_N_FFT, hop_length=MOOD_HOP_LENGTH, center=False))
+        S = S[:, :t1 - t0]
+        n = S.shape[1]
+
+        rms[t0:t0 + n] = librosa.feature.rms(S=S, frame_length=MOOD_N_FFT)[0]
+        centroid[t0:t0 + n] = librosa.feature.spectral_centroid(S=S, sr=sr, n_fft=MOOD_N_FFT)[0]
+        zcr[t0:t0 + n] = librosa.feature.zero_crossing_rate(
+            chunk, frame_length=MOOD_N_FFT, hop_length=MOOD_HOP_LENGTH, center=False
+        )[0][:n]
+        mel = librosa.power_to_db(mel_basis.dot(S ** 2))
+        mfcc[:, t0:t0 + n] = librosa.feature.mfcc(S=mel, n_mfcc=MOOD_N_MFCC)
+
+    return rms, centroid, zcr, mfcc
+
+
+def compute_mood_feature_table(audio_path: str, segments, sr: int = MOOD_SAMPLE_RATE) -> np.ndarray:
+    """
+    원본 트랙을 한 번 읽어 모든 세그먼트의 분위기 특징을 벡터화 계산
+
+    Args:
+        audio_path: 원본(보컬) 오디오 경로
+        segments: [(start_ms, end_ms), ...] 세그먼트 리스트 (1번부터 순서대로 WAV 번호와 대응)
+        sr: 분석 샘플링 레이트
+
+    Returns:
+        (len(segments), 6) float64 테이블 (컬럼은 MOOD_TABLE_COLUMNS 참조)
+    """
+    y, sr = librosa.load(audio_path, sr=sr)
+    rms, centroid, zcr, mfcc = _frame_features(y, sr)
+    n_frames = len(rms)
+
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 2)
+    # 세그먼트 → 프레임 인덱스 범위 [f0, f1)
+    f0 = np.clip(np.floor(seg[:, 0] * sr / 1000.0 / MOOD_HOP_LENGTH), 0, n_frames - 1).astype(np.int64)
+    f1 = np.clip(np.ceil(seg[:, 1] * sr / 1000.0 / MOOD_HOP_LENGTH) + 1, 1, n_frames).astype(np.int64)
+    f1 = np.maximum(f1, f0 + 1)
+    counts = (f1 - f0).astype(np.float64)
+
+    def _segment_mean(values):
+        # 누적합으로 모든 세그먼트 평균을 한 번에 계산
+        csum = np.concatenate([np.zeros(values.shape[:-1] + (1,)), np.cumsum(values, axis=-1, dtype=np.float64)],
+                              axis=-1)
+        return (csum[..., f1] - csum[..., f0]) / counts
+
+    mfcc_mean = _segment_mean(mfcc)
+    mfcc_sq_mean = _segment_mean(mfcc.astype(np.float64) ** 2)
+    mfcc_var = np.maximum(mfcc_sq_mean - mfcc_mean ** 2, 0.0).mean(axis=0)
+
+    return np.column_stack([
+        seg[:, 0],
+        seg[:, 1],
+        _segment_mean(rms),
+        _segment_mean(centroid),
+        _segment_mean(zcr),
+        mfcc_var,
+    ])
+
+
+def build_mood_feature_table(audio_path: str, segments, table_path: str) -> str:
+    """
+    분위기 특징 테이블을 생성하여 .npy로 캐시 (세그먼트와 원본이 같으면 기존 캐시 재사용)
+
+    Returns:
+        테이블 경로 (실패 시 None)
+    """
+    try:
+        cached = load_mood_feature_table(table_path)
+        if (cached is not None
+                and os.path.getmtime(table_path) >= os.path.getmtime(audio_path)
+                and cached.shape[0] == len(segments)
+                and np.array_equal(cached[:, :2], np.asarray(segments, dtype=np.float64).reshape(-1, 2))):
+            logging.info(f"🎭 분위기 특징 캐시 재사용: {table_path}")
+            return table_path
+
+        logging.info(f"🎭 분위기 특징 일괄 계산 중: {len(segments)}개 세그먼트")
+        table = compute_mood_feature_table(audio_path, segments)
+        os.makedirs(os.path.dirname(table_path) or '.', exist_ok=True)
+        np.save(table_path, table)
+        logging.info(f"✅ 분위기 특징 테이블 저장: {table_path}")
+        return table_path
+
+    except Exception as e:
+        logging.warning(f"⚠️ 분위기 특징 테이블 생성 실패: {e}")
+        return None
+
+
+def load_mood_feature_table(table_path: str):
+    """저장된 분위기 특징 테이블 로드 (없거나 형식이 다르면 None)"""
+    if not table_path or not os.path.exists(table_path):
+        return None
+    try:
+        table = np.load(table_path)
+    except Exception as e:
+        logging.warning(f"⚠️ 분위기 특징 테이블 로드 실패: {e}")
+        return None
+    if table.ndim != 2 or table.shape[1] != len(MOOD_TABLE_COLUMNS):
+        return None
+    return table
+
+
+def lookup_mood_command(table, segment_index: int):
+    """
+    세그먼트 번호(1부터)로 instruct 명령어 조회 (테이블에 없으면 None)
+    """
+    if table is None or segment_index < 1 or segment_index > table.shape[0]:
+        return None
+    _, _, avg_rms, avg_centroid, avg_zcr, mfcc_var = table[segment_index - 1]
+    return classify_mood(avg_rms, avg_centroid, avg_zcr, mfcc_var)
@@ -0,0 +1,168 @@
+import os
+import json
+import numpy as np
+from utils import log_message
+
+# 샘플링 설정 (파일 전체가 아니라 고르게 흩어진 몇 개 구간만 분석)
+SAMPLE_WINDOWS = 8  # 분석할 구간 수
+WINDOW_S = 4.0  # 구간 길이 (초)
+ANALYSIS_SR = 16000  # 분석용 샘플레이트 (다운샘플)
+N_FFT = 1024
+HOP = 256
+
+# HPSS 메디안 필터 길이 (프레임 / 주파수 빈)
+HARMONIC_KERNEL = 31  # 약 0.5초 - 말소리의 빠른 음높이 변화는 걸러지고 지속음(악기/패드)만 남음
+PERCUSSIVE_KERNEL = 17
+
+# 판정 기준
+SUSTAINED_RATIO_THRESHOLD = 0.35  # 지속 화성 에너지 비율이 이 이상이면 음악
+PERCUSSIVE_RATIO_THRESHOLD = 0.35  # 타악 에너지 비율이 이 이상이면 음악 (비트)
+QUIET_FRAME_DB = -35.0  # 구간 최대 에너지 대비 이 이하인 프레임은 쉼 구간
+QUIET_RATIO_THRESHOLD = 0.12  # 쉼 구간 비율이 이 이상이면 배경음이 비어 있는 것으로 봄
+QUIET_FLATNESS_THRESHOLD = 0.3  # 쉼 구간 스펙트럼 평탄도가 이 이하면 쉼 구간에도 음(배경음악)이 있음
+MUSIC_WINDOW_FRACTION = 0.25  # 음악으로 판정된 구간 비율이 이 이상이면 분리 필요
+
+EPS = 1e-10
+
+
+def _read_windows(audio_path, windows=SAMPLE_WINDOWS, window_s=WINDOW_S):
+    """파일 전체를 읽지 않고 고르게 흩어진 구간만 모노 float32로 읽기"""
+    import soundfile as sf
+
+    info = sf.info(audio_path)
+    sr = info.samplerate
+    length = int(window_s * sr)
+    if info.frames <= length:
+        starts = [0]
+    else:
+        starts = np.linspace(0, info.frames - length, windows).astype(int).tolist()
+
+    for start in starts:
+        data, _ = sf.read(audio_path, start=start, stop=start + length, dtype='float32', always_2d=True)
+        mono = data.mean(axis=1)
+        if sr != ANALYSIS_SR:
+            # 분석용이므로 선형 보간 다운샘플로 충분
+            target = int(len(mono) * ANALYSIS_SR / sr)
+            mono = np.interp(np.linspace(0, len(mono) - 1, target), np.arange(len(mono)), mono).astype(np.float32)
+        yield start / sr, mono
+
+
+def _magnitude_spectrogram(x):
+    """Hann 창 STFT 크기 (주파수 빈 × 프레임)"""
+    if len(x) < N_FFT:
+        x = np.pad(x, (0, N_FFT - len(x)))
+    frames = np.lib.stride_tricks.sliding_window_view(x, N_FFT)[::HOP]
+    return np.abs(np.fft.rfft(frames * np.hanning(N_FFT), axis=1)).T
+
+
+def _window_features(x):
+    """한 구간의 특징: 지속 화성/타악 에너지 비율, 쉼 구간 비율, 쉼 구간 평탄도"""
+    from scipy.ndimage import median_filter
+
+    mag = _magnitude_spectrogram(x)
+    power = mag ** 2
+
+    # 메디안 필터 HPSS: 시간 방향 필터 → 지속음, 주파수 방향 필터 → 타악음
+    harmonic = median_filter(power, size=(1, HARMONIC_KERNEL))
+    percussive = median_filter(power, size=(PERCUSSIVE_KERNEL, 1))
+    # 원래 파워 대비 비율 (말소리는 시간/주파수 양쪽으로 희소해서 두 메디안 모두 작게 나옴)
+    total = power.sum() + EPS
+
+    frame_energy = power.sum(axis=0)
+    frame_db = 10 * np.log10(frame_energy / (frame_energy.max() + EPS) + EPS)
+    quiet = frame_db < QUIET_FRAME_DB
+
+    # 스펙트럼 평탄도 (기하평균 / 산술평균): 잡음/무음에 가까울수록 1, 음정이 있으면 0에 가까움
+    flatness = np.exp(np.mean(np.log(mag + EPS), axis=0)) / (np.mean(mag, axis=0) + EPS)
+
+    return {
+        'sustained_ratio': float(min(harmonic.sum() / total, 1.0)),
+        'percussive_ratio': float(min(percussive.sum() / total, 1.0)),
+        'quiet_ratio': float(quiet.mean()),
+        'quiet_flatness': float(np.median(flatness[quiet])) if quiet.any() else None,
+    }
+
+
+def _is_music_window(features):
+    """
+    말소리만 있으면 문장 사이 쉼 구간이 비어 있고 화성 성분이 빠르게 변함
+    배경음악이 있으면 쉼 구간이 채워지거나 지속 화성/타악 에너지가 큼
+    """
+    if features['sustained_ratio'] >= SUSTAINED_RATIO_THRESHOLD:
+        return True
+    if features['percussive_ratio'] >= PERCUSSIVE_RATIO_THRESHOLD:
+        return True
+    if features['quiet_ratio'] < QUIET_RATIO_THRESHOLD:
+        return True
+    return features['quiet_flatness'] is not None and features['quiet_flatness'] <= QUIET_FLATNESS_THRESHOLD
+
+
+def detect_music(audio_path, decision_path=None):
+    """
+    분리(UVR5)가 필요한지 빠르게 판정 (몇 개의 샘플 구간만 분석)
+
+    Args:
+        decision_path: 판정 결과(JSON)를 기록할 경로 (선택)
+
+    Returns:
+        {'needs_separation': bool, 'music_fraction': float, 'windows': [...]}
+        분석 실패 시 needs_separation=True (안전하게 분리 수행)
+    """
+    try:
+        windows = []
+        for offset_s, samples in _read_windows(audio_path):
+            features = _window_features(samples)
+            features['offset_s'] = round(offset_s, 2)
+            features['music'] = _is_music_window(features)
+            windows.append(features)
+
+        music_fraction = sum(w['music'] for w in windows) / len(windows)
+        decision = {
+            'file': audio_path,
+            'needs_separation': music_fraction >= MUSIC_WINDOW_FRACTION,
+            'music_fraction': round(music_fraction, 3),
+            'windows': windows,
+        }
+    except Exception as e:
+        log_message(f"⚠️ 음악 감지 실패 ({e}) - 분리 수행")
+        decision = {'file': audio_path, 'needs_separation': True, 'error': str(e)}
+
+    if decision_path:
+        os.makedirs(os.path.dirname(decision_path) or '.', exist_ok=True)
+        with open(decision_path, 'w', encoding='utf-8') as f:
+            json.dump(decision, f, ensure_ascii=False, indent=2)
+
+    if 'music_fraction' in decision:
+        label = '배경음악 있음 → 분리 수행' if decision['needs_separation'] else '음성만 있음 → 분리 생략'
+        log_message(f"🎼 음악 감지: {label} (음악 구간 {decision['music_fraction']:.0%})")
+    return decision
+
+
+def write_passthrough_separation(audio_path, vocals_path, background_path):
+    """
+    분리를 생략할 때 파이프라인 입력을 맞추기 위해 원본을 보컬로, 같은 길이의 무음을 배경음으로 기록
+    (배경음 합성 단계에서 짧은 배경음을 반복하지 않도록 길이를 맞춤)
+    """
+    import soundfile as sf
+
+    os.makedirs(os.path.dirname(vocals_path), exist_ok=True)
+    os.makedirs(os.path.dirname(background_path), exist_ok=True)
+
+    info = sf.info(audio_path)
+    block = info.samplerate * 10
+    with sf.SoundFile(vocals_path, 'w', info.samplerate, info.channels) as vocals_out, \
+            sf.SoundFile(background_path, 'w', info.samplerate, info.channels) as background_out:
+        for data in sf.blocks(audio_path, blocksize=block, dtype='float32', always_2d=True):
+            vocals_out.write(data)
+            background_out.write(np.zeros_like(data))
+    return vocals_path, background_path
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) < 2:
+        print("사용법: python music_detector.py <audio_file> [decision.json]")
+        sys.exit(1)
+    result = detect_music(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(json.dumps({k: v for k, v in result.items() if k != 'windows'}, ensure_ascii=False, indent=2))
@@ -0,0 +1,409 @@
+import os
+import sys
+import json
+import time
+import queue
+import shutil
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from utils import log_message
+from vad_processor import get_audio_duration_ms
+
+repo_root = os.path.dirname(os.path.abspath(__file__))
+UVR5_ROOT = os.path.join(repo_root, 'GPT-SoVITS', 'tools', 'uvr5')
+
+# 기본 분리 모델 (HP2 - 인성 보존에 좋음)
+DEFAULT_SEPARATION_MODEL = 'HP2_all_vocals'
+DEFAULT_AGGRESSIVENESS = 10  # 인성 추출 강도
+
+# 청크 분리 설정
+DEFAULT_CHUNK_S = 60.0  # 청크 길이 (초)
+DEFAULT_OVERLAP_S = 2.0  # 이웃 청크와 겹치는 길이 (크로스페이드 구간)
+CHUNKED_MIN_S = 600.0  # 'auto'일 때 이 길이 이상이면 청크 분리
+
+_service_lock = threading.Lock()
+_service = None
+
+
+def _select_device():
+    import torch
+
+    if torch.cuda.is_available():
+        return torch.device('cuda')
+    if torch.backends.mps.is_available():
+        return torch.device('mps')
+    if hasattr(torch, 'xpu') and torch.xpu.is_available():
+        return torch.device('xpu')
+    return torch.device('cpu')
+
+
+def _find_output(folder, base_name):
+    """UVR5 출력 폴더에서 원본 이름이 들어간 WAV 찾기 (없으면 폴더의 첫 WAV)"""
+    if not os.path.exists(folder):
+        return None
+    wav_files = sorted(f for f in os.listdir(folder) if f.endswith('.wav'))
+    for f in wav_files:
+        if base_name in f:
+            return os.path.join(folder, f)
+    return os.path.join(folder, wav_files[0]) if wav_files else None
+
+
+def output_names(audio_path, agg=DEFAULT_AGGRESSIVENESS):
+    """UVR5 AudioPre 출력 파일 이름 규칙 (vocal_/instrument_ + 입력 파일명(확장자 포함) + _강도)"""
+    name = os.path.basename(audio_path)
+    return f"vocal_{name}_{agg}.wav", f"instrument_{name}_{agg}.wav"
+
+
+def _map_bounded(executor, fn, jobs, limit):
+    """
+    executor.map과 같이 입력 순서대로 결과를 반환하되 동시에 제출된 작업을 limit개로 제한
+    (executor.map은 모든 작업을 즉시 제출하므로 소비가 늦으면 완료된 창 결과가 전부 메모리에 쌓임)
+    """
+    jobs = iter(jobs)
+    pending = deque()
+
+    def submit_next():
+        job = next(jobs, None)
+        if job is not None:
+            pending.append(executor.submit(fn, job))
+
+    for _ in range(limit):
+        submit_next()
+    while pending:
+        future = pending.popleft()
+        submit_next()
+        yield future.result()
+
+
+class SeparationService:
+    """
+    UVR5 보컬/배경음 분리 모델을 한 번만 로드하여 여러 파일에 재사용
+    파일마다 처리 시간과 실시간 계수(RTF = 처리 시간 / 오디오 길이)를 기록
+    """
+
+    def __init__(self, model_name=DEFAULT_SEPARATION_MODEL, agg=DEFAULT_AGGRESSIVENESS, is_half=False):
+        self.model_name = model_name
+        self.agg = agg
+        self.is_half = is_half  # 안정성을 위해 기본 False
+        self.device = None
+        self.pre_fun = None
+        self.load_sec = 0.0
+
+    def load(self):
+        """UVR5 모듈 import 및 모델 로드 (이미 로드되어 있으면 아무것도 하지 않음)"""
+        if self.pre_fun is not None:
+            return
+
+        if not os.path.exists(UVR5_ROOT):
+            raise FileNotFoundError(f"UVR5 경로를 찾을 수 없습니다: {UVR5_ROOT}")
+
+        # UVR5 모듈 경로와 GPT-SoVITS tools 경로를 sys.path에 추가
+        for path in (UVR5_ROOT, os.path.dirname(UVR5_ROOT)):
+            if path not in sys.path:
+                sys.path.insert(0, path)
+
+        from vr import AudioPre
+
+        start = time.perf_counter()
+        self.device = _select_device()
+        log_message(f"🔧 UVR5 모델 상주 로드: 모델={self.model_name}, 디바이스={self.device}")
+        self.pre_fun = AudioPre(
+            agg=self.agg,
+            model_path=os.path.join(UVR5_ROOT, 'uvr5_weights', self.model_name + '.pth'),
+            device=self.device,
+            is_half=self.is_half,
+        )
+        self.load_sec = time.perf_counter() - start
+        log_message(f"✅ UVR5 모델 로드 완료 ({self.load_sec:.1f}초)")
+
+    def separate(self, audio_path, output_dir, chunked='auto', chunk_s=DEFAULT_CHUNK_S, workers=1, audio=None):
+        """
+        한 파일을 보컬/배경음으로 분리
+        chunked: True / False / 'auto' (CHUNKED_MIN_S 이상이면 청크 분리로 메모리 사용량 제한)
+        audio: audio_ingest.IngestedAudio - 주어지면 audio_path 파일 없이 파이프 디코딩 결과(memmap)를 창 단위로 분리
+               (전체 WAV를 기록하지 않도록 chunked와 관계없이 청크 분리 사용, 짧은 입력은 창 1개)
+
+        Returns:
+            (vocals_path, background_path, stats) - 실패 시 경로는 None
+        """
+        self.load()
+
+        if chunked == 'auto':
+            chunked = audio is not None or get_audio_duration_ms(audio_path) / 1000 >= CHUNKED_MIN_S
+        if chunked or audio is not None:
+            # AudioPre는 파일 경로만 받으므로 파이프 디코딩 결과는 창 단위 임시 WAV로만 넘김
+            return self.separate_chunked(audio_path, output_dir, chunk_s=chunk_s, workers=workers, audio=audio)
+
+        vocals_dir = os.path.join(output_dir, 'vocals')
+        background_dir = os.path.join(output_dir, 'background')
+        os.makedirs(vocals_dir, exist_ok=True)
+        os.makedirs(background_dir, exist_ok=True)
+        base_name = os.path.splitext(os.path.basename(audio_path))[0]
+
+        log_message(f"🎵 음성 분리 처리 중: {os.path.basename(audio_path)}")
+        start = time.perf_counter()
+        self.pre_fun._path_audio_(audio_path, background_dir, vocals_dir, 'wav', 'HP3' in self.model_name)
+        elapsed = time.perf_counter() - start
+
+        audio_sec = get_audio_duration_ms(audio_path) / 1000
+        stats = {
+            'file': audio_path,
+            'audio_sec': round(audio_sec, 2),
+            'elapsed_sec': round(elapsed, 2),
+            'rtf': round(elapsed / audio_sec, 4) if audio_sec > 0 else None,
+        }
+        log_message(f"⏱️ 분리 완료: {audio_sec:.0f}초 오디오 / {elapsed:.1f}초 소요 (RTF {stats['rtf']})")
+
+        vocals_path = _find_output(vocals_dir, base_name)
+        background_path = _find_output(background_dir, base_name)
+        return vocals_path, background_path, stats
+
+    def _separate_window(self, audio_path, start, stop, work_dir, index, audio=None):
+        """입력의 [start, stop) 프레임 구간만 읽어 분리하고 (보컬, 배경음, 출력 샘플레이트) 반환"""
+        import soundfile as sf
+
+        chunk_name = f"chunk{index:05d}"
+        chunk_dir = os.path.join(work_dir, chunk_name)
+        vocals_dir = os.path.join(chunk_dir, 'vocals')
+        background_dir = os.path.join(chunk_dir, 'background')
+        os.makedirs(vocals_dir, exist_ok=True)
+        os.makedirs(background_dir, exist_ok=True)
+
+        if audio is not None:
+            data, sr = audio.read(start, stop), audio.sample_rate
+        else:
+            data, sr = sf.read(audio_path, start=start, stop=stop, dtype='float32', always_2d=True)
+        chunk_path = os.path.join(chunk_dir, f"{chunk_name}.wav")
+        sf.write(chunk_path, data, sr)
+
+        self.pre_fun._path_audio_(chunk_path, background_dir, vocals_dir, 'wav', 'HP3' in self.model_name)
+
+        vocals, out_sr = sf.read(_find_output(vocals_dir, chunk_name), dtype='float32', always_2d=True)
+        background, _ = sf.read(_find_output(background_dir, chunk_name), dtype='float32', always_2d=True)
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+        return vocals, background, out_sr
+
+    def separate_chunked(self, audio_path, output_dir, chunk_s=DEFAULT_CHUNK_S, overlap_s=DEFAULT_OVERLAP_S,
+                         workers=1, audio=None):
+        """
+        고정 길이 창 단위 분리 후 겹침 구간을 크로스페이드로 이어 붙여 WAV로 바로 기록
+        메모리는 파일 길이와 무관하게 (창 길이 × 동시 처리 수)로 제한됨
+        workers > 1이면 워커마다 모델 인스턴스를 따로 두고 창을 병렬 처리 (출력은 순서대로 기록)
+        audio가 주어지면 파일 대신 파이프 디코딩 결과(memmap)에서 창을 잘라냄 (audio_path는 출력 이름에만 사용)
+
+        Returns:
+            separate()와 동일 (vocals_path, background_path, stats)
+        """
+        import soundfile as sf
+
+        self.load()
+        if audio is not None:
+            sr, total = audio.sample_rate, audio.frames
+        else:
+            info = sf.info(audio_path)
+            sr, total = info.samplerate, info.frames
+        hop = int(chunk_s * sr)
+        overlap = int(overlap_s * sr)
+        # 마지막 창이 겹침 구간보다 짧아지지 않도록 시작 위치를 제한 (마지막 창은 항상 파일 끝까지)
+        windows = [(start, min(start + hop + overlap, total)) for start in range(0, max(total - overlap, 1), hop)]
+
+        vocals_dir = os.path.join(output_dir, 'vocals')
+        background_dir = os.path.join(output_dir, 'background')
+        work_dir = os.path.join(output_dir, 'chunks')
+        os.makedirs(vocals_dir, exist_ok=True)
+        os.makedirs(background_dir, exist_ok=True)
+        # UVR5와 같은 출력 이름 규칙
+        vocals_name, background_name = output_names(audio_path, self.agg)
+        vocals_path = os.path.join(vocals_dir, vocals_name)
+        background_path = os.path.join(background_dir, background_name)
+
+        log_message(f"🎵 청크 분리: {total / sr:.0f}초 → {len(windows)}개 창 "
+                    f"({chunk_s:.0f}초 + 겹침 {overlap_s:.1f}초, 워커 {workers}개)")
+
+        # 워커별 모델 인스턴스 (첫 번째는 자기 자신)
+        services = queue.Queue()
+        services.put(self)
+        for _ in range(max(1, workers) - 1):
+            extra = SeparationService(self.model_name, self.agg, self.is_half)
+            extra.load()
+            services.put(extra)
+
+        def run_window(job):
+            index, (start, stop) = job
+            service = services.get()
+            try:
+                return service._separate_window(audio_path, start, stop, work_dir, index, audio)
+            finally:
+                services.put(service)
+
+        start_time = time.perf_counter()
+        writers = None
+        tails = None
+        fade = None
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                for index, (vocals, background, out_sr) in enumerate(
+                        _map_bounded(executor, run_window, enumerate(windows), max(1, workers))):
+                    start, stop = windows[index]
+                    out_overlap = overlap * out_sr // sr
+                    out_len = (stop - start) * out_sr // sr
+
+                    if writers is None:
+                        channels = vocals.shape[1]
+                        writers = [sf.SoundFile(path, 'w', samplerate=out_sr, channels=channels, subtype='PCM_16')
+                                   for path in (vocals_path, background_path)]
+                        fade = np.linspace(0.0, 1.0, out_overlap, dtype=np.float32)[:, None]
+
+                    new_tails = []
+                    for k, (writer, part) in enumerate(zip(writers, (vocals, background))):
+                        # 창 출력 길이를 입력 구간 길이에 맞춤 (모델 패딩 보정)
+                        part = part[:out_len]
+                        if len(part) < out_len:
+                            part = np.pad(part, ((0, out_len - len(part)), (0, 0)))
+
+                        # 이전 창의 끝 겹침 구간과 크로스페이드
+                        if tails is not None and out_overlap > 0:
+                            head = part[:out_overlap]
+                            part = np.concatenate([tails[k] * (1.0 - fade) + head * fade, part[out_overlap:]])
+
+                        is_last = index == len(windows) - 1
+                        if is_last or out_overlap == 0:
+                            writer.write(part)
+                            new_tails.append(None)
+                        else:
+                            writer.write(part[:-out_overlap])
+                            new_tails.append(part[-out_overlap:])
+                    tails = new_tails
+                    log_message(f"   ✂️ 창 {index + 1}/{len(windows)} 완료")
+        finally:
+            if writers:
+                for writer in writers:
+                    writer.close()
+            while not services.empty():
+                service = services.get()
+                if service is not self:
+                    service.release()
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        elapsed = time.perf_counter() - start_time
+        audio_sec = total / sr
+        stats = {
+            'file': audio_path,
+            'audio_sec': round(audio_sec, 2),
+            'elapsed_sec': round(elapsed, 2),
+            'rtf': round(elapsed / audio_sec, 4) if audio_sec > 0 else None,
+            'chunks': len(windows),
+        }
+        log_message(f"⏱️ 청크 분리 완료: {audio_sec:.0f}초 오디오 / {elapsed:.1f}초 소요 (RTF {stats['rtf']})")
+        return vocals_path, background_path, stats
+
+    def separate_many(self, jobs, report_path=None):
+        """
+        (audio_path, output_dir) 목록을 모델 1회 로드로 순서대로 분리
+
+        Returns:
+            {'load_sec', 'files': [stats...], 'total_audio_sec', 'total_elapsed_sec', 'rtf'}
+        """
+        self.load()
+        results = []
+        for idx, (audio_path, output_dir) in enumerate(jobs, 1):
+            log_message(f"📦 [{idx}/{len(jobs)}] {audio_path}")
+            try:
+                vocals_path, background_path, stats = self.separate(audio_path, output_dir)
+                stats.update(vocals=vocals_path, background=background_path)
+            except Exception as e:
+                log_message(f"❌ 분리 실패: {audio_path} ({e})")
+                stats = {'file': audio_path, 'error': str(e)}
+            results.append(stats)
+
+        done = [r for r in results if r.get('rtf') is not None]
+        total_audio = sum(r['audio_sec'] for r in done)
+        total_elapsed = sum(r['elapsed_sec'] for r in done)
+        report = {
+            'model': self.model_name,
+            'device': str(self.device),
+            'load_sec': round(self.load_sec, 2),
+            'files': results,
+            'total_audio_sec': round(total_audio, 2),
+            'total_elapsed_sec': round(total_elapsed, 2),
+            'rtf': round(total_elapsed / total_audio, 4) if total_audio > 0 else None,
+        }
+        log_message(f"✅ 일괄 분리 완료: {len(done)}/{len(jobs)}개, 모델 로드 {self.load_sec:.1f}초 1회, "
+                    f"전체 RTF {report['rtf']}")
+
+        if report_path:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            log_message(f"💾 분리 보고서 저장: {report_path}")
+        return report
+
+    def release(self):
+        """모델 해제 및 GPU 캐시 정리"""
+        if self.pre_fun is None:
+            return
+        import torch
+
+        del self.pre_fun.model
+        self.pre_fun = None
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        log_message("🧹 UVR5 모델 해제")
+
+
+def get_separation_service(model_name=DEFAULT_SEPARATION_MODEL, agg=DEFAULT_AGGRESSIVENESS):
+    """상주 분리 서비스 반환 (모델/강도가 같으면 재사용)"""
+    global _service
+    with _service_lock:
+        if _service is not None and (_service.model_name, _service.agg) != (model_name, agg):
+            _service.release()
+            _service = None
+        if _service is None:
+            _service = SeparationService(model_name, agg)
+        return _service
+
+
+def release_separation_service():
+    """상주 분리 서비스 해제 (TTS 등 다음 단계에 GPU 메모리를 넘길 때)"""
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.release()
+            _service = None
+
+
+if __name__ == '__main__':
+    import argparse
+    from video_processor import extract_audio_from_video
+    from utils import is_video_file, is_audio_file
+
+    parser = argparse.ArgumentParser(description="UVR5 보컬/배경음 일괄 분리 (모델 1회 로드)")
+    parser.add_argument('inputs', nargs='+', help="영상/오디오 파일 또는 디렉토리")
+    parser.add_argument('--output_root', default=os.path.join(os.getcwd(), 'separation'), help="출력 루트")
+    parser.add_argument('--model', default=DEFAULT_SEPARATION_MODEL, help="UVR5 모델 이름")
+    parser.add_argument('--agg', type=int, default=DEFAULT_AGGRESSIVENESS, help="인성 추출 강도")
+    args = parser.parse_args()
+
+    files = []
+    for path in args.inputs:
+        if os.path.isdir(path):
+            files += [os.path.join(path, f) for f in sorted(os.listdir(path))]
+        else:
+            files.append(path)
+
+    jobs = []
+    for path in files:
+        base = os.path.splitext(os.path.basename(path))[0]
+        out = os.path.join(args.output_root, base)
+        os.makedirs(out, exist_ok=True)
+        if is_video_file(path):
+            audio_path = os.path.join(out, f"{base}_extracted.wav")
+            if not extract_audio_from_video(path, audio_path):
+                continue
+            jobs.append((audio_path, out))
+        elif is_audio_file(path):
+            jobs.append((path, out))
+
+    service = SeparationService(args.model, args.agg)
+    service.separate_many(jobs, report_path=os.path.join(args.output_root, 'separation_report.json'))
@@ -0,0 +1,275 @@
+import os
+import sys
+import gc
+import json
+import time
+import logging
+import contextlib
+import importlib.util
+import torch
+
+# CosyVoice2 추론 백엔드 선택
+# - eager: 기본 PyTorch (기존 동작)
+# - jit: TorchScript flow encoder (flow.encoder.*.zip)
+# - onnx_cpu: flow decoder estimator를 ONNX Runtime CPU로 실행 (flow.decoder.estimator.fp32.onnx)
+# - fp16: CUDA 반정밀도 (CosyVoice2 fp16 옵션)
+# - bf16: bfloat16 autocast (CPU/CUDA)
+TTS_BACKENDS = ('eager', 'jit', 'onnx_cpu', 'fp16', 'bf16')
+DEFAULT_TTS_BACKEND = 'eager'
+
+repo_root = os.path.dirname(__file__)
+BENCHMARK_RESULTS_PATH = os.path.join(repo_root, 'tts_backend_benchmark.json')
+
+# 벤치마크 기본 입력
+BENCHMARK_TEXT = "안녕하세요. 이 문장은 음성 합성 백엔드 속도를 측정하기 위한 테스트 문장입니다."
+
+
+def _device_type() -> str:
+    return 'cuda' if torch.cuda.is_available() else 'cpu'
+
+
+def _onnxruntime_available() -> bool:
+    return importlib.util.find_spec('onnxruntime') is not None
+
+
+def check_backend(backend: str, model_path: str):
+    """
+    백엔드 사용 가능 여부 확인
+
+    Returns:
+        (사용 가능 여부, 사유)
+    """
+    cuda = torch.cuda.is_available()
+
+    if backend == 'eager':
+        return True, "기본 PyTorch"
+
+    if backend == 'jit':
+        jit_file = 'flow.encoder.fp16.zip' if cuda else 'flow.encoder.fp32.zip'
+        if not os.path.exists(os.path.join(model_path, jit_file)):
+            return False, f"{jit_file} 없음"
+        return True, f"TorchScript {jit_file}"
+
+    if backend == 'onnx_cpu':
+        if not _onnxruntime_available():
+            return False, "onnxruntime 미설치"
+        if not os.path.exists(os.path.join(model_path, 'flow.decoder.estimator.fp32.onnx')):
+            return False, "flow.decoder.estimator.fp32.onnx 없음"
+        return True, "ONNX Runtime CPU (flow decoder)"
+
+    if backend == 'fp16':
+        if not cuda:
+            return False, "CUDA 필요"
+        return True, "CUDA fp16"
+
+    if backend == 'bf16':
+        if cuda and not torch.cuda.is_bf16_supported():
+            return False, "GPU가 bfloat16 미지원"
+        return True, f"{_device_type().upper()} bfloat16 autocast"
+
+    return False, f"알 수 없는 백엔드: {backend}"
+
+
+def available_backends(model_path: str) -> dict:
+    """백엔드별 (사용 가능 여부, 사유) 보고"""
+    return {name: check_backend(name, model_path) for name in TTS_BACKENDS}
+
+
+def load_benchmark_results(results_path: str = BENCHMARK_RESULTS_PATH):
+    """저장된 벤치마크 결과 로드 (없으면 None)"""
+    if not os.path.exists(results_path):
+        return None
+    try:
+        with open(results_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logging.warning(f"⚠️ 백엔드 벤치마크 결과 로드 실패: {e}")
+        return None
+
+
+def resolve_backend(backend: str, model_path: str, results_path: str = BENCHMARK_RESULTS_PATH) -> str:
+    """
+    요청된 백엔드를 실제 사용할 백엔드로 확정
+    'auto'이면 이 장치에서 측정한 벤치마크 중 가장 빠른 백엔드, 결과가 없으면 장치별 기본 우선순위 사용
+    """
+    backend = (backend or DEFAULT_TTS_BACKEND).lower()
+
+    if backend == 'auto':
+        results = load_benchmark_results(results_path)
+        if results and results.get('device') == _device_type():
+            ranked = sorted(
+                (r['rtf'], name) for name, r in results.get('results', {}).items() if r.get('rtf') is not None
+            )
+            for _, name in ranked:
+                if check_backend(name, model_path)[0]:
+                    logging.info(f"🚀 TTS 백엔드 자동 선택 (벤치마크 기준): {name}")
+                    return name
+
+        preference = ('fp16', 'jit', 'eager') if torch.cuda.is_available() else ('onnx_cpu', 'jit', 'eager')
+        for name in preference:
+            if check_backend(name, model_path)[0]:
+                logging.info(f"🚀 TTS 백엔드 자동 선택: {name}")
+                return name
+
+    ok, reason = check_backend(backend, model_path)
+    if not ok:
+        logging.warning(f"⚠️ TTS 백엔드 '{backend}' 사용 불가 ({reason}) - {DEFAULT_TTS_BACKEND}로 대체")
+        return DEFAULT_TTS_BACKEND
+    return backend
+
+
+class OnnxFlowEstimator(torch.nn.Module):
+    """flow decoder estimator를 ONNX Runtime CPU 세션으로 대체하는 래퍼"""
+
+    def __init__(self, onnx_path: str, num_threads: int = 0):
+        super().__init__()
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+
+        self.session = onnxruntime.InferenceSession(onnx_path, sess_options=options,
+                                                    providers=['CPUExecutionProvider'])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def forward(self, x, mask, mu, t, spks, cond, **kwargs):
+        feeds = {
+            name: tensor.detach().to('cpu', torch.float32).numpy()
+            for name, tensor in zip(self.input_names, (x, mask, mu, t, spks, cond))
+        }
+        out = self.session.run(None, feeds)[0]
+        return torch.from_numpy(out).to(x.device, x.dtype)
+
+
+def load_cosyvoice(model_path: str, backend: str = DEFAULT_TTS_BACKEND, onnx_threads: int = 0):
+    """
+    지정한 백엔드로 CosyVoice2 모델 로드
+
+    Returns:
+        (CosyVoice2 인스턴스, 확정된 백엔드 이름)
+    """
+    cosyvoice_root = os.path.join(repo_root, 'CosyVoice')
+    if cosyvoice_root not in sys.path:
+        sys.path.insert(0, cosyvoice_root)
+    from cosyvoice.cli.cosyvoice import CosyVoice2
+
+    backend = resolve_backend(backend, model_path)
+    cuda = torch.cuda.is_available()
+
+    cosy = CosyVoice2(
+        model_path,
+        load_jit=(backend == 'jit' and cuda),
+        load_trt=False,
+        load_vllm=False,
+        fp16=(backend == 'fp16')
+    )
+
+    if backend == 'jit' and not cuda:
+        # CosyVoice2는 CUDA가 없으면 JIT 로드를 끄므로 CPU용 fp32 encoder를 직접 로드
+        cosy.model.load_jit(os.path.join(model_path, 'flow.encoder.fp32.zip'))
+
+    elif backend == 'onnx_cpu':
+        cosy.model.flow.decoder.estimator = OnnxFlowEstimator(
+            os.path.join(model_path, 'flow.decoder.estimator.fp32.onnx'), num_threads=onnx_threads
+        )
+
+    logging.info(f"🚀 CosyVoice2 백엔드: {backend} ({check_backend(backend, model_path)[1]})")
+    return cosy, backend
+
+
+def inference_context(backend: str):
+    """
+    합성 호출을 감쌀 컨텍스트 (bf16은 호출 스레드에 autocast 적용)
+    스트리밍 추론의 LLM 토큰 생성 스레드에는 autocast가 적용되지 않으므로 flow/hift 단계만 bf16으로 실행됨
+    """
+    if backend == 'bf16':
+        return torch.autocast(device_type=_device_type(), dtype=torch.bfloat16)
+    return contextlib.nullcontext()
+
+
+def benchmark_backends(model_path: str, prompt_wav_path: str, prompt_text: str, text: str = BENCHMARK_TEXT,
+                       backends=None, repeats: int = 3, results_path: str = BENCHMARK_RESULTS_PATH) -> dict:
+    """
+    사용 가능한 백엔드별 실시간 계수(RTF = 처리 시간 / 생성 오디오 길이) 측정 후 JSON으로 저장
+
+    Returns:
+        {'device': ..., 'results': {backend: {...}}, 'fastest': backend}
+    """
+    from batch_cosy import load_wav_resample, postprocess
+
+    prompt_wav = postprocess(load_wav_resample(prompt_wav_path))
+    results = {}
+
+    for name in backends or TTS_BACKENDS:
+        ok, reason = check_backend(name, model_path)
+        if not ok:
+            logging.info(f"⏭️ {name}: 건너뜀 ({reason})")
+            results[name] = {'rtf': None, 'skipped': reason}
+            continue
+
+        cosy = None
+        try:
+            cosy, _ = load_cosyvoice(model_path, name)
+            with inference_context(name):
+                # 워밍업 1회 (그래프 최적화/캐시 초기화 시간 제외)
+                for _ in cosy.inference_zero_shot(text, prompt_text, prompt_wav, stream=False):
+                    pass
+
+                elapsed = 0.0
+                audio_sec = 0.0
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    for out in cosy.inference_zero_shot(text, prompt_text, prompt_wav, stream=False):
+                        audio_sec += out['tts_speech'].size(1) / cosy.sample_rate
+                    if torch.cuda.is_available():
+                        torch.cuda.synchronize()
+                    elapsed += time.perf_counter() - start
+
+            rtf = elapsed / audio_sec if audio_sec > 0 else None
+            results[name] = {'rtf': rtf, 'elapsed_sec': elapsed, 'audio_sec': audio_sec, 'repeats': repeats}
+            logging.info(f"⏱️ {name}: RTF {rtf:.3f} ({elapsed:.2f}s / 오디오 {audio_sec:.2f}s)")
+
+        except Exception as e:
+            logging.error(f"❌ {name} 벤치마크 실패: {e}")
+            results[name] = {'rtf': None, 'error': str(e)}
+
+        finally:
+            del cosy
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+    measured = {name: r['rtf'] for name, r in results.items() if r.get('rtf') is not None}
+    report = {
+        'device': _device_type(),
+        'torch_threads': torch.get_num_threads(),
+        'results': results,
+        'fastest': min(measured, key=measured.get) if measured else None,
+    }
+
+    with open(results_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    logging.info(f"✅ 벤치마크 결과 저장: {results_path} (가장 빠름: {report['fastest']})")
+    return report
+
+
+if __name__ == '__main__':
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    parser = argparse.ArgumentParser(description="CosyVoice2 백엔드별 RTF 벤치마크")
+    parser.add_argument('--model_path', default=os.path.join(repo_root, 'CosyVoice', 'pretrained_models',
+                                                             'CosyVoice2-0.5B'), help="CosyVoice2 모델 경로")
+    parser.add_argument('--prompt_wav', required=True, help="프롬프트 WAV 경로")
+    parser.add_argument('--prompt_text', required=True, help="프롬프트 WAV의 전사 텍스트")
+    parser.add_argument('--text', default=BENCHMARK_TEXT, help="합성할 텍스트")
+    parser.add_argument('--backends', nargs='+', choices=TTS_BACKENDS, default=None, help="측정할 백엔드 (기본: 전체)")
+    parser.add_argument('--repeats', type=int, default=3, help="백엔드별 반복 횟수")
+    parser.add_argument('--output', default=BENCHMARK_RESULTS_PATH, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    benchmark_backends(args.model_path, args.prompt_wav, args.prompt_text, args.text, args.backends, args.repeats,
+                       args.output)
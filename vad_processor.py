@@ -0,0 +1,151 @@
+import os
+import importlib.util
+import numpy as np
+from pydub import AudioSegment
+from utils import log_message
+from media_info import get_duration_ms
+
+# Silero VAD 프레임 설정 (16kHz, 512 샘플 = 32ms)
+VAD_SAMPLE_RATE = 16000
+VAD_WINDOW_SAMPLES = 512
+VAD_FRAME_MS = VAD_WINDOW_SAMPLES * 1000 // VAD_SAMPLE_RATE
+
+# 장시간 모드 청크 설정
+DEFAULT_CHUNK_TARGET_S = 120.0  # 청크 목표 길이 (무음 지점에서 자름)
+DEFAULT_CHUNK_MAX_S = 300.0  # 청크 최대 길이
+
+
+def silero_available() -> bool:
+    """silero-vad 패키지 사용 가능 여부"""
+    return importlib.util.find_spec('silero_vad') is not None
+
+
+def get_audio_duration_ms(audio_path: str) -> int:
+    """디코딩 없이 ffprobe로 오디오 길이(ms) 조회 (media_info 캐시 사용)"""
+    return get_duration_ms(audio_path)
+
+
+def load_vad_audio(audio_path: str):
+    """VAD/청크용 16kHz 모노 오디오 로드 (AudioSegment, float32 배열)"""
+    audio = AudioSegment.from_file(audio_path).set_frame_rate(VAD_SAMPLE_RATE).set_channels(1).set_sample_width(2)
+    samples = np.array(audio.get_array_of_samples(), dtype=np.float32) / 32768.0
+    return audio, samples
+
+
+def compute_speech_probabilities(samples: np.ndarray) -> np.ndarray:
+    """Silero VAD로 32ms 프레임별 음성 확률 계산"""
+    import torch
+    from silero_vad import load_silero_vad
+
+    model = load_silero_vad()
+    model.reset_states()
+
+    n_frames = int(np.ceil(len(samples) / VAD_WINDOW_SAMPLES))
+    padded = np.zeros(n_frames * VAD_WINDOW_SAMPLES, dtype=np.float32)
+    padded[:len(samples)] = samples
+
+    log_message(f"🎚️ Silero VAD 프레임 분석: {n_frames}개 프레임 ({len(samples) / VAD_SAMPLE_RATE:.0f}초)")
+    probs = np.zeros(n_frames, dtype=np.float32)
+    with torch.no_grad():
+        for i in range(n_frames):
+            window = torch.from_numpy(padded[i * VAD_WINDOW_SAMPLES:(i + 1) * VAD_WINDOW_SAMPLES])
+            probs[i] = model(window, VAD_SAMPLE_RATE).item()
+    return probs
+
+
+def probabilities_to_segments(probs: np.ndarray, vad_config, total_ms: int = None):
+    """
+    프레임별 음성 확률을 음성 구간으로 변환 (silero get_speech_timestamps와 같은 히스테리시스 규칙)
+
+    Returns:
+        [(start_ms, end_ms), ...]
+    """
+    threshold = vad_config['threshold']
+    neg_threshold = max(threshold - 0.15, 0.01)
+    min_speech_ms = vad_config['min_speech_duration_ms']
+    min_silence_ms = vad_config['min_silence_duration_ms']
+    max_speech_ms = vad_config['max_speech_duration_s'] * 1000
+    pad_ms = vad_config['speech_pad_ms']
+    if total_ms is None:
+        total_ms = len(probs) * VAD_FRAME_MS
+
+    segments = []
+    in_speech = False
+    start = 0
+    silence_start = None
+
+    for i, p in enumerate(probs):
+        t = i * VAD_FRAME_MS
+        if p >= threshold:
+            silence_start = None
+            if not in_speech:
+                in_speech = True
+                start = t
+            elif t - start >= max_speech_ms:
+                # 최대 길이 초과 시 강제 분할
+                segments.append((start, t))
+                start = t
+        elif in_speech and p < neg_threshold:
+            if silence_start is None:
+                silence_start = t
+            if t - silence_start >= min_silence_ms:
+                segments.append((start, silence_start))
+                in_speech = False
+                silence_start = None
+
+    if in_speech:
+        segments.append((start, total_ms))
+
+    # 최소 길이 필터 및 패딩 (이웃 구간과 겹치지 않게)
+    segments = [(s, e) for s, e in segments if e - s >= min_speech_ms]
+    padded = []
+    for idx, (s, e) in enumerate(segments):
+        prev_end = padded[-1][1] if padded else 0
+        next_start = segments[idx + 1][0] if idx + 1 < len(segments) else total_ms
+        padded.append((max(prev_end, s - pad_ms), min(next_start, e + pad_ms, total_ms)))
+    return padded
+
+
+def plan_chunks(speech_segments, total_ms: int, target_s: float = DEFAULT_CHUNK_TARGET_S,
+                max_s: float = DEFAULT_CHUNK_MAX_S):
+    """
+    음성 구간 사이의 무음 지점에서 잘라 독립적으로 전사할 청크 계획
+
+    Returns:
+        [(chunk_start_ms, chunk_end_ms), ...] 전체 타임라인을 빈틈없이 덮음
+    """
+    target_ms = target_s * 1000
+    max_ms = max_s * 1000
+
+    chunks = []
+    chunk_start = 0
+    for (_, end), (next_start, next_end) in zip(speech_segments, speech_segments[1:]):
+        # 현재 음성 구간 끝과 다음 구간 시작 사이 무음의 중앙에서 자름
+        cut = (end + next_start) // 2
+        if cut - chunk_start >= target_ms or next_end - chunk_start > max_ms:
+            chunks.append((chunk_start, cut))
+            chunk_start = cut
+
+    chunks.append((chunk_start, total_ms))
+    return chunks
+
+
+def get_speech_probabilities(audio_path: str, cache_path: str) -> np.ndarray:
+    """
+    프레임별 음성 확률을 .npy로 캐시 (원본보다 새 캐시가 있으면 VAD를 다시 돌리지 않음)
+    임계값/최소 길이/패딩을 바꿔도 probabilities_to_segments만 다시 호출하면 됨
+    """
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(audio_path):
+        try:
+            probs = np.load(cache_path)
+            log_message(f"♻️ VAD 확률 캐시 재사용: {cache_path} ({len(probs)}개 프레임)")
+            return probs
+        except Exception as e:
+            log_message(f"⚠️ VAD 확률 캐시 로드 실패: {e}")
+
+    _, samples = load_vad_audio(audio_path)
+    probs = compute_speech_probabilities(samples)
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    np.save(cache_path, probs)
+    log_message(f"💾 VAD 확률 캐시 저장: {cache_path}")
+    return probs
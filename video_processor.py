@@ -1,15 +1,30 @@
 import os
-import sys
 import shutil
 import subprocess
-from math import log10
-from pydub import AudioSegment
-from config import get_ffmpeg_path
+import numpy as np
+from config import get_ffmpeg_path, load_cache_config
 from utils import log_message, run_command_with_logging
+from separation_service import DEFAULT_SEPARATION_MODEL, DEFAULT_AGGRESSIVENESS, get_separation_service, \
+    release_separation_service, output_names
+from content_cache import ContentCache, hash_audio_stream, make_cache_key
+from music_detector import detect_music, write_passthrough_separation
+from audio_ingest import ingest_audio, StreamingResampler
+from encode_profiles import DEFAULT_MUX_PROFILE, audio_args, video_args
+from environment_probe import require_environment
 
 # 현재 디렉터리를 기준으로 repo_root 설정
 repo_root = os.path.dirname(__file__)
 
+REMIX_BLOCK_S = 5.0  # 보컬/배경음 합성 블록 길이 (초)
+
+# 오디오 스트림 언어 태그 (MKV/MP4는 ISO 639-2 사용)
+ISO_639_2 = {
+    'ko': 'kor',
+    'en': 'eng',
+    'zh': 'zho',
+    'ja': 'jpn',
+}
+
 
 def log_message(message, also_print=True):
     """로그 메시지 출력 - 메인 모듈에서 재정의됨"""
@@ -77,130 +92,41 @@ def extract_audio_from_video(video_path, output_audio_path):
         return False
 
 
-def separate_vocals_background(audio_path, output_dir):
-    """UVR5를 사용해 음성과 배경음을 분리"""
+def separate_vocals_background(audio_path, output_dir, keep_model=False, chunked='auto', chunk_s=60.0, workers=1,
+                               audio=None):
+    """
+    UVR5를 사용해 음성과 배경음을 분리 (상주 분리 서비스 사용)
+    keep_model=True이면 모델을 해제하지 않아 다음 파일에서 가중치 로드를 생략
+    chunked: True / False / 'auto' (긴 파일은 겹침 청크 단위로 분리하여 메모리 사용량 제한)
+    audio: audio_ingest.IngestedAudio - 주어지면 audio_path 파일 없이 파이프 디코딩 결과를 분리
+    """
     try:
-        # UVR5 경로 설정
-        uvr5_path = os.path.join(repo_root, 'GPT-SoVITS', 'tools', 'uvr5')
-        if not os.path.exists(uvr5_path):
-            log_message(f"❌ UVR5 경로를 찾을 수 없습니다: {uvr5_path}")
-            return None, None
-
         log_message(f"🎵 UVR5를 사용해 음성 분리 시작: {audio_path}")
 
-        # UVR5 모듈 경로를 sys.path에 추가
-        if uvr5_path not in sys.path:
-            sys.path.insert(0, uvr5_path)
-
-        # GPT-SoVITS tools 경로도 추가
-        tools_path = os.path.join(repo_root, 'GPT-SoVITS', 'tools')
-        if tools_path not in sys.path:
-            sys.path.insert(0, tools_path)
-
+        service = get_separation_service()
         try:
-            # UVR5 모듈들 import
-            from bsroformer import Roformer_Loader
-            from mdxnet import MDXNetDereverb
-            from vr import AudioPre, AudioPreDeEcho
-            import torch
-
-            # 디바이스 설정
-            device = torch.device('cpu')
-
-            if torch.cuda.is_available():
-                device = torch.device('cuda')
-            elif torch.backends.mps.is_available():
-                device = torch.device('mps')
-            elif torch.xpu.is_available():
-                device = torch.device('xpu')
-
-            is_half = False  # 안정성을 위해 False로 설정
-
-            # 모델명 설정 (기본적으로 HP2 사용 - 인성 보존에 좋음)
-            model_name = "HP2_all_vocals"
-            weight_uvr5_root = os.path.join(uvr5_path, "uvr5_weights")
-
-            # 출력 디렉토리 설정
-            vocals_dir = os.path.join(output_dir, "vocals")
-            background_dir = os.path.join(output_dir, "background")
-            os.makedirs(vocals_dir, exist_ok=True)
-            os.makedirs(background_dir, exist_ok=True)
-
-            # 파일명 설정
-            base_name = os.path.splitext(os.path.basename(audio_path))[0]
-
-            log_message(f"🔧 UVR5 설정: 모델={model_name}, 디바이스={device}")
-
-            # AudioPre 객체 생성
-            pre_fun = AudioPre(
-                agg=10,  # 인성 추출 강도
-                model_path=os.path.join(weight_uvr5_root, model_name + ".pth"),
-                device=device,
-                is_half=is_half,
-            )
-
-            # 음성 분리 실행
-            format0 = "wav"
-            is_hp3 = "HP3" in model_name
-
-            log_message("🎵 음성 분리 처리 중...")
-            pre_fun._path_audio_(audio_path, background_dir, vocals_dir, format0, is_hp3)
-
-            # 결과 파일 경로 찾기
-            vocals_path = None
-            background_path = None
-
-            # vocals 폴더에서 파일 찾기
-            if os.path.exists(vocals_dir):
-                for f in os.listdir(vocals_dir):
-                    if f.endswith('.wav') and base_name in f:
-                        vocals_path = os.path.join(vocals_dir, f)
-                        break
-
-            # background 폴더에서 파일 찾기  
-            if os.path.exists(background_dir):
-                for f in os.listdir(background_dir):
-                    if f.endswith('.wav') and base_name in f:
-                        background_path = os.path.join(background_dir, f)
-                        break
-
-            # 파일명이 예상과 다를 수 있으므로 대안적 방법으로 찾기
-            if not vocals_path or not background_path:
-                # vocals 폴더의 모든 wav 파일 중 가장 최근 파일
-                if os.path.exists(vocals_dir):
-                    wav_files = [f for f in os.listdir(vocals_dir) if f.endswith('.wav')]
-                    if wav_files:
-                        vocals_path = os.path.join(vocals_dir, wav_files[0])
-
-                # background 폴더의 모든 wav 파일 중 가장 최근 파일
-                if os.path.exists(background_dir):
-                    wav_files = [f for f in os.listdir(background_dir) if f.endswith('.wav')]
-                    if wav_files:
-                        background_path = os.path.join(background_dir, wav_files[0])
-
-            # 정리
-            del pre_fun.model
-            del pre_fun
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-
-            if vocals_path and background_path and os.path.exists(vocals_path) and os.path.exists(background_path):
-                log_message(f"✅ 음성 분리 완료:")
-                log_message(f"   🎤 보컬: {vocals_path}")
-                log_message(f"   🎵 배경음: {background_path}")
-                return vocals_path, background_path
-            else:
-                log_message("❌ 음성 분리 결과 파일을 찾을 수 없습니다")
-                log_message(
-                    f"   vocals_path: {vocals_path} (존재: {os.path.exists(vocals_path) if vocals_path else False})")
-                log_message(
-                    f"   background_path: {background_path} (존재: {os.path.exists(background_path) if background_path else False})")
-                return None, None
-
-        except ImportError as e:
-            log_message(f"❌ UVR5 모듈 import 실패: {e}")
+            vocals_path, background_path, _ = service.separate(audio_path, output_dir, chunked=chunked,
+                                                               chunk_s=chunk_s, workers=workers, audio=audio)
+        except (ImportError, FileNotFoundError) as e:
+            log_message(f"❌ UVR5 로드 실패: {e}")
             log_message("필요한 의존성이 설치되지 않았을 수 있습니다.")
             return None, None
+        finally:
+            if not keep_model:
+                release_separation_service()
+
+        if vocals_path and background_path and os.path.exists(vocals_path) and os.path.exists(background_path):
+            log_message(f"✅ 음성 분리 완료:")
+            log_message(f"   🎤 보컬: {vocals_path}")
+            log_message(f"   🎵 배경음: {background_path}")
+            return vocals_path, background_path
+        else:
+            log_message("❌ 음성 분리 결과 파일을 찾을 수 없습니다")
+            log_message(
+                f"   vocals_path: {vocals_path} (존재: {os.path.exists(vocals_path) if vocals_path else False})")
+            log_message(
+                f"   background_path: {background_path} (존재: {os.path.exists(background_path) if background_path else False})")
+            return None, None
 
     except Exception as e:
         log_message(f"음성 분리 오류: {e}")
@@ -209,55 +135,128 @@ def separate_vocals_background(audio_path, output_dir):
         return None, None
 
 
+class _RemixSource:
+    """
+    리믹스 입력을 블록 단위로 읽기 (전체를 메모리에 올리지 않음)
+    채널/샘플레이트를 출력 형식에 맞추고, 파일 끝 이후는 처음으로 돌아가 반복(loop)하거나 무음으로 채움
+    """
+
+    def __init__(self, path, out_sr, out_channels, loop, block_s=REMIX_BLOCK_S):
+        import soundfile as sf
+
+        self.file = sf.SoundFile(path)
+        self.out_channels = out_channels
+        self.loop = loop and self.file.frames > 0
+        self.block = max(1, int(block_s * self.file.samplerate))
+        self.resamplers = None
+        if self.file.samplerate != out_sr:
+            self.resamplers = [StreamingResampler(self.file.samplerate, out_sr) for _ in range(out_channels)]
+        self.buffer = np.zeros((0, out_channels), dtype=np.float32)
+        self.exhausted = False
+
+    def _read_native(self):
+        data = self.file.read(self.block, dtype='float32', always_2d=True)
+        if self.loop:
+            # 파일 끝에 닿으면 처음부터 이어 읽어 블록을 채움 (위치 계산만으로 반복)
+            parts = [data]
+            got = len(data)
+            while got < self.block:
+                self.file.seek(0)
+                more = self.file.read(self.block - got, dtype='float32', always_2d=True)
+                parts.append(more)
+                got += len(more)
+            data = np.concatenate(parts)
+        return data
+
+    def _match_channels(self, data):
+        if data.shape[1] == self.out_channels:
+            return data
+        mono = data.mean(axis=1, keepdims=True)
+        return np.repeat(mono, self.out_channels, axis=1)
+
+    def _resample(self, data, flush=False):
+        if self.resamplers is None:
+            return data
+        if flush:
+            columns = [r.flush() for r in self.resamplers]
+        else:
+            columns = [r.feed(data[:, c]) for c, r in enumerate(self.resamplers)]
+        return np.stack(columns, axis=1)
+
+    def read(self, n):
+        """정확히 n 프레임 (출력 형식) 반환"""
+        while len(self.buffer) < n and not self.exhausted:
+            data = self._read_native()
+            if len(data) == 0:
+                self.exhausted = True
+                if self.resamplers is None:
+                    break
+                converted = self._resample(None, flush=True)
+            else:
+                converted = self._resample(self._match_channels(data))
+            self.buffer = np.concatenate([self.buffer, converted])
+
+        out, self.buffer = self.buffer[:n], self.buffer[n:]
+        if len(out) < n:
+            out = np.concatenate([out, np.zeros((n - len(out), self.out_channels), dtype=np.float32)])
+        return out
+
+    def close(self):
+        self.file.close()
+
+
 def combine_processed_audio_with_background(vocals_path, background_path, output_path, vocals_volume=1.0,
-                                            background_volume=0.8):
-    """처리된 보컬과 원본 배경음을 합성"""
+                                            background_volume=0.8, block_s=REMIX_BLOCK_S):
+    """
+    처리된 보컬과 원본 배경음을 합성
+    두 파일을 블록 단위로 읽어 게인 적용 후 바로 WAV에 기록 (프로그램 전체 길이의 사본을 메모리에 두지 않음)
+    출력 길이는 더 긴 쪽에 맞춤: 보컬이 짧으면 무음, 배경음이 짧으면 반복
+    """
+    import soundfile as sf
+
+    vocals = background = None
     try:
         log_message(f"🎵 음성 합성 시작:")
         log_message(f"   🎤 보컬: {vocals_path}")
         log_message(f"   🎵 배경음: {background_path}")
 
-        # 오디오 로드
-        vocals = AudioSegment.from_file(vocals_path)
-        background = AudioSegment.from_file(background_path)
-
-        # 볼륨 조절
-        if vocals_volume != 1.0:
-            vocals = vocals + (20 * log10(vocals_volume))  # dB 변환
-        if background_volume != 1.0:
-            background = background + (20 * log10(background_volume))
-
-        # 길이 맞춤 (더 긴 쪽에 맞춤)
-        max_length = max(len(vocals), len(background))
-
-        if len(vocals) < max_length:
-            # 보컬이 짧으면 끝에 무음 추가
-            vocals = vocals + AudioSegment.silent(duration=max_length - len(vocals))
-        elif len(background) < max_length:
-            # 배경음이 짧으면 루프 또는 무음 추가
-            if len(background) > 0:
-                # 배경음을 루프해서 길이 맞춤
-                loops_needed = (max_length // len(background)) + 1
-                background = background * loops_needed
-                background = background[:max_length]
-            else:
-                background = AudioSegment.silent(duration=max_length)
+        vocals_info = sf.info(vocals_path)
+        background_info = sf.info(background_path)
+
+        # 출력 형식은 두 입력 중 높은 샘플레이트/많은 채널에 맞춤
+        out_sr = max(vocals_info.samplerate, background_info.samplerate)
+        out_channels = max(vocals_info.channels, background_info.channels)
+        total = max(-(-info.frames * out_sr // info.samplerate) for info in (vocals_info, background_info))
+
+        vocals = _RemixSource(vocals_path, out_sr, out_channels, loop=False, block_s=block_s)
+        background = _RemixSource(background_path, out_sr, out_channels, loop=True, block_s=block_s)
 
-        # 오디오 합성
-        combined = vocals.overlay(background)
+        block = max(1, int(block_s * out_sr))
+        with sf.SoundFile(output_path, 'w', out_sr, out_channels, subtype='PCM_16') as out:
+            for start in range(0, total, block):
+                n = min(block, total - start)
+                mixed = vocals.read(n) * vocals_volume + background.read(n) * background_volume
+                out.write(np.clip(mixed, -1.0, 1.0))
 
-        # 결과 저장
-        combined.export(output_path, format="wav")
         log_message(f"✅ 음성 합성 완료: {output_path}")
         return True
 
     except Exception as e:
         log_message(f"음성 합성 오류: {e}")
         return False
+    finally:
+        for source in (vocals, background):
+            if source is not None:
+                source.close()
 
 
-def combine_audio_with_video(video_path, audio_path, output_video_path):
-    """음성과 영상을 합쳐서 최종 영상 생성"""
+def language_tag(lang_code):
+    """ISO 639-1 언어 코드 → 컨테이너 오디오 스트림 태그용 ISO 639-2 코드"""
+    return ISO_639_2.get(lang_code, 'und')
+
+
+def combine_audio_with_video(video_path, audio_path, output_video_path, encode_profile=DEFAULT_MUX_PROFILE):
+    """음성과 영상을 합쳐서 최종 영상 생성 (encode_profile: encode_profiles.ENCODE_PROFILES의 프로필 이름)"""
     try:
         log_message(f"🎬 영상 합성 시작:")
         log_message(f"   📹 영상: {video_path}")
@@ -268,9 +267,8 @@ def combine_audio_with_video(video_path, audio_path, output_video_path):
             ffmpeg_path,
             '-i', video_path,  # 입력 영상
             '-i', audio_path,  # 입력 음성
-            '-c:v', 'copy',  # 비디오 코덱 복사 (re-encoding 안함)
-            '-c:a', 'aac',  # 오디오 코덱
-            '-b:a', '192k',  # 오디오 비트레이트
+            *video_args(encode_profile),  # 비디오 코덱 (기본: 복사, re-encoding 안함)
+            *audio_args(encode_profile),  # 오디오 코덱/비트레이트 (기본: AAC 192k)
             '-map', '0:v:0',  # 첫 번째 입력의 비디오 스트림
             '-map', '1:a:0',  # 두 번째 입력의 오디오 스트림
             '-shortest',  # 더 짧은 스트림에 맞춤
@@ -291,6 +289,60 @@ def combine_audio_with_video(video_path, audio_path, output_video_path):
         return False
 
 
+def mux_language_tracks(video_path, tracks, output_path, per_language_outputs=None,
+                        encode_profile=DEFAULT_MUX_PROFILE):
+    """
+    더빙된 모든 언어를 언어 태그가 붙은 개별 오디오 스트림으로 한 파일(MKV/MP4)에 묶음
+    언어별 단일 음성 영상도 같은 ffmpeg 실행에서 함께 출력 (원본 영상은 한 번만 읽음)
+
+    Args:
+        tracks: [(언어 코드, 오디오 경로, 트랙 제목), ...] - 첫 번째 트랙이 기본 재생 트랙
+        per_language_outputs: {언어 코드: 출력 경로} - 언어별 영상도 필요할 때 (선택)
+        encode_profile: encode_profiles.ENCODE_PROFILES의 프로필 이름
+
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        log_message(f"🎬 다국어 오디오 트랙 합성 시작: {len(tracks)}개 언어 → {output_path}")
+
+        cmd = [get_ffmpeg_path(), '-y', '-i', video_path]
+        for _, audio_path, _ in tracks:
+            cmd += ['-i', audio_path]
+
+        # 출력 1: 영상 + 모든 언어 오디오 스트림
+        cmd += ['-map', '0:v:0']
+        for idx in range(len(tracks)):
+            cmd += ['-map', f'{idx + 1}:a:0']
+        cmd += video_args(encode_profile) + audio_args(encode_profile)
+        for idx, (lang_code, _, title) in enumerate(tracks):
+            cmd += [f'-metadata:s:a:{idx}', f'language={language_tag(lang_code)}',
+                    f'-metadata:s:a:{idx}', f'title={title}',
+                    f'-disposition:a:{idx}', 'default' if idx == 0 else '0']
+        cmd += ['-shortest', output_path]
+
+        # 출력 2..N: 언어별 단일 오디오 영상
+        for idx, (lang_code, _, title) in enumerate(tracks):
+            if not per_language_outputs or lang_code not in per_language_outputs:
+                continue
+            cmd += ['-map', '0:v:0', '-map', f'{idx + 1}:a:0'] + video_args(encode_profile) + \
+                audio_args(encode_profile)
+            cmd += ['-metadata:s:a:0', f'language={language_tag(lang_code)}', '-metadata:s:a:0', f'title={title}',
+                    '-shortest', per_language_outputs[lang_code]]
+
+        return_code = run_command_with_logging(cmd, description="다국어 오디오 트랙 합성")
+        if return_code == 0:
+            log_message(f"✅ 다국어 오디오 트랙 합성 완료: {output_path}")
+            return True
+        else:
+            log_message(f"❌ 다국어 오디오 트랙 합성 실패: return code {return_code}")
+            return False
+
+    except Exception as e:
+        log_message(f"다국어 오디오 트랙 합성 오류: {e}")
+        return False
+
+
 def is_video_file(file_path):
     """파일이 영상 파일인지 확인"""
     video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v']
@@ -303,26 +355,116 @@ def is_audio_file(file_path):
     return os.path.splitext(file_path.lower())[1] in audio_extensions
 
 
-def process_video_file(input_video_path, output_dir):
+def _separation_cache_key(input_video_path, separation_options):
+    """
+    분리 캐시 키: (오디오 스트림 해시, 분리 입력 형식, 분리 모델/강도, 청크 옵션)
+    WAV 추출과 파이프 디코딩은 같은 PCM을 만들므로 디코딩 방식은 키에 넣지 않음
+    """
+    options = separation_options or {}
+    return make_cache_key(
+        hash_audio_stream(input_video_path), 'pcm_s16le/44100/2', DEFAULT_SEPARATION_MODEL,
+        DEFAULT_AGGRESSIVENESS, options.get('chunked', 'auto'), options.get('chunk_s', 60.0)
+    )
+
+
+def _restore_cached_separation(cached, extracted_audio_path, separation_dir):
+    """캐시된 보컬/배경음을 UVR5 출력 이름 규칙대로 분리 폴더에 복사"""
+    vocals_name, background_name = output_names(extracted_audio_path)
+    vocals_path = os.path.join(separation_dir, 'vocals', vocals_name)
+    background_path = os.path.join(separation_dir, 'background', background_name)
+    for src, dst in ((cached['vocals.wav'], vocals_path), (cached['background.wav'], background_path)):
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.copy2(src, dst)
+    return vocals_path, background_path
+
+
+def process_video_file(input_video_path, output_dir, keep_separation_model=False, separation_options=None,
+                       use_cache=None, detect_music_first=True, ingest='pipe'):
     """
     영상 파일을 처리하여 음성 추출 및 보컬 분리 수행
+    keep_separation_model: True이면 UVR5 모델을 상주시켜 다음 영상에서 재사용
+    separation_options: separate_vocals_background에 전달할 청크 분리 옵션 (chunked, chunk_s, workers)
+    use_cache: 분리 결과 캐시 사용 여부 (None이면 cache_config.json의 enable_separation_cache)
+    detect_music_first: True이면 먼저 배경음악 유무를 빠르게 판정하여 음성만 있는 입력은 UVR5 분리를 생략
+    ingest: 'pipe' - ffmpeg 파이프로 한 번 디코딩 (기본값)
+                     44.1kHz 스테레오는 임시 PCM(memmap)에서 창 단위로 분리하고 처리 후 삭제,
+                     같은 디코딩에서 만든 16kHz 모노 WAV(<이름>_16k.wav)는 음악 감지와 분리 생략 시 VAD/STT 입력으로 사용
+            'wav' - 44.1kHz 스테레오 WAV로 추출한 뒤 파일에서 읽음
     
     Returns:
         tuple: (extracted_audio_path, vocals_path, background_path, original_video_path)
+        파이프 디코딩 시 extracted_audio_path는 16kHz 모노 WAV, 캐시 적중 시 추출 파일이 없으면 None
     """
     try:
         base_name = os.path.splitext(os.path.basename(input_video_path))[0]
-
-        # 음성 추출
         extracted_audio_path = os.path.join(output_dir, f"{base_name}_extracted.wav")
-        if not extract_audio_from_video(input_video_path, extracted_audio_path):
-            return None, None, None, input_video_path
-
-        # 보컬/배경음 분리
+        asr_audio_path = os.path.join(output_dir, f"{base_name}_16k.wav")
         separation_dir = os.path.join(output_dir, "separation")
         os.makedirs(separation_dir, exist_ok=True)
 
-        vocals_path, background_path = separate_vocals_background(extracted_audio_path, separation_dir)
+        # 같은 오디오 스트림을 같은 설정으로 분리한 적이 있으면 추출/분리 모두 생략
+        cache, cache_key = None, None
+        if use_cache is None:
+            use_cache = load_cache_config()['enable_separation_cache']
+        if use_cache:
+            try:
+                cache = ContentCache('separation')
+                cache_key = _separation_cache_key(input_video_path, separation_options)
+                cached = cache.get(cache_key)
+            except Exception as e:
+                log_message(f"⚠️ 분리 캐시 사용 불가 ({e}) - 캐시 없이 진행")
+                cache, cached = None, None
+
+            if cached is not None:
+                vocals_path, background_path = _restore_cached_separation(cached, extracted_audio_path,
+                                                                          separation_dir)
+                log_message(f"♻️ 분리 캐시 적중 - 음성 추출/UVR5 분리 건너뜀 ({cache_key[:12]})")
+                log_message(f"   🎤 보컬: {vocals_path}")
+                log_message(f"   🎵 배경음: {background_path}")
+                existing_audio = extracted_audio_path if os.path.exists(extracted_audio_path) else None
+                return existing_audio, vocals_path, background_path, input_video_path
+
+        # 음성 추출 (파이프 디코딩: 분리용 임시 PCM(memmap) + 16kHz 모노 WAV를 한 번에 생성, 실패 시 WAV 추출)
+        audio = None
+        if ingest == 'pipe':
+            try:
+                audio = ingest_audio(input_video_path, asr_path=asr_audio_path)
+            except Exception as e:
+                log_message(f"⚠️ 파이프 디코딩 실패 ({e}) - WAV 추출로 진행")
+        if audio is None and not extract_audio_from_video(input_video_path, extracted_audio_path):
+            return None, None, None, input_video_path
+        # 음악 감지/분리 생략 시 보컬로 쓸 파일 (파이프 디코딩이면 이미 VAD/STT 형식인 16kHz 모노)
+        analysis_path = audio.asr_path if audio is not None else extracted_audio_path
+
+        try:
+            # 음성만 있는 입력(강의/팟캐스트 등)은 분리 생략: 원본을 보컬로, 무음을 배경음으로 사용
+            if detect_music_first:
+                decision = detect_music(analysis_path, os.path.join(separation_dir, 'music_detection.json'))
+                if not decision['needs_separation']:
+                    vocals_name, background_name = output_names(extracted_audio_path)
+                    vocals_path, background_path = write_passthrough_separation(
+                        analysis_path, os.path.join(separation_dir, 'vocals', vocals_name),
+                        os.path.join(separation_dir, 'background', background_name))
+                    log_message("⏭️ UVR5 분리 생략 (음성만 있는 입력)")
+                    return analysis_path, vocals_path, background_path, input_video_path
+
+            # 보컬/배경음 분리 (음악 감지/캐시로 생략될 수 있어 시작 시점이 아니라 여기서 UVR5 환경 확인)
+            require_environment(['separation'])
+            vocals_path, background_path = separate_vocals_background(extracted_audio_path, separation_dir,
+                                                                      keep_model=keep_separation_model,
+                                                                      audio=audio, **(separation_options or {}))
+        finally:
+            if audio is not None:
+                audio.close()
+        extracted_audio_path = analysis_path
+
+        if vocals_path and background_path and cache is not None:
+            try:
+                cache.put(cache_key, {'vocals.wav': vocals_path, 'background.wav': background_path},
+                          meta={'source': input_video_path})
+                log_message(f"💾 분리 결과 캐시 저장 ({cache_key[:12]})")
+            except Exception as e:
+                log_message(f"⚠️ 분리 캐시 저장 실패: {e}")
 
         if vocals_path and background_path:
             log_message(f"✅ 영상 처리 완료:")
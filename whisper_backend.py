@@ -0,0 +1,256 @@
+import os
+import math
+import threading
+from config import get_model_path, resource_path
+from utils import log_message
+
+# STT 백엔드
+# - inprocess: pywhispercpp 바인딩으로 모델을 프로세스에 상주시켜 재사용
+# - cli: whisper-cli 서브프로세스 (파일마다 모델 재로드)
+# - auto: 바인딩을 쓸 수 있으면 inprocess, 아니면 cli
+STT_BACKENDS = ('auto', 'inprocess', 'cli')
+DEFAULT_STT_BACKEND = 'auto'
+
+VAD_MODEL_RELATIVE_PATH = 'whisper.cpp/models/ggml-silero-v5.1.2.bin'
+
+# whisper_vad_params 필드 ↔ vad_config 키
+_VAD_PARAM_KEYS = (
+    'threshold',
+    'min_speech_duration_ms',
+    'min_silence_duration_ms',
+    'max_speech_duration_s',
+    'speech_pad_ms',
+)
+
+_model_lock = threading.Lock()
+_resident_model = None
+_resident_key = None
+
+
+def pywhispercpp_available() -> bool:
+    """pywhispercpp가 설치되어 있고 VAD 파라미터를 지원하는지 확인"""
+    try:
+        from pywhispercpp.constants import PARAMS_SCHEMA
+    except ImportError:
+        return False
+    return 'vad' in PARAMS_SCHEMA and 'vad_model_path' in PARAMS_SCHEMA
+
+
+def select_stt_backend(backend: str = DEFAULT_STT_BACKEND) -> str:
+    """요청된 백엔드를 실제 사용할 백엔드('inprocess' 또는 'cli')로 확정"""
+    backend = (backend or DEFAULT_STT_BACKEND).lower()
+    if backend == 'cli':
+        return 'cli'
+
+    if pywhispercpp_available():
+        return 'inprocess'
+
+    if backend == 'inprocess':
+        log_message("⚠️ pywhispercpp(VAD 지원 버전)를 찾을 수 없음 - whisper-cli 사용")
+    return 'cli'
+
+
+def _apply_vad_params(model, vad_config):
+    """상주 모델의 VAD 파라미터를 vad_config 값으로 설정"""
+    vad_params = model._params.vad_params
+    for key in _VAD_PARAM_KEYS:
+        setattr(vad_params, key, vad_config[key])
+    # pybind 구조체는 값 복사이므로 다시 대입해야 반영됨
+    model._params.vad_params = vad_params
+
+
+def get_resident_model(vad_config, language: str = 'ko'):
+    """
+    상주 whisper 모델 반환 (모델 경로가 같으면 재사용, VAD 설정은 호출마다 갱신)
+    언어는 transcribe 호출마다 지정하므로 언어가 바뀌어도 모델을 다시 로드하지 않음
+
+    Returns:
+        pywhispercpp Model 또는 None (로드 실패)
+    """
+    global _resident_model, _resident_key
+
+    model_path, is_coreml = get_model_path()
+    key = model_path
+
+    if _resident_model is not None and _resident_key == key:
+        _apply_vad_params(_resident_model, vad_config)
+        return _resident_model
+
+    try:
+        from pywhispercpp.model import Model
+
+        release_resident_model()
+        log_message(f'🧠 whisper 모델 상주 로드: {model_path} (CoreML: {is_coreml})')
+        _resident_model = Model(
+            model_path,
+            language=language,
+            print_progress=False,
+            print_realtime=False,
+            token_timestamps=True,
+            vad=True,
+            vad_model_path=resource_path(VAD_MODEL_RELATIVE_PATH),
+        )
+        _resident_key = key
+        _apply_vad_params(_resident_model, vad_config)
+        return _resident_model
+
+    except Exception as e:
+        log_message(f'❌ whisper 모델 상주 로드 실패: {e}')
+        _resident_model = None
+        _resident_key = None
+        return None
+
+
+def preload_resident_model(vad_config, language: str = 'ko') -> bool:
+    """상주 모델을 미리 로드 (첫 전사 호출의 모델 로드 지연 방지), 로드 성공 여부 반환"""
+    with _model_lock:
+        return get_resident_model(vad_config, language) is not None
+
+
+def release_resident_model():
+    """상주 whisper 모델 해제"""
+    global _resident_model, _resident_key
+    if _resident_model is not None:
+        _resident_model = None
+        _resident_key = None
+        log_message('🧹 상주 whisper 모델 해제')
+
+
+def transcribe_segments(input_file, vad_config, language: str = 'ko', n_processors: int = 1):
+    """
+    상주 모델로 파일을 전사하여 타임스탬프 세그먼트 반환
+    n_processors > 1이면 whisper_full_parallel로 디코더 상태를 나눠 병렬 처리
+
+    Returns:
+        [{'start_ms', 'end_ms', 'text', 'words'}, ...] 또는 None (실패 시 CLI로 대체하도록)
+    """
+    with _model_lock:
+        model = get_resident_model(vad_config, language)
+        if model is None:
+            return None
+
+        try:
+            log_message(f'🎙️ whisper 전사 (in-process): {os.path.basename(input_file)}')
+            if n_processors > 1:
+                results = model.transcribe(input_file, n_processors=n_processors, language=language)
+            else:
+                results = model.transcribe(input_file, language=language)
+        except Exception as e:
+            log_message(f'❌ whisper 전사 실패 (in-process): {e}')
+            return None
+
+        # pywhispercpp의 t0/t1은 10ms 단위
+        segments = []
+        for i, seg in enumerate(results):
+            tokens = _segment_tokens(model, i)
+            segments.append({
+                'start_ms': int(seg.t0) * 10,
+                'end_ms': int(seg.t1) * 10,
+                'text': seg.text.strip(),
+                'words': tokens_to_words(tokens, int(seg.t0) * 10, int(seg.t1) * 10),
+                **segment_confidence(tokens, _segment_no_speech_prob(model, i)),
+            })
+
+    log_message(f'✅ 전사 완료: {len(segments)}개 세그먼트')
+    return segments
+
+
+def detect_language(audio_path, vad_config):
+    """
+    상주 모델로 언어 식별만 수행
+
+    Returns:
+        (언어 코드, 확률) 또는 (None, None)
+    """
+    with _model_lock:
+        model = get_resident_model(vad_config)
+        if model is None:
+            return None, None
+        try:
+            (language, prob), _ = model.auto_detect_language(audio_path)
+            return language, float(prob)
+        except Exception as e:
+            log_message(f'⚠️ 언어 식별 실패 (in-process): {e}')
+            return None, None
+
+
+def _segment_tokens(model, segment_index):
+    """상주 모델 컨텍스트에서 세그먼트의 토큰(텍스트, 시간, 확률) 조회 (바인딩이 지원하지 않으면 빈 목록)"""
+    try:
+        import _pywhispercpp as pw
+
+        tokens = []
+        for j in range(pw.whisper_full_n_tokens(model._ctx, segment_index)):
+            data = pw.whisper_full_get_token_data(model._ctx, segment_index, j)
+            tokens.append({
+                'text': pw.whisper_full_get_token_text(model._ctx, segment_index, j),
+                'start_ms': int(data.t0) * 10,
+                'end_ms': int(data.t1) * 10,
+                'p': float(data.p),
+            })
+        return tokens
+    except Exception:
+        return []
+
+
+def _segment_no_speech_prob(model, segment_index):
+    """세그먼트 무음 확률 (바인딩이 지원하지 않으면 None)"""
+    try:
+        import _pywhispercpp as pw
+        return float(pw.whisper_full_get_segment_no_speech_prob(model._ctx, segment_index))
+    except Exception:
+        return None
+
+
+def segment_confidence(tokens, no_speech_prob=None):
+    """
+    세그먼트 신뢰도: 텍스트 토큰 확률의 평균 로그 확률과 무음 확률
+
+    Returns:
+        {'avg_logprob': float 또는 None, 'no_speech_prob': float 또는 None}
+    """
+    probs = [t['p'] for t in tokens if t['text'] and not t['text'].startswith('[_') and not t['text'].startswith('<|')]
+    avg_logprob = round(sum(math.log(max(p, 1e-10)) for p in probs) / len(probs), 4) if probs else None
+    return {
+        'avg_logprob': avg_logprob,
+        'no_speech_prob': round(no_speech_prob, 4) if no_speech_prob is not None else None,
+    }
+
+
+def tokens_to_words(tokens, segment_start_ms=None, segment_end_ms=None):
+    """
+    whisper 토큰을 단어 단위로 묶기 (공백으로 시작하는 토큰이 새 단어, 특수 토큰 제외)
+    VAD 사용 시 토큰 시간은 원본 타임라인으로 보정되지 않으므로 세그먼트 구간 밖이면 세그먼트 시작 기준으로 이동
+
+    Returns:
+        [{'start_ms', 'end_ms', 'text', 'p'}, ...] (p는 단어를 이루는 토큰 확률의 평균)
+    """
+    words = []
+    for token in tokens:
+        text = token['text']
+        if not text or text.startswith('[_') or text.startswith('<|'):
+            continue
+
+        if not words or text.startswith(' '):
+            words.append({'start_ms': token['start_ms'], 'end_ms': token['end_ms'], 'text': text.strip(),
+                          'probs': [token['p']]})
+        else:
+            words[-1]['text'] += text
+            words[-1]['end_ms'] = token['end_ms']
+            words[-1]['probs'].append(token['p'])
+
+    words = [w for w in words if w['text']]
+    shift = 0
+    if words and segment_start_ms is not None and segment_end_ms is not None:
+        if words[0]['start_ms'] < segment_start_ms or words[-1]['end_ms'] > segment_end_ms:
+            shift = segment_start_ms - words[0]['start_ms']
+
+    def _fit(t):
+        t += shift
+        return min(t, segment_end_ms) if segment_end_ms is not None else t
+
+    return [
+        {'start_ms': _fit(w['start_ms']), 'end_ms': _fit(w['end_ms']), 'text': w['text'],
+         'p': round(sum(w['probs']) / len(w['probs']), 4)}
+        for w in words
+    ]
@@ -1,10 +1,31 @@
 import os
+import re
+import json
+import time
 import shutil
+import subprocess
 import gc  # 메모리 정리를 위한 가비지 컬렉션
-from config import get_whisper_cli_path, get_model_path, resource_path, load_vad_config, IS_MACOS
-from utils import log_message, run_command_with_logging
-from audio_processor import split_audio_by_srt, parse_srt_segments
+from concurrent.futures import ThreadPoolExecutor
+from config import get_whisper_cli_path, get_ffmpeg_path, get_model_path, resource_path, load_vad_config, IS_MACOS
+from utils import log_message, run_command_with_logging, is_audio_file
+from audio_processor import split_audio_by_srt, parse_srt_segments, split_audio_by_segments, write_srt_file, \
+    write_txt_file, write_transcript_json, load_transcript_json, derive_segment_texts
+from vad_processor import DEFAULT_CHUNK_TARGET_S, silero_available, load_vad_audio, compute_speech_probabilities, \
+    probabilities_to_segments, plan_chunks, get_speech_probabilities, get_audio_duration_ms
+from whisper_backend import DEFAULT_STT_BACKEND, STT_BACKENDS, VAD_MODEL_RELATIVE_PATH, select_stt_backend, \
+    transcribe_segments, tokens_to_words, segment_confidence, detect_language
 from batch_translate import batch_translate, SUPPORTED_LANGUAGES
+from content_cache import ContentCache, hash_pcm, hash_file, make_cache_key
+
+# 구조화 전사 결과 파일 (세그먼트/단어/타임스탬프/신뢰도)
+TRANSCRIPT_JSON = 'transcript.json'
+
+# 원본 언어 감지에 사용할 샘플 길이 (초)
+LANGUAGE_SAMPLE_S = 30
+
+# whisper-cli 한 번 실행에 넘길 '-f' 파일 수/명령줄 길이 상한 (Windows 명령줄 제한 32767자 이내)
+CLI_MAX_FILES_PER_CALL = 200
+CLI_MAX_ARGV_CHARS = 24000
 
 
 def cleanup_whisper_memory():
@@ -28,8 +49,147 @@ def cleanup_whisper_memory():
     log_message("✅ Whisper 메모리 정리 완료")
 
 
-def generate_srt_only(input_file):
-    """SRT 파일만 생성하는 함수"""
+def whisper_vad_args(vad_config):
+    """whisper-cli VAD 옵션 목록"""
+    return [
+        '--vad',
+        '--vad-model', resource_path(VAD_MODEL_RELATIVE_PATH),
+        '--vad-threshold', str(vad_config['threshold']),
+        '--vad-min-speech-duration-ms', str(vad_config['min_speech_duration_ms']),
+        '--vad-min-silence-duration-ms', str(vad_config['min_silence_duration_ms']),
+        '--vad-max-speech-duration-s', str(vad_config['max_speech_duration_s']),
+        '--vad-speech-pad-ms', str(vad_config['speech_pad_ms']),
+    ]
+
+
+def save_transcript(transcript, input_file, out, write_txt=True, language='ko'):
+    """
+    전사 결과를 whisper-cli와 같은 이름의 SRT/TXT와 구조화 JSON(transcript.json)으로 저장
+    (whisper-cli 출력 이름 규칙: <입력 파일명(확장자 포함)>.srt / .txt)
+    """
+    output_base = os.path.join(out, os.path.basename(input_file))
+    write_srt_file(transcript, output_base + '.srt')
+    if write_txt:
+        write_txt_file(transcript, output_base + '.txt')
+    write_transcript_json(transcript, os.path.join(out, TRANSCRIPT_JSON), source=input_file, language=language)
+
+
+def parse_whisper_full_json(json_path, offset_ms=0):
+    """
+    whisper-cli -ojf 출력(JSON full)을 구조화 전사 결과로 변환
+
+    Returns:
+        [{'start_ms', 'end_ms', 'text', 'words': [{'start_ms', 'end_ms', 'text', 'p'}]}, ...] 또는 None
+    """
+    try:
+        with open(json_path, 'r', encoding='utf-8', errors='replace') as f:
+            data = json.load(f)
+    except Exception as e:
+        log_message(f'⚠️ whisper JSON 읽기 오류: {e}')
+        return None
+
+    transcript = []
+    for seg in data.get('transcription', []):
+        start_ms = seg['offsets']['from'] + offset_ms
+        end_ms = seg['offsets']['to'] + offset_ms
+        tokens = [
+            {'text': t.get('text', ''), 'start_ms': t['offsets']['from'] + offset_ms,
+             'end_ms': t['offsets']['to'] + offset_ms, 'p': t.get('p', 0.0)}
+            for t in seg.get('tokens', [])
+        ]
+        transcript.append({
+            'start_ms': start_ms,
+            'end_ms': end_ms,
+            'text': seg.get('text', '').strip(),
+            'words': tokens_to_words(tokens, start_ms, end_ms),
+            **segment_confidence(tokens, seg.get('no_speech_prob')),
+        })
+    return transcript
+
+
+def transcribe_in_process(input_file, out, vad_config, write_txt=True, n_processors=1, language='ko'):
+    """
+    상주 whisper 모델로 전사하여 SRT/TXT/transcript.json을 출력 디렉토리에 바로 저장
+
+    Returns:
+        [{'start_ms', 'end_ms', 'text', 'words'}, ...] 또는 None (CLI로 대체 필요)
+    """
+    transcript = transcribe_segments(input_file, vad_config, language=language, n_processors=n_processors)
+    if transcript is None:
+        return None
+
+    save_transcript(transcript, input_file, out, write_txt=write_txt, language=language)
+    return transcript
+
+
+def _detect_language_cli(sample_path):
+    """whisper-cli 언어 식별만 실행 (-l auto -dl) 후 결과 파싱"""
+    model_path, _ = get_model_path()
+    cmd = [get_whisper_cli_path(), '-m', model_path, '-l', 'auto', '--detect-language', '-f', sample_path]
+    result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    match = re.search(r"auto-detected language:\s*(\w+)\s*\(p\s*=\s*([\d.]+)\)", result.stdout + result.stderr)
+    if not match:
+        return None, None
+    return match.group(1), float(match.group(2))
+
+
+def detect_source_language(input_file, backend=DEFAULT_STT_BACKEND, sample_s=LANGUAGE_SAMPLE_S):
+    """
+    원본 음성 언어 자동 감지 (파일당 한 번, 짧은 샘플로 whisper 언어 식별 실행)
+    결과는 출력 디렉토리에 원본 크기/수정 시각과 함께 저장하여 재실행 시 재사용
+    이후 전사(청크 병렬 포함)는 감지된 언어를 명시하므로 언어 식별이 청크마다 반복되지 않음
+
+    Returns:
+        ISO 639-1 언어 코드 (감지 실패 시 'ko')
+    """
+    base = os.path.splitext(os.path.basename(input_file))[0]
+    out = os.path.join(os.getcwd(), 'split_audio', base)
+    os.makedirs(out, exist_ok=True)
+
+    cache_path = os.path.join(out, 'source_language.json')
+    source_stat = [os.path.getsize(input_file), os.path.getmtime(input_file)]
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('source') == source_stat:
+                log_message(f"♻️ 원본 언어 캐시 재사용: {data['language']}")
+                return data['language']
+        except Exception as e:
+            log_message(f'⚠️ 원본 언어 캐시 로드 실패: {e}')
+
+    # 앞부분 인트로/무음을 피해 전체 길이의 10% 지점(최대 60초)부터 샘플 추출
+    total_ms = get_audio_duration_ms(input_file)
+    offset_ms = min(total_ms // 10, 60000)
+    sample_path = os.path.join(out, 'language_sample.wav')
+    # 전체를 디코딩하지 않고 ffmpeg 입력 탐색(-ss)으로 샘플 구간만 16kHz 모노로 추출
+    cmd = [get_ffmpeg_path(), '-v', 'error', '-y', '-ss', f'{offset_ms / 1000:.3f}', '-t', str(sample_s),
+           '-i', input_file, '-map', '0:a:0', '-vn', '-ar', '16000', '-ac', '1', '-c:a', 'pcm_s16le', sample_path]
+    result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    if result.returncode != 0 or not os.path.exists(sample_path):
+        log_message(f"⚠️ 언어 감지용 샘플 추출 실패 (return code: {result.returncode}): {result.stderr.strip()} "
+                    f"- 한국어(ko)로 진행")
+        return 'ko'
+
+    language, prob = None, None
+    if select_stt_backend(backend) == 'inprocess':
+        language, prob = detect_language(sample_path, load_vad_config())
+    if language is None:
+        language, prob = _detect_language_cli(sample_path)
+    os.remove(sample_path)
+
+    if language is None:
+        log_message("⚠️ 원본 언어 감지 실패 - 한국어(ko)로 진행")
+        return 'ko'
+
+    log_message(f"🌐 원본 언어 감지: {language} (p={prob:.2f})")
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump({'source': source_stat, 'language': language, 'probability': prob}, f, indent=2)
+    return language
+
+
+def generate_srt_only(input_file, backend=DEFAULT_STT_BACKEND, language=None):
+    """SRT 파일만 생성하는 함수 (language가 None이면 원본 언어 자동 감지)"""
     base = os.path.splitext(os.path.basename(input_file))[0]
     out = os.path.join(os.getcwd(), 'split_audio', base)
     os.makedirs(out, exist_ok=True)
@@ -39,23 +199,25 @@ def generate_srt_only(input_file):
     def srt_worker():
         try:
             log_message('== SRT 전용 생성 시작 ==')
+            source_language = language or detect_source_language(input_file, backend=backend)
+            if select_stt_backend(backend) == 'inprocess':
+                if transcribe_in_process(input_file, out, vad_config, write_txt=False,
+                                         language=source_language) is not None:
+                    log_message('== SRT 전용 생성 완료 ==')
+                    return
+                log_message('⚠️ in-process 전사 실패 - whisper-cli로 재시도')
+
             model_path, is_coreml = get_model_path()
             log_message(f'사용 모델: {model_path} (CoreML: {is_coreml})')
 
             whisper_cli = get_whisper_cli_path()
             whisper_cmd = [
                 whisper_cli,
-                '--vad',
-                '--vad-model', resource_path('whisper.cpp/models/ggml-silero-v5.1.2.bin'),
-                '--vad-threshold', str(vad_config['threshold']),
-                '--vad-min-speech-duration-ms', str(vad_config['min_speech_duration_ms']),
-                '--vad-min-silence-duration-ms', str(vad_config['min_silence_duration_ms']),
-                '--vad-max-speech-duration-s', str(vad_config['max_speech_duration_s']),
-                '--vad-speech-pad-ms', str(vad_config['speech_pad_ms']),
+                *whisper_vad_args(vad_config),
                 '-f', input_file,
                 '-m', model_path,
                 '--output-srt',
-                '--language', 'ko',
+                '--language', source_language,
             ]
 
             run_command_with_logging(whisper_cmd, cwd=os.path.dirname(input_file),
@@ -86,23 +248,68 @@ def generate_srt_only(input_file):
     return srt_worker
 
 
-def run_whisper_directory(output_dir: str, translation_settings=None):
+def source_text_dir(output_dir, language='ko'):
+    """세그먼트별 원본 언어 텍스트 폴더 (<출력>/txt/<언어 코드>, 파일명은 <세그먼트>.<언어 코드>.txt)"""
+    return os.path.join(output_dir, 'txt', language)
+
+
+def write_segment_texts_from_transcript(output_dir, transcript, segments=None, language='ko'):
+    """
+    구조화 전사 결과에서 세그먼트별 원본 언어 텍스트 파일 생성 (ASR 재실행 없음)
+    segments를 주면(화자 기반 재분할 등) 단어 타임스탬프로 분할 세그먼트에 텍스트를 배정
+    """
+    base = os.path.basename(output_dir)
+    text_folder = source_text_dir(output_dir, language)
+    wav_folder = os.path.join(output_dir, 'wav')
+    os.makedirs(text_folder, exist_ok=True)
+
+    if segments is None:
+        texts = [seg['text'] for seg in transcript]
+    else:
+        texts = derive_segment_texts(transcript, segments)
+
+    # 분할 파일 이름은 세그먼트 번호와 1:1 대응 ({base}_{idx:03d}.wav)
+    for idx, text_content in enumerate(texts, 1):
+        name = f"{base}_{idx:03d}"
+        if not os.path.exists(os.path.join(wav_folder, f"{name}.wav")):
+            continue
+        with open(os.path.join(text_folder, f"{name}.{language}.txt"), 'w', encoding='utf-8') as f:
+            f.write(text_content)
+        if text_content:
+            log_message(f"원본 텍스트 저장: {name}.{language}.txt")
+
+
+def run_whisper_directory(output_dir: str, translation_settings=None, segments=None):
     """개별 세그먼트 텍스트 처리 (이미 전체 처리에서 생성됨 - 건너뛰기)"""
     log_message("🚀 개별 세그먼트 텍스트는 이미 생성됨 - 번역 단계로 진행")
 
+    if translation_settings is None:
+        translation_settings = {
+            'translation_length': 0.8,
+            'quality_mode': 'balanced',
+            'selected_languages': ['english']
+        }
+    source_language = translation_settings.get('source_language', 'ko')
+
     base = os.path.basename(output_dir)
     txt_root = os.path.join(output_dir, 'txt')
-    ko_folder = os.path.join(txt_root, 'ko')
-    os.makedirs(ko_folder, exist_ok=True)
+    text_folder = source_text_dir(output_dir, source_language)
+    os.makedirs(text_folder, exist_ok=True)
+
+    # 구조화 전사 결과가 있으면 타임스탬프 기준으로 세그먼트 텍스트 생성
+    transcript = load_transcript_json(os.path.join(output_dir, TRANSCRIPT_JSON))
 
-    # 기존에 생성된 TXT 파일을 ko 폴더로 정리
+    # 기존에 생성된 TXT 파일을 원본 언어 폴더로 정리
     txt_file = None
     for f in os.listdir(output_dir):
         if f.lower().endswith('.txt'):
             txt_file = os.path.join(output_dir, f)
             break
 
-    if txt_file and os.path.exists(txt_file):
+    if transcript is not None:
+        log_message(f"📝 전사 JSON 기반 세그먼트 텍스트 생성: {len(transcript)}개 전사 세그먼트")
+        write_segment_texts_from_transcript(output_dir, transcript, segments, source_language)
+    elif txt_file and os.path.exists(txt_file):
         # 전체 텍스트 파일을 읽어서 세그먼트별로 분할
         with open(txt_file, 'r', encoding='utf-8') as f:
             content = f.read().strip()
@@ -117,41 +324,35 @@ def run_whisper_directory(output_dir: str, translation_settings=None):
         # 각 세그먼트에 대응하는 텍스트 생성
         for i, wav_file in enumerate(wav_files):
             name = os.path.splitext(wav_file)[0]
-            ko_file = os.path.join(ko_folder, f"{name}.ko.txt")
+            text_file = os.path.join(text_folder, f"{name}.{source_language}.txt")
 
             # 대응하는 텍스트 라인이 있으면 사용, 없으면 빈 문자열
             text_content = lines[i] if i < len(lines) else ""
 
-            with open(ko_file, 'w', encoding='utf-8') as f:
+            with open(text_file, 'w', encoding='utf-8') as f:
                 f.write(text_content)
 
             if text_content:
-                log_message(f"한국어 텍스트 저장: {os.path.basename(ko_file)}")
+                log_message(f"원본 텍스트 저장: {os.path.basename(text_file)}")
     else:
         log_message("⚠️ 전체 텍스트 파일을 찾을 수 없음 - 빈 텍스트로 진행")
 
     # 번역 설정 처리
-    if translation_settings is None:
-        translation_settings = {
-            'translation_length': 0.8,
-            'quality_mode': 'balanced',
-            'selected_languages': ['english']
-        }
-
     translation_length = translation_settings.get('translation_length', 0.8)
     quality_mode = translation_settings.get('quality_mode', 'balanced')
     selected_languages = translation_settings.get('selected_languages', ['english'])
 
-    log_message(f"번역 대상 언어: {', '.join(selected_languages)}")
+    log_message(f"번역 대상 언어: {source_language} → {', '.join(selected_languages)}")
     log_message(f"번역 설정 - 길이 비율: {translation_length}, 품질 모드: {quality_mode}")
 
     # 다국어 번역 실행
     try:
         batch_translate(
-            input_dir=ko_folder,
+            input_dir=text_folder,
             output_dir=txt_root,
             length_ratio=translation_length,
-            target_languages=selected_languages
+            target_languages=selected_languages,
+            source_lang=source_language
         )
         log_message("✅ 다국어 번역 완료")
         log_message("🧹 Gemma3 모델 메모리 해제 완료 - CosyVoice 합성 준비")
@@ -162,7 +363,7 @@ def run_whisper_directory(output_dir: str, translation_settings=None):
     return selected_languages
 
 
-def run_full_whisper_processing(input_file, vad_config=None):
+def run_full_whisper_processing(input_file, vad_config=None, backend=DEFAULT_STT_BACKEND, language='ko'):
     """전체 Whisper 처리 파이프라인 - SRT와 텍스트를 한 번에 생성"""
     base = os.path.splitext(os.path.basename(input_file))[0]
     out = os.path.join(os.getcwd(), 'split_audio', base)
@@ -179,24 +380,31 @@ def run_full_whisper_processing(input_file, vad_config=None):
     log_message(f'   min_silence_duration_ms: {vad_config["min_silence_duration_ms"]}')
     log_message(f'   speech_pad_ms: {vad_config["speech_pad_ms"]}')
 
+    # 상주 모델 사용 시 파일 검색/이동과 SRT 재파싱 없이 바로 분할
+    if select_stt_backend(backend) == 'inprocess':
+        transcript = transcribe_in_process(input_file, out, vad_config, language=language)
+        if transcript is not None:
+            log_message('== SRT+TXT 생성 완료 (in-process) ==')
+            segments, orig_dur = split_audio_by_segments(
+                input_file, [(seg['start_ms'], seg['end_ms']) for seg in transcript], out
+            )
+            log_message(f'== {len(segments)}개 세그먼트 분할 완료 ==')
+            return out, segments, orig_dur
+        log_message('⚠️ in-process 전사 실패 - whisper-cli로 재시도')
+
     model_path, is_coreml = get_model_path()
     log_message(f'사용 모델: {model_path} (CoreML: {is_coreml})')
 
     whisper_cli = get_whisper_cli_path()
     whisper_cmd = [
         whisper_cli,
-        '--vad',
-        '--vad-model', resource_path('whisper.cpp/models/ggml-silero-v5.1.2.bin'),
-        '--vad-threshold', str(vad_config['threshold']),
-        '--vad-min-speech-duration-ms', str(vad_config['min_speech_duration_ms']),
-        '--vad-min-silence-duration-ms', str(vad_config['min_silence_duration_ms']),
-        '--vad-max-speech-duration-s', str(vad_config['max_speech_duration_s']),
-        '--vad-speech-pad-ms', str(vad_config['speech_pad_ms']),
+        *whisper_vad_args(vad_config),
         '-f', input_file,
         '-m', model_path,
         '--output-srt',
         '--output-txt',  # 텍스트도 함께 생성
-        '--language', 'ko',
+        '--output-json-full',  # 단어(토큰) 타임스탬프와 확률
+        '--language', language,
     ]
 
     log_message(f'🔧 Whisper 명령어: {" ".join(whisper_cmd)}')
@@ -205,20 +413,33 @@ def run_full_whisper_processing(input_file, vad_config=None):
     if is_coreml and IS_MACOS:
         log_message('CoreML 모델 사용 중 (자동 가속)')
 
-    run_command_with_logging(whisper_cmd, cwd=os.path.dirname(input_file),
-                             description="whisper.cpp VAD+SRT+TXT 처리")
-    log_message('== SRT+TXT 생성 완료 ==')
+    # 이전 실행의 결과가 남아 있으면 이번 실행이 실패해도 그대로 파싱/캐시되므로 먼저 삭제
+    output_name = os.path.basename(input_file)
+    for stale in [input_file + ext for ext in ('.srt', '.txt', '.json')] + \
+                 [os.path.join(out, output_name + ext) for ext in ('.srt', '.txt', '.json')] + \
+                 [os.path.join(out, TRANSCRIPT_JSON)]:
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    return_code = run_command_with_logging(whisper_cmd, cwd=os.path.dirname(input_file),
+                                           description="whisper.cpp VAD+SRT+TXT 처리")
 
     # 메모리 정리
     cleanup_whisper_memory()
 
+    if return_code != 0:
+        log_message(f'❌ 에러: whisper-cli 실패 (return code: {return_code})')
+        return None, None, None
+    log_message('== SRT+TXT 생성 완료 ==')
+
     # 입력 디렉토리에서 생성된 파일들 확인
     input_dir = os.path.dirname(input_file)
     log_message(f'🔍 입력 디렉토리({input_dir})에서 생성된 파일들:')
 
+    whisper_json = os.path.basename(input_file) + '.json'
     generated_files = []
     for f in os.listdir(input_dir):
-        if f.startswith(base) and (f.lower().endswith('.srt') or f.lower().endswith('.txt')):
+        if f.startswith(base) and (f.lower().endswith('.srt') or f.lower().endswith('.txt') or f == whisper_json):
             file_path = os.path.join(input_dir, f)
             file_size = os.path.getsize(file_path)
             log_message(f'   📄 {f} ({file_size} bytes)')
@@ -241,6 +462,14 @@ def run_full_whisper_processing(input_file, vad_config=None):
         if f.lower().endswith('.srt'):
             moved_srt = f
 
+    # 구조화 전사 결과 (세그먼트별 텍스트는 여기서 파생)
+    transcript = parse_whisper_full_json(os.path.join(out, whisper_json))
+    if transcript is not None:
+        write_transcript_json(transcript, os.path.join(out, TRANSCRIPT_JSON), source=input_file, language=language)
+    elif os.path.exists(os.path.join(out, TRANSCRIPT_JSON)):
+        # 이전 실행의 JSON이 남아 있으면 이번 SRT와 어긋나므로 제거 (TXT 기반으로 진행)
+        os.remove(os.path.join(out, TRANSCRIPT_JSON))
+
     log_message(f"📂 출력 디렉토리 내용: {os.listdir(out)}")
 
     srt_files = [f for f in os.listdir(out) if f.lower().endswith('.srt')]
@@ -264,3 +493,628 @@ def run_full_whisper_processing(input_file, vad_config=None):
     log_message(f'== {len(segments)}개 세그먼트 분할 완료 ==')
 
     return out, segments, orig_dur
+
+
+def _transcribe_chunk_cli(chunk_path, vad_config, threads, offset_ms=0, language='ko'):
+    """청크 하나를 독립 whisper-cli 프로세스로 전사하여 원본 타임라인 기준 전사 결과 반환"""
+    model_path, _ = get_model_path()
+    whisper_cmd = [
+        get_whisper_cli_path(),
+        *whisper_vad_args(vad_config),
+        '-t', str(threads),
+        '-f', chunk_path,
+        '-m', model_path,
+        '--output-json-full',
+        '--language', language,
+    ]
+    return_code = run_command_with_logging(whisper_cmd, cwd=os.path.dirname(chunk_path),
+                                           description=f"청크 전사 {os.path.basename(chunk_path)}")
+    json_path = chunk_path + '.json'
+    if return_code != 0 or not os.path.exists(json_path):
+        return None
+    return parse_whisper_full_json(json_path, offset_ms)
+
+
+def run_long_form_whisper_processing(input_file, vad_config=None, threads_per_process=4, workers=None,
+                                     chunk_target_s=DEFAULT_CHUNK_TARGET_S, language='ko'):
+    """
+    장시간 입력용 병렬 전사: Silero VAD 경계의 무음 지점에서 청크로 자른 뒤
+    여러 whisper-cli 프로세스(각각 -t 스레드)로 동시에 전사하고 SRT 타임라인을 오프셋 보정하여 합침
+
+    Returns:
+        run_full_whisper_processing과 동일 (out, segments, orig_dur)
+    """
+    if not silero_available():
+        log_message('⚠️ silero-vad 미설치 - 단일 프로세스 전사로 진행')
+        return run_full_whisper_processing(input_file, vad_config, backend='cli', language=language)
+
+    base = os.path.splitext(os.path.basename(input_file))[0]
+    out = os.path.join(os.getcwd(), 'split_audio', base)
+    chunk_dir = os.path.join(out, 'chunks')
+    os.makedirs(chunk_dir, exist_ok=True)
+
+    if vad_config is None:
+        vad_config = load_vad_config()
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 1) // threads_per_process)
+
+    log_message('== 장시간 병렬 전사 (Silero VAD 청크) ==')
+    start_time = time.perf_counter()
+
+    # 1단계: VAD 경계 계산 및 청크 계획
+    audio, samples = load_vad_audio(input_file)
+    total_ms = len(audio)
+    speech_segments = probabilities_to_segments(compute_speech_probabilities(samples), vad_config, total_ms)
+    chunks = plan_chunks(speech_segments, total_ms, target_s=chunk_target_s)
+    log_message(f'🔪 음성 구간 {len(speech_segments)}개 → 청크 {len(chunks)}개 '
+                f'(프로세스 {workers}개 × 스레드 {threads_per_process})')
+
+    # 2단계: 청크 WAV 저장 (16kHz 모노)
+    chunk_paths = []
+    for idx, (chunk_start, chunk_end) in enumerate(chunks, 1):
+        chunk_path = os.path.join(chunk_dir, f"{base}_chunk{idx:03d}.wav")
+        audio[chunk_start:chunk_end].export(chunk_path, format="wav")
+        chunk_paths.append(chunk_path)
+
+    # 3단계: 청크별 병렬 전사 (스레드는 whisper-cli 프로세스 대기만 담당)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda job: _transcribe_chunk_cli(job[0], vad_config, threads_per_process, offset_ms=job[1][0],
+                                              language=language),
+            zip(chunk_paths, chunks)
+        ))
+
+    # 4단계: 청크 시작 오프셋이 반영된 결과를 타임라인 순서대로 합치기
+    transcript = []
+    for (chunk_start, chunk_end), entries, chunk_path in zip(chunks, results, chunk_paths):
+        if entries is None:
+            log_message(f'❌ 청크 전사 실패: {os.path.basename(chunk_path)}')
+            continue
+        for entry in entries:
+            entry['end_ms'] = min(entry['end_ms'], chunk_end)
+            transcript.append(entry)
+
+    if not transcript:
+        log_message('❌ 에러: 전사 결과가 없습니다.')
+        return None, None, None
+
+    save_transcript(transcript, input_file, out, language=language)
+    shutil.rmtree(chunk_dir, ignore_errors=True)
+
+    wall_sec = time.perf_counter() - start_time
+    log_message(f'== 장시간 전사 완료: {total_ms / 1000:.0f}초 오디오 / {wall_sec:.0f}초 소요 '
+                f'(x{total_ms / 1000 / wall_sec:.1f}) ==')
+
+    segments, orig_dur = split_audio_by_segments(
+        input_file, [(seg['start_ms'], seg['end_ms']) for seg in transcript], out
+    )
+    log_message(f'== {len(segments)}개 세그먼트 분할 완료 ==')
+    return out, segments, orig_dur
+
+
+def _retranscribe_wavs_cli(wav_paths, decode_args, language='ko'):
+    """
+    세그먼트 WAV들을 지정한 디코딩 옵션으로 whisper-cli로 재전사 (VAD 없이, 묶음마다 모델 1회 로드)
+    whisper-cli가 실패한 묶음은 결과에서 제외하므로 해당 세그먼트는 기존 텍스트가 유지됨
+
+    Returns:
+        {wav_path: 구조화 전사 결과 (세그먼트 WAV 기준 시간)}
+    """
+    model_path, _ = get_model_path()
+    base_cmd = [
+        get_whisper_cli_path(),
+        '-m', model_path,
+        *decode_args,
+        '--output-json-full',
+        '--language', language,
+    ]
+
+    # 이전 실행이 남긴 .json을 이번 결과로 오인하지 않도록 먼저 정리
+    for wav_path in wav_paths:
+        if os.path.exists(wav_path + '.json'):
+            os.remove(wav_path + '.json')
+
+    results = {}
+    groups = _file_arg_groups(wav_paths, base_cmd)
+    for i, group in enumerate(groups, 1):
+        whisper_cmd = list(base_cmd)
+        for wav_path in group:
+            whisper_cmd += ['-f', wav_path]
+
+        return_code = run_command_with_logging(
+            whisper_cmd, description=f"저신뢰 세그먼트 재전사 ({i}/{len(groups)}, {len(group)}개)"
+        )
+        failed = return_code != 0
+        if failed:
+            log_message(f"⚠️ whisper-cli 실패 (return code: {return_code}) - 이 묶음은 기존 전사 유지")
+
+        for wav_path in group:
+            json_path = wav_path + '.json'
+            if os.path.exists(json_path):
+                if not failed:
+                    results[wav_path] = parse_whisper_full_json(json_path)
+                os.remove(json_path)
+    return results
+
+
+def _is_low_confidence(entry, logprob_threshold, no_speech_threshold):
+    """평균 로그 확률이 임계값 미만인 세그먼트 (무음 확률이 높은 세그먼트는 재전사해도 의미 없으므로 제외)"""
+    avg_logprob = entry.get('avg_logprob')
+    if avg_logprob is None or avg_logprob >= logprob_threshold:
+        return False
+    no_speech_prob = entry.get('no_speech_prob')
+    return no_speech_prob is None or no_speech_prob < no_speech_threshold
+
+
+def refine_low_confidence_segments(input_file, out, logprob_threshold=-1.0, no_speech_threshold=0.6,
+                                   beam_size=8, fallback_temperature=0.4, language='ko'):
+    """
+    신뢰도가 낮은 세그먼트만 다시 전사 (1차: 큰 빔 서치, 2차: 여전히 낮으면 온도 샘플링)
+    평균 로그 확률이 좋아진 경우에만 결과를 교체하고 SRT/TXT/transcript.json을 갱신
+
+    Returns:
+        교체된 세그먼트 수
+    """
+    json_path = os.path.join(out, TRANSCRIPT_JSON)
+    transcript = load_transcript_json(json_path)
+    if not transcript:
+        return 0
+
+    base = os.path.splitext(os.path.basename(input_file))[0]
+    wav_folder = os.path.join(out, 'wav')
+    targets = {
+        idx: os.path.join(wav_folder, f"{base}_{idx:03d}.wav")
+        for idx, entry in enumerate(transcript, 1)
+        if _is_low_confidence(entry, logprob_threshold, no_speech_threshold)
+    }
+    targets = {idx: path for idx, path in targets.items() if os.path.exists(path)}
+    log_message(f'🔍 저신뢰 세그먼트 {len(targets)}/{len(transcript)}개 (avg_logprob < {logprob_threshold})')
+    if not targets:
+        return 0
+
+    passes = [
+        ('빔 서치', ['--beam-size', str(beam_size), '--best-of', str(beam_size)]),
+        ('온도 샘플링', ['--temperature', str(fallback_temperature), '--best-of', str(beam_size)]),
+    ]
+
+    refined = 0
+    for pass_name, decode_args in passes:
+        if not targets:
+            break
+        log_message(f'🔁 재전사 ({pass_name}): {len(targets)}개 세그먼트')
+        results = _retranscribe_wavs_cli(list(targets.values()), decode_args, language)
+
+        for idx, wav_path in list(targets.items()):
+            entries = results.get(wav_path)
+            scores = [e['avg_logprob'] for e in entries or [] if e['avg_logprob'] is not None]
+            if not scores:
+                continue
+
+            entry = transcript[idx - 1]
+            candidate_logprob = sum(scores) / len(scores)
+            if candidate_logprob <= entry['avg_logprob']:
+                continue
+
+            log_message(f"✏️ 세그먼트 {idx}: {entry['avg_logprob']:.2f} → {candidate_logprob:.2f} "
+                        f"'{entry['text']}' → '{' '.join(e['text'] for e in entries)}'")
+            offset_ms = entry['start_ms']
+            entry['text'] = ' '.join(e['text'] for e in entries if e['text'])
+            entry['words'] = [
+                {**w, 'start_ms': min(w['start_ms'] + offset_ms, entry['end_ms']),
+                 'end_ms': min(w['end_ms'] + offset_ms, entry['end_ms'])}
+                for e in entries for w in e['words']
+            ]
+            entry['avg_logprob'] = round(candidate_logprob, 4)
+            entry['refined'] = pass_name
+            refined += 1
+
+            if not _is_low_confidence(entry, logprob_threshold, no_speech_threshold):
+                del targets[idx]
+
+    if refined:
+        save_transcript(transcript, input_file, out, language=language)
+    log_message(f'✅ 저신뢰 세그먼트 재전사 완료: {refined}개 교체')
+    return refined
+
+
+def stt_cache_key(input_file, vad_config, mode, language='ko'):
+    """전사 캐시 키: (디코딩된 PCM 해시, 모델 파일 해시, 언어, VAD 파라미터, 전사 방식)"""
+    model_path, _ = get_model_path()
+    vad_params = {key: vad_config[key] for key in sorted(vad_config)}
+    return make_cache_key(hash_pcm(input_file), hash_file(model_path), language, vad_params, mode)
+
+
+def run_stt_with_cache(input_file, vad_config, mode, run, cache_config=None, language='ko'):
+    """
+    전사 결과 캐시를 거쳐 STT 실행
+    같은 오디오/모델/언어/VAD 설정으로 전사한 적이 있으면 STT 단계를 건너뛰고 저장된 SRT/TXT/JSON으로 분할만 수행
+
+    Args:
+        mode: 전사 방식 이름 (방식마다 경계가 다를 수 있으므로 키에 포함)
+        run: 캐시 미스 시 호출할 전사 함수 (out, segments, orig_dur 반환)
+
+    Returns:
+        run_full_whisper_processing과 동일 (out, segments, orig_dur)
+    """
+    if vad_config is None:
+        vad_config = load_vad_config()
+
+    try:
+        cache = ContentCache('stt', cache_config)
+        key = stt_cache_key(input_file, vad_config, mode, language)
+    except Exception as e:
+        log_message(f'⚠️ 전사 캐시 사용 불가 ({e}) - 캐시 없이 진행')
+        return run()
+
+    base = os.path.splitext(os.path.basename(input_file))[0]
+    out = os.path.join(os.getcwd(), 'split_audio', base)
+    output_base = os.path.basename(input_file)
+
+    cached = cache.get(key)
+    if cached is not None:
+        log_message(f'♻️ 전사 캐시 적중 - STT 건너뜀 ({key[:12]})')
+        os.makedirs(out, exist_ok=True)
+        for name, path in cached.items():
+            shutil.copy2(path, os.path.join(out, name))
+
+        wav_folder = os.path.join(out, 'wav')
+        if os.path.isdir(wav_folder):
+            for f in os.listdir(wav_folder):
+                if f.startswith(f"{base}_") and f.endswith('.wav'):
+                    os.remove(os.path.join(wav_folder, f))
+
+        segments, orig_dur = split_audio_by_srt(input_file, os.path.join(out, output_base + '.srt'), out)
+        log_message(f'== {len(segments)}개 세그먼트 분할 완료 (캐시) ==')
+        return out, segments, orig_dur
+
+    out, segments, orig_dur = run()
+    if not out or not segments:
+        return out, segments, orig_dur
+
+    files = {}
+    for name in (output_base + '.srt', output_base + '.txt', TRANSCRIPT_JSON):
+        if os.path.exists(os.path.join(out, name)):
+            files[name] = os.path.join(out, name)
+
+    if output_base + '.srt' in files:
+        try:
+            cache.put(key, files, meta={'source': input_file, 'mode': mode})
+            log_message(f'💾 전사 결과 캐시 저장 ({key[:12]})')
+        except Exception as e:
+            log_message(f'⚠️ 전사 캐시 저장 실패: {e}')
+    return out, segments, orig_dur
+
+
+def _file_arg_groups(paths, base_cmd):
+    """
+    whisper-cli '-f' 인자를 명령줄 길이/개수 제한 안에서 묶음 단위로 분할
+    (Windows 명령줄은 약 32K자로 제한되므로 첫 실행처럼 세그먼트가 많으면 한 번에 넘길 수 없음)
+    """
+    base_chars = sum(len(arg) + 3 for arg in base_cmd)
+    groups, group, chars = [], [], base_chars
+    for path in paths:
+        cost = len(path) + 6  # ' -f ' + 따옴표
+        if group and (len(group) >= CLI_MAX_FILES_PER_CALL or chars + cost > CLI_MAX_ARGV_CHARS):
+            groups.append(group)
+            group, chars = [], base_chars
+        group.append(path)
+        chars += cost
+    if group:
+        groups.append(group)
+    return groups
+
+
+def transcribe_segment_files_cli(wav_paths, language='ko'):
+    """
+    VAD로 이미 잘린 세그먼트 WAV들을 whisper-cli로 전사 (VAD 없이, 묶음마다 모델 1회 로드)
+
+    Returns:
+        {wav_path: 텍스트} - 전사 결과(.txt)가 실제로 생성된 파일만 포함
+    """
+    model_path, _ = get_model_path()
+    base_cmd = [
+        get_whisper_cli_path(),
+        '-m', model_path,
+        '--output-txt',
+        '--language', language,
+    ]
+
+    # 이전 실행이 남긴 .txt를 이번 결과로 오인하지 않도록 먼저 정리
+    for wav_path in wav_paths:
+        if os.path.exists(wav_path + '.txt'):
+            os.remove(wav_path + '.txt')
+
+    texts = {}
+    groups = _file_arg_groups(wav_paths, base_cmd)
+    for i, group in enumerate(groups, 1):
+        whisper_cmd = list(base_cmd)
+        for wav_path in group:
+            whisper_cmd += ['-f', wav_path]
+
+        return_code = run_command_with_logging(
+            whisper_cmd, description=f"변경된 세그먼트 전사 ({i}/{len(groups)}, {len(group)}개)"
+        )
+        if return_code != 0:
+            log_message(f"⚠️ whisper-cli 실패 (return code: {return_code}) - 생성된 결과만 사용")
+
+        for wav_path in group:
+            txt_path = wav_path + '.txt'
+            if os.path.exists(txt_path):
+                with open(txt_path, 'r', encoding='utf-8') as f:
+                    texts[wav_path] = ' '.join(line.strip() for line in f if line.strip())
+                os.remove(txt_path)
+    return texts
+
+
+def run_cached_vad_whisper_processing(input_file, vad_config=None, language='ko'):
+    """
+    VAD와 ASR을 분리한 전사: Silero 프레임 확률은 캐시에서 재사용하고 현재 VAD 설정으로 경계만 다시 계산,
+    이전 실행과 경계가 같은 세그먼트는 전사 결과를 재사용하고 바뀐 세그먼트만 ASR 수행
+
+    Returns:
+        run_full_whisper_processing과 동일 (out, segments, orig_dur)
+    """
+    if not silero_available():
+        log_message('⚠️ silero-vad 미설치 - whisper-cli 내장 VAD로 진행')
+        return run_full_whisper_processing(input_file, vad_config, backend='cli', language=language)
+
+    base = os.path.splitext(os.path.basename(input_file))[0]
+    out = os.path.join(os.getcwd(), 'split_audio', base)
+    os.makedirs(out, exist_ok=True)
+
+    if vad_config is None:
+        vad_config = load_vad_config()
+
+    log_message('== 캐시 VAD + 변경 구간 전사 ==')
+
+    # 1단계: 캐시된 프레임 확률로 현재 설정의 경계 계산
+    probs = get_speech_probabilities(input_file, os.path.join(out, 'vad_probs.npy'))
+    vad_segments = probabilities_to_segments(probs, vad_config, get_audio_duration_ms(input_file))
+    if not vad_segments:
+        log_message('❌ 에러: 음성 구간이 없습니다.')
+        return None, None, None
+
+    # 2단계: 이전 전사 결과 로드 (원본이 바뀌었으면 폐기)
+    cache_path = os.path.join(out, 'segment_transcripts.json')
+    source_stat = [os.path.getsize(input_file), os.path.getmtime(input_file)]
+    cached = {}
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('source') == source_stat and data.get('language', 'ko') == language:
+                cached = data.get('segments', {})
+        except Exception as e:
+            log_message(f'⚠️ 세그먼트 전사 캐시 로드 실패: {e}')
+
+    # 3단계: 세그먼트 WAV 분할 후 경계가 바뀐 세그먼트만 전사
+    wav_folder = os.path.join(out, 'wav')
+    if os.path.isdir(wav_folder):
+        # 이전 실행의 세그먼트 수가 더 많았을 수 있으므로 기존 분할 파일 정리
+        for f in os.listdir(wav_folder):
+            if f.startswith(f"{base}_") and f.endswith('.wav'):
+                os.remove(os.path.join(wav_folder, f))
+    segments, orig_dur = split_audio_by_segments(input_file, vad_segments, out)
+    keys = [f"{start_ms}-{end_ms}" for start_ms, end_ms in segments]
+    changed = {key: os.path.join(wav_folder, f"{base}_{idx:03d}.wav")
+               for idx, key in enumerate(keys, 1) if key not in cached}
+
+    log_message(f'📊 세그먼트 {len(keys)}개 중 {len(keys) - len(changed)}개 재사용, {len(changed)}개 전사')
+    if changed:
+        texts = transcribe_segment_files_cli(list(changed.values()), language)
+        # 전사 결과가 없는 세그먼트는 캐시하지 않음 → 다음 실행에서 다시 전사
+        failed = 0
+        for key, wav_path in changed.items():
+            if wav_path in texts:
+                cached[key] = texts[wav_path]
+            else:
+                failed += 1
+        if failed:
+            log_message(f'⚠️ 세그먼트 {failed}개 전사 실패 - 이번 결과에서는 빈 텍스트, 다음 실행에서 재시도')
+
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump({'source': source_stat, 'language': language,
+                   'segments': {key: cached[key] for key in keys if key in cached}}, f, ensure_ascii=False, indent=2)
+
+    # 4단계: whisper-cli와 같은 이름으로 SRT/TXT 저장
+    transcript = [{'start_ms': start_ms, 'end_ms': end_ms, 'text': cached.get(key, '')}
+                  for (start_ms, end_ms), key in zip(segments, keys)]
+    save_transcript(transcript, input_file, out, language=language)
+
+    log_message(f'== {len(segments)}개 세그먼트 분할 완료 ==')
+    return out, segments, orig_dur
+
+
+def collect_transcription_inputs(inputs):
+    """디렉토리 또는 파일 목록에서 전사할 오디오 파일 목록 생성"""
+    if isinstance(inputs, str):
+        inputs = [inputs]
+
+    files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, f) for f in sorted(os.listdir(path))
+                         if is_audio_file(f))
+        elif os.path.isfile(path) and is_audio_file(path):
+            files.append(path)
+        else:
+            log_message(f'⚠️ 전사 대상 아님 (건너뜀): {path}')
+    return [os.path.abspath(f) for f in files]
+
+
+def _batch_output_dirs(files, output_root):
+    """
+    파일별 출력 디렉토리 (<루트>/<파일명>)
+    다른 폴더에 같은 이름의 파일이 있으면 서로 덮어쓰지 않도록 상위 폴더명(그래도 겹치면 순번)을 붙임
+    """
+    bases = [os.path.splitext(os.path.basename(f))[0] for f in files]
+    dirs, used = {}, set()
+    for f, base in zip(files, bases):
+        name = base
+        if bases.count(base) > 1:
+            name = f"{base}_{os.path.basename(os.path.dirname(f))}"
+        candidate, n = name, 2
+        while candidate in used:
+            candidate = f"{name}_{n}"
+            n += 1
+        used.add(candidate)
+        dirs[f] = os.path.join(output_root, candidate)
+    return dirs
+
+
+def _batch_transcribe_cli(files, out_dirs, vad_config, processors, language='ko'):
+    """whisper-cli로 여러 파일 전사 (명령줄 길이 제한 안에서 묶음마다 모델/VAD 모델 1회 로드)"""
+    model_path, is_coreml = get_model_path()
+    log_message(f'사용 모델: {model_path} (CoreML: {is_coreml})')
+
+    base_cmd = [
+        get_whisper_cli_path(),
+        *whisper_vad_args(vad_config),
+        '-m', model_path,
+        '-p', str(processors),
+        '--output-srt',
+        '--output-txt',
+        '--language', language,
+    ]
+
+    # 이전 실행이 남긴 결과를 이번 결과로 오인하지 않도록 먼저 정리
+    for f in files:
+        for ext in ('.srt', '.txt'):
+            if os.path.exists(f + ext):
+                os.remove(f + ext)
+
+    groups = _file_arg_groups(files, base_cmd)
+    for i, group in enumerate(groups, 1):
+        whisper_cmd = list(base_cmd)
+        for f in group:
+            whisper_cmd += ['-f', f]
+        return_code = run_command_with_logging(
+            whisper_cmd, description=f"whisper.cpp 배치 전사 ({i}/{len(groups)}, {len(group)}개 파일)"
+        )
+        if return_code != 0:
+            log_message(f"⚠️ whisper-cli 실패 (return code: {return_code}) - 결과가 생성된 파일만 사용")
+
+    # whisper-cli는 입력 파일 옆에 <입력 파일명>.srt/.txt를 생성하므로 파일별 출력 디렉토리로 이동
+    results = {}
+    for f in files:
+        out = out_dirs[f]
+        os.makedirs(out, exist_ok=True)
+        moved = {}
+        for ext in ('.srt', '.txt'):
+            src_path = f + ext
+            if os.path.exists(src_path):
+                dst_path = os.path.join(out, os.path.basename(src_path))
+                if os.path.exists(dst_path):
+                    os.remove(dst_path)
+                shutil.move(src_path, dst_path)
+                moved[ext] = dst_path
+        results[f] = moved
+    return results
+
+
+def run_batch_transcription(inputs, output_root=None, vad_config=None, backend=DEFAULT_STT_BACKEND, processors=1,
+                            language='ko'):
+    """
+    여러 파일을 하나의 로드된 모델로 전사하고 파일별 SRT/TXT와 통합 매니페스트 저장
+
+    Args:
+        inputs: 디렉토리 경로 또는 파일 경로 목록
+        output_root: 출력 루트 (기본: ./split_audio), 파일별로 <루트>/<파일명>/ 아래에 저장
+                     (다른 폴더의 같은 이름 파일은 <파일명>_<상위 폴더명>)
+        processors: 파일당 병렬 디코더 상태 수 (whisper.cpp -p)
+        language: 음성 언어 코드
+
+    Returns:
+        매니페스트 dict (실패 시 None)
+    """
+    files = collect_transcription_inputs(inputs)
+    if not files:
+        log_message('❌ 전사할 오디오 파일이 없습니다')
+        return None
+
+    if output_root is None:
+        output_root = os.path.join(os.getcwd(), 'split_audio')
+    os.makedirs(output_root, exist_ok=True)
+
+    if vad_config is None:
+        vad_config = load_vad_config()
+
+    backend = select_stt_backend(backend)
+    out_dirs = _batch_output_dirs(files, output_root)
+    log_message(f'== 배치 전사 시작: {len(files)}개 파일 (백엔드: {backend}, 병렬 디코더: {processors}) ==')
+
+    start_time = time.perf_counter()
+    outputs = {}
+
+    if backend == 'inprocess':
+        remaining = []
+        for f in files:
+            out = out_dirs[f]
+            os.makedirs(out, exist_ok=True)
+            if transcribe_in_process(f, out, vad_config, n_processors=processors, language=language) is None:
+                remaining.append(f)
+                continue
+            output_base = os.path.join(out, os.path.basename(f))
+            outputs[f] = {'.srt': output_base + '.srt', '.txt': output_base + '.txt'}
+
+        if remaining:
+            log_message(f'⚠️ in-process 전사 실패 {len(remaining)}개 - whisper-cli로 재시도')
+            outputs.update(_batch_transcribe_cli(remaining, out_dirs, vad_config, processors, language))
+    else:
+        outputs.update(_batch_transcribe_cli(files, out_dirs, vad_config, processors, language))
+
+    wall_sec = time.perf_counter() - start_time
+
+    # 매니페스트 작성
+    entries = []
+    total_audio_sec = 0.0
+    for f in files:
+        moved = outputs.get(f, {})
+        srt_path = moved.get('.srt')
+        audio_sec = get_audio_duration_ms(f) / 1000
+        total_audio_sec += audio_sec
+        entries.append({
+            'input': f,
+            'srt': srt_path,
+            'txt': moved.get('.txt'),
+            'segments': len(parse_srt_segments(srt_path)) if srt_path else 0,
+            'audio_sec': round(audio_sec, 3),
+            'status': 'ok' if srt_path else 'failed',
+        })
+
+    throughput = (total_audio_sec / wall_sec) if wall_sec > 0 else 0.0
+    manifest = {
+        'backend': backend,
+        'processors': processors,
+        'files': entries,
+        'total_audio_hours': round(total_audio_sec / 3600, 4),
+        'wall_hours': round(wall_sec / 3600, 4),
+        # 오디오 시간 / 벽시계 시간 (audio-hours per wall-hour)
+        'throughput': round(throughput, 2),
+    }
+
+    manifest_path = os.path.join(output_root, 'transcription_manifest.json')
+    with open(manifest_path, 'w', encoding='utf-8') as mf:
+        json.dump(manifest, mf, ensure_ascii=False, indent=2)
+
+    ok_count = sum(1 for e in entries if e['status'] == 'ok')
+    log_message(f'== 배치 전사 완료: {ok_count}/{len(files)}개 성공 ==')
+    log_message(f'📊 처리량: 오디오 {total_audio_sec / 3600:.2f}시간 / 소요 {wall_sec / 3600:.3f}시간 '
+                f'= {throughput:.1f} audio-hours per wall-hour')
+    log_message(f'📄 매니페스트: {manifest_path}')
+    return manifest
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="whisper.cpp 배치 전사 (디렉토리 또는 파일 목록)")
+    parser.add_argument('inputs', nargs='+', help="오디오 파일 또는 디렉토리")
+    parser.add_argument('--output_root', default=None, help="출력 루트 (기본: ./split_audio)")
+    parser.add_argument('--backend', choices=STT_BACKENDS, default=DEFAULT_STT_BACKEND, help="STT 백엔드")
+    parser.add_argument('--processors', type=int, default=1, help="파일당 병렬 디코더 상태 수")
+    parser.add_argument('--language', default='ko', help="음성 언어 코드")
+    args = parser.parse_args()
+
+    run_batch_transcription(args.inputs, args.output_root, backend=args.backend, processors=args.processors,
+                            language=args.language)